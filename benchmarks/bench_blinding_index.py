@@ -0,0 +1,206 @@
+# ruff: noqa: T201
+
+"""
+Benchmark of the two blinding modes of build-tier-raw-blind on a phy raw
+file, running the raw_blind, tcm and dsp scripts as the workflow does: writing
+a blinded copy of the file, from which the tcm and dsp are then built, against
+writing only a `BlindingIndex`, the tcm and dsp being then built from the
+original file with ``--blind-index``. Reports the bytes written by the
+blinding and the time spent in each script.
+
+Run with:
+
+    python benchmarks/bench_blinding_index.py [n_channels] [n_events]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from legenddataflow.scripts.tier.dsp import build_tier_dsp
+    from legenddataflow.scripts.tier.raw_blind import build_tier_raw_blind
+    from legenddataflow.scripts.tier.tcm import build_tier_tcm
+    from lgdo import Array, ArrayOfEqualSizedArrays, Table, lh5
+
+
+def _write(file, obj):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(yaml.dump(obj))
+
+
+def _write_validity(directory, file):
+    _write(
+        directory / "validity.yaml",
+        [{"valid_from": "20230101T000000Z", "category": "all", "apply": [file]}],
+    )
+
+
+def make_setup(path, n_channels, n_events, wf_len=1000):
+    """Writes the raw file, blinding curves, metadata and configs"""
+    rng = np.random.default_rng(1)
+    geds = {f"V{i:02d}": 1104000 + i for i in range(n_channels)}
+    # raw_blind expects a channel of each system
+    channels = {name: ("geds", rawid) for name, rawid in geds.items()}
+    channels |= {
+        "S01": ("spms", 1057600),
+        "A01": ("auxs", 1027201),
+        "B01": ("blsns", 1027202),
+        "P01": ("puls", 1027203),
+    }
+    raw_file = path / "raw.lh5"
+    for _, rawid in channels.values():
+        raw = Table(
+            col_dict={
+                "daqenergy": Array(rng.uniform(0, 5000, n_events)),
+                "timestamp": Array(np.arange(n_events, dtype=float)),
+                "waveform": ArrayOfEqualSizedArrays(
+                    nda=rng.integers(0, 2**14, (n_events, wf_len), dtype=np.uint16)
+                ),
+            }
+        )
+        lh5.write(raw, "raw", str(raw_file), group=f"ch{rawid}", wo_mode="a")
+
+    curves = path / "curves.json"
+    with curves.open("w") as f:
+        json.dump(
+            {
+                name: {
+                    "pars": {
+                        "operations": {
+                            "daqenergy_cal": {
+                                "expression": "daqenergy*a",
+                                "parameters": {"a": 0.5},
+                            }
+                        }
+                    }
+                }
+                for name in geds
+            },
+            f,
+        )
+
+    metadata = path / "metadata"
+    chmaps = metadata / "hardware" / "configuration" / "channelmaps"
+    _write(
+        chmaps / "c0.yaml",
+        {
+            name: {"name": name, "system": system, "daq": {"rawid": rawid}}
+            for name, (system, rawid) in channels.items()
+        },
+    )
+    _write_validity(chmaps, "c0.yaml")
+    statuses = metadata / "datasets" / "statuses"
+    _write(
+        statuses / "s0.yaml",
+        {name: {"processable": True, "is_blinded": name in geds} for name in channels},
+    )
+    _write_validity(statuses, "s0.yaml")
+    for detectors in ["germanium/diodes", "lar/sipms"]:
+        (metadata / "hardware" / "detectors" / detectors).mkdir(parents=True)
+
+    configs = path / "configs"
+    _write(configs / "hdf5.yaml", {"hdf5_settings": {}})
+    _write(configs / "blinding.yaml", {"centroid_in_keV": 2039, "width_in_keV": 25})
+    _write(configs / "tcm.yaml", {"coin_cols": "timestamp", "hash_func": r"\d+"})
+    _write(
+        configs / "chain.yaml",
+        {
+            "outputs": ["energy", "tp"],
+            "processors": {"energy": "daqenergy*2", "tp": "timestamp+1"},
+        },
+    )
+    _write(
+        configs / "c0.yaml",
+        {
+            "snakemake_rules": {
+                "tier_raw_blind": {
+                    "options": {},
+                    "settings": str(configs / "hdf5.yaml"),
+                    "config": str(configs / "blinding.yaml"),
+                },
+                "tier_tcm": {
+                    "options": {},
+                    "inputs": {"config": str(configs / "tcm.yaml")},
+                },
+                "tier_dsp": {
+                    "options": {},
+                    "inputs": {
+                        "processing_chain": {"__default__": str(configs / "chain.yaml")}
+                    },
+                },
+            }
+        },
+    )
+    _write_validity(configs, "c0.yaml")
+    return raw_file, curves, metadata, configs
+
+
+def _run(script, *args):
+    sys.argv = [script.__name__, *map(str, args)]
+    tic = time.perf_counter()
+    script()
+    return time.perf_counter() - tic
+
+
+def run_mode(mode, path, raw_file, curves, metadata, configs):
+    """
+    Runs raw_blind, tcm and dsp in the given blinding mode, returns the bytes
+    written by the blinding and the time spent in each script
+    """
+    common = ["--datatype", "phy", "--timestamp", "20230201T000000Z"]
+    common += ["--configs", configs]
+    blind_output = path / f"{mode}-raw_blind.lh5"
+    times = {
+        "raw_blind": _run(
+            build_tier_raw_blind,
+            *["--input", raw_file, "--output", blind_output, "--mode", mode],
+            *["--blind-curve", curves, "--metadata", metadata],
+            *common,
+        )
+    }
+    if mode == "copy":
+        input_file, extra = blind_output, []
+    else:
+        input_file, extra = raw_file, ["--blind-index", blind_output]
+    times["tcm"] = _run(
+        build_tier_tcm, input_file, path / f"{mode}-tcm.lh5", *extra, *common
+    )
+    times["dsp"] = _run(
+        build_tier_dsp,
+        *["--input", input_file, "--output", path / f"{mode}-dsp.lh5"],
+        *["--db-file", path / f"{mode}-dsp.json", "--metadata", metadata],
+        *["--tier", "dsp"],
+        *extra,
+        *common,
+    )
+    return blind_output.stat().st_size, times
+
+
+def main(n_channels=10, n_events=10000):
+    os.environ["METADATA_NO_GIT_REPO"] = "1"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir)
+        setup = make_setup(path, n_channels, n_events)
+        print(f"raw file {setup[0].stat().st_size / 1e6:>10.1f} MB")
+        for mode in ["copy", "index"]:
+            n_bytes, times = run_mode(mode, path, *setup)
+            print(
+                f"{mode:<8} {n_bytes / 1e6:>10.3f} MB written "
+                + " ".join(f"{script} {t:>7.2f} s" for script, t in times.items())
+                + f" total {n_events / sum(times.values()):>10.0f} events/s"
+            )
+
+
+if __name__ == "__main__":
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        main(*[int(arg) for arg in sys.argv[1:3]])
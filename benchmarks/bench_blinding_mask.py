@@ -0,0 +1,95 @@
+# ruff: noqa: T201
+
+"""
+Benchmark of the blinding step of build-tier-raw-blind, compares the previous
+loop (blinding curves read for every channel, rows to blind grown with
+`np.append` and selected with `np.isin`) with `get_blinding_mask`
+
+Run with:
+
+    python benchmarks/bench_blinding_mask.py [n_channels] [n_events]
+"""
+
+import json
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numexpr as ne
+import numpy as np
+from dbetto.catalog import Props
+from legenddataflow.blinding import get_blinding_mask, load_blind_curves
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from lgdo import Array, Table, lh5
+
+
+def make_files(tmpdir, n_channels, n_events):
+    rng = np.random.default_rng(1)
+    raw_file = str(Path(tmpdir) / "raw.lh5")
+    channels = {1104000 + i: f"V{i:05d}" for i in range(n_channels)}
+    curves = {}
+    for rawid, name in channels.items():
+        raw = Table(col_dict={"daqenergy": Array(rng.uniform(0, 8000, n_events))})
+        lh5.write(raw, f"ch{rawid}/raw", raw_file, wo_mode="a")
+        curves[name] = {
+            "pars": {
+                "operations": {
+                    "daqenergy_cal": {
+                        "expression": "daqenergy*a",
+                        "parameters": {"a": rng.uniform(0.3, 0.4)},
+                    }
+                }
+            }
+        }
+    curve_file = str(Path(tmpdir) / "curves.json")
+    with Path(curve_file).open("w") as f:
+        json.dump(curves, f)
+    return raw_file, curve_file, channels
+
+
+def previous(raw_file, curve_file, channels, centroid=2039, width=25):
+    toblind = np.array([])
+    for rawid, name in channels.items():
+        daqenergy = lh5.read_as(f"ch{rawid}/raw/daqenergy", raw_file, "np")
+        blind_curve = Props.read_from(curve_file)[name]["pars"]["operations"]
+        daqenergy_cal = ne.evaluate(
+            blind_curve["daqenergy_cal"]["expression"],
+            local_dict=dict(
+                daqenergy=daqenergy, **blind_curve["daqenergy_cal"]["parameters"]
+            ),
+        )
+        toblind = np.append(
+            toblind,
+            np.nonzero(np.abs(np.asarray(daqenergy_cal) - centroid) <= width)[0],
+        )
+    toblind = np.unique(toblind)
+    allind = np.arange(len(daqenergy))
+    return allind[np.logical_not(np.isin(allind, toblind))]
+
+
+def mask_engine(raw_file, curve_file, channels, centroid=2039, width=25):
+    mask = get_blinding_mask(
+        raw_file, channels, load_blind_curves(curve_file), centroid, width
+    )
+    return np.flatnonzero(~mask)
+
+
+def main(n_channels=100, n_events=100000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        inputs = make_files(tmpdir, n_channels, n_events)
+        results = []
+        for label, func in [("previous", previous), ("mask", mask_engine)]:
+            tic = time.perf_counter()
+            results.append(func(*inputs))
+            print(f"{label:<10} {time.perf_counter() - tic:>8.3f} s")
+        assert np.array_equal(*results)
+
+
+if __name__ == "__main__":
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,64 @@
+# ruff: noqa: T201
+
+"""
+Micro-benchmark for FileKey parsing, compares parsing filenames one at a time
+with `FileKey.get_filekey_from_pattern` against the bulk `FileKey.parse_many`
+
+Run with:
+
+    python benchmarks/bench_filekey.py [n_files]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from legenddataflow import ProcessingFileKey
+from legenddataflow.patterns import get_pattern_tier
+
+setup = {"paths": {"tier": "/data/tier", "tier_dsp": "/data/tier/dsp"}}
+
+
+def make_filenames(n_files):
+    pattern = str(get_pattern_tier(setup, "dsp"))
+    filenames = []
+    for i in range(n_files):
+        period = f"p{i % 20:02}"
+        run = f"r{(i // 20) % 100:03}"
+        filenames.append(
+            pattern.format(
+                experiment="l200",
+                period=period,
+                run=run,
+                datatype="phy" if i % 3 else "cal",
+                timestamp=f"2023{(i % 12) + 1:02}{(i % 28) + 1:02}T{i % 240000:06}Z",
+            )
+        )
+    return filenames
+
+
+def main(n_files=1_000_000):
+    filenames = make_filenames(n_files)
+    names = [Path(f).name for f in filenames]
+    pattern = get_pattern_tier(setup, "dsp")
+
+    tic = time.perf_counter()
+    single = [ProcessingFileKey.get_filekey_from_pattern(f, pattern) for f in filenames]
+    toc = time.perf_counter()
+    print(f"get_filekey_from_pattern (full path): {toc - tic:.2f} s")
+
+    tic = time.perf_counter()
+    bulk = ProcessingFileKey.parse_many(filenames, pattern)
+    toc = time.perf_counter()
+    print(f"parse_many (full path):               {toc - tic:.2f} s")
+
+    tic = time.perf_counter()
+    ProcessingFileKey.parse_many(names)
+    toc = time.perf_counter()
+    print(f"parse_many (processing pattern):      {toc - tic:.2f} s")
+
+    assert single == bulk
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
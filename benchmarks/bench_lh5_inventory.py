@@ -0,0 +1,86 @@
+# ruff: noqa: T201
+
+"""
+Benchmark of listing the content of a raw file as done by the tier scripts,
+compares calling `lgdo.lh5.ls` once per channel with a single `LH5Inventory`
+and counts the number of times the file is opened
+
+Run with:
+
+    python benchmarks/bench_lh5_inventory.py [n_channels]
+"""
+
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import h5py
+import numpy as np
+from legenddataflow.lh5_utils import LH5Inventory
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from lgdo import lh5
+
+n_opens = 0
+_File = h5py.File
+
+
+class CountingFile(_File):
+    def __init__(self, *args, **kwargs):
+        global n_opens  # noqa: PLW0603
+        n_opens += 1
+        super().__init__(*args, **kwargs)
+
+
+def make_file(file, n_channels, n_fields=20):
+    with h5py.File(file, "w") as f:
+        channels = [f"ch{1000000 + i:07}" for i in range(n_channels)]
+        f.attrs["datatype"] = f"struct{{{','.join(channels)}}}"
+        for channel in channels:
+            grp = f.create_group(channel)
+            grp.attrs["datatype"] = "struct{raw}"
+            tbl = grp.create_group("raw")
+            fields = [f"field{j}" for j in range(n_fields)]
+            tbl.attrs["datatype"] = f"table{{{','.join(fields)}}}"
+            for field in fields:
+                tbl.create_dataset(field, data=np.zeros(10)).attrs["datatype"] = (
+                    "array<1>{real}"
+                )
+    return channels
+
+
+def run(label, func):
+    global n_opens  # noqa: PLW0603
+    n_opens = 0
+    tic = time.perf_counter()
+    result = func()
+    toc = time.perf_counter()
+    print(f"{label:<12} {n_opens:>6} file opens {toc - tic:>8.3f} s")
+    return result
+
+
+def main(n_channels=200):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file = str(Path(tmpdir) / "raw.lh5")
+        channels = make_file(file, n_channels)
+        h5py.File = CountingFile
+
+        def per_channel():
+            found = [ch for ch in channels if len(lh5.ls(file, f"{ch}/raw")) > 0]
+            fields = lh5.ls(file, f"{channels[0]}/raw/")
+            return found, [field.split("/")[-1] for field in fields]
+
+        def inventory():
+            inv = LH5Inventory(file)
+            found = [ch for ch in channels if len(inv.ls(f"{ch}/raw")) > 0]
+            return found, inv.fields(f"{channels[0]}/raw")
+
+        assert run("lh5.ls", per_channel) == run("inventory", inventory)
+        h5py.File = _File
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
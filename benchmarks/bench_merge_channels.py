@@ -0,0 +1,78 @@
+# ruff: noqa: T201
+
+"""
+Benchmark of the merge of per-channel LH5 pars files (e.g. the DPLMS
+coefficients) done by merge-channels, compares reading each channel with
+`lgdo.lh5.read` and appending it to the output with `lgdo.lh5.write` with
+copying the channel groups into the output at the HDF5 level
+
+Run with:
+
+    python benchmarks/bench_merge_channels.py [n_channels] [n_coefficients]
+"""
+
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import h5py
+import numpy as np
+from legenddataflow.lh5_utils import merge_lh5_files
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from lgdo import Array, Table, lh5
+
+
+def make_files(tmpdir, n_channels, n_coefficients):
+    rng = np.random.default_rng(1)
+    files, channels = [], []
+    for i in range(n_channels):
+        channel = f"ch{1104000 + i}"
+        file = str(Path(tmpdir) / f"{channel}-dplms.lh5")
+        pars = Table(
+            col_dict={
+                "dplms": Table(
+                    col_dict={"coefficients": Array(rng.normal(size=n_coefficients))}
+                )
+            }
+        )
+        lh5.write(pars, channel, file, wo_mode="of")
+        files.append(file)
+        channels.append(channel)
+    return files, channels
+
+
+def decode_encode(files, channels, out_file):
+    for file, channel in zip(files, channels, strict=True):
+        lh5.write(lh5.read(channel, file), name=channel, lh5_file=out_file, wo_mode="a")
+
+
+def copy(files, channels, out_file):
+    merge_lh5_files(files, out_file, names=channels)
+
+
+def main(n_channels=100, n_coefficients=10000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files, channels = make_files(tmpdir, n_channels, n_coefficients)
+        for label, func in [("read/write", decode_encode), ("hdf5 copy", copy)]:
+            out_file = str(Path(tmpdir) / f"{label.replace('/', '_')}.lh5")
+            tic = time.perf_counter()
+            func(files, channels, out_file)
+            toc = time.perf_counter()
+            print(f"{label:<12} {toc - tic:>8.3f} s")
+        with (
+            h5py.File(Path(tmpdir) / "read_write.lh5", "r") as expected,
+            h5py.File(Path(tmpdir) / "hdf5 copy.lh5", "r") as result,
+        ):
+            for channel in channels:
+                path = f"{channel}/dplms/coefficients"
+                assert np.array_equal(expected[path][:], result[path][:])
+
+
+if __name__ == "__main__":
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,271 @@
+import json
+import sys
+
+import awkward as ak
+import h5py
+import numpy as np
+import pytest
+import yaml
+from lgdo import Array, Table, lh5
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+def _write_raw(file, channels, n_events=1000):
+    rng = np.random.default_rng(1)
+    for rawid in channels:
+        raw = Table(col_dict={"daqenergy": Array(rng.uniform(0, 5000, n_events))})
+        lh5.write(raw, f"ch{rawid}/raw", file, wo_mode="a")
+
+
+def _write_curves(file, names):
+    curves = {
+        name: {
+            "pars": {
+                "operations": {
+                    "daqenergy_cal": {
+                        "expression": "daqenergy*a",
+                        "parameters": {"a": 0.5 + i * 0.01},
+                    }
+                }
+            }
+        }
+        for i, name in enumerate(names)
+    }
+    with file.open("w") as f:
+        json.dump(curves, f)
+
+
+def test_get_blinding_mask(tmp_path):
+    from legenddataflow.blinding import get_blinding_mask, load_blind_curves
+
+    channels = {1104000 + i: f"V0{i}" for i in range(5)}
+    _write_raw(str(tmp_path / "raw.lh5"), channels)
+    _write_curves(tmp_path / "curves.json", channels.values())
+
+    curves = load_blind_curves(str(tmp_path / "curves.json"))
+    assert load_blind_curves([str(tmp_path / "curves.json")]) is curves
+
+    mask = get_blinding_mask(str(tmp_path / "raw.lh5"), channels, curves, 2039, 25)
+
+    expected = np.zeros(1000, dtype=bool)
+    for i, rawid in enumerate(channels):
+        daqenergy = lh5.read_as(
+            f"ch{rawid}/raw/daqenergy", str(tmp_path / "raw.lh5"), "np"
+        )
+        expected |= np.abs(daqenergy * (0.5 + i * 0.01) - 2039) <= 25
+    assert expected.any()
+    assert np.array_equal(mask, expected)
+
+    assert not get_blinding_mask(
+        str(tmp_path / "raw.lh5"), {}, curves, 2039, 25, n_rows=10
+    ).any()
+    with pytest.raises(ValueError, match="no channels"):
+        get_blinding_mask(str(tmp_path / "raw.lh5"), {}, curves, 2039, 25)
+
+
+def test_blinding_index(tmp_path):
+    from legenddataflow.blinding import BlindingIndex
+
+    raw_file = str(tmp_path / "raw.lh5")
+    _write_raw(raw_file, [1104000, 1104001], n_events=10)
+    mask = np.zeros(10, dtype=bool)
+    mask[[2, 5]] = True
+
+    BlindingIndex.from_mask(mask, [1104000]).write_to(str(tmp_path / "index.lh5"))
+    index = BlindingIndex.read_from(str(tmp_path / "index.lh5"))
+    assert index.idx.tolist() == [2, 5]
+    assert index.n_rows == 10
+    assert index.hides("ch1104000/raw")
+    assert not index.hides(1104001)
+    assert index.entry_list().tolist() == [0, 1, 3, 4, 6, 7, 8, 9]
+
+    daqenergy = lh5.read_as("ch1104000/raw/daqenergy", raw_file, "np")
+    assert np.array_equal(
+        index.read("ch1104000/raw", raw_file)["daqenergy"].nda, daqenergy[~mask]
+    )
+    assert len(index.read("ch1104001/raw", raw_file)) == 10
+
+    out_file = str(tmp_path / "unblinded.lh5")
+    index.write_unblinded(
+        raw_file, out_file, ["/ch1104000/raw", "/ch1104001/raw"], ["daqenergy"]
+    )
+    assert lh5.read_n_rows("ch1104000/raw", out_file) == 8
+    assert lh5.read_n_rows("ch1104001/raw", out_file) == 10
+
+
+def _write_setup(path, channels):
+    # minimal metadata and dataflow configs for the raw_blind, tcm and dsp scripts
+    def _write(file, obj):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(yaml.dump(obj))
+
+    def _write_validity(directory, file):
+        _write(
+            directory / "validity.yaml",
+            [{"valid_from": "20230101T000000Z", "category": "all", "apply": [file]}],
+        )
+
+    metadata = path / "metadata"
+    chmaps = metadata / "hardware" / "configuration" / "channelmaps"
+    _write(
+        chmaps / "c0.yaml",
+        {
+            name: {"name": name, "system": system, "daq": {"rawid": rawid}}
+            for name, (system, rawid) in channels.items()
+        },
+    )
+    _write_validity(chmaps, "c0.yaml")
+    statuses = metadata / "datasets" / "statuses"
+    _write(
+        statuses / "s0.yaml",
+        {
+            name: {"processable": True, "is_blinded": system == "geds"}
+            for name, (system, _) in channels.items()
+        },
+    )
+    _write_validity(statuses, "s0.yaml")
+    for detectors in ["germanium/diodes", "lar/sipms"]:
+        (metadata / "hardware" / "detectors" / detectors).mkdir(parents=True)
+
+    configs = path / "configs"
+    _write(configs / "hdf5.yaml", {"hdf5_settings": {}})
+    _write(configs / "blinding.yaml", {"centroid_in_keV": 2039, "width_in_keV": 25})
+    _write(
+        configs / "tcm.yaml",
+        {"coin_cols": "timestamp", "hash_func": r"\d+", "buffer_len": 100},
+    )
+    _write(
+        configs / "chain.yaml",
+        {
+            "outputs": ["energy", "tp"],
+            "processors": {"energy": "daqenergy*2", "tp": "timestamp+1"},
+        },
+    )
+    _write(
+        configs / "c0.yaml",
+        {
+            "snakemake_rules": {
+                "tier_raw_blind": {
+                    "options": {},
+                    "settings": str(configs / "hdf5.yaml"),
+                    "config": str(configs / "blinding.yaml"),
+                },
+                "tier_tcm": {
+                    "options": {},
+                    "inputs": {"config": str(configs / "tcm.yaml")},
+                },
+                "tier_dsp": {
+                    "options": {},
+                    "inputs": {
+                        "processing_chain": {"__default__": str(configs / "chain.yaml")}
+                    },
+                },
+            }
+        },
+    )
+    _write_validity(configs, "c0.yaml")
+    return metadata, configs
+
+
+def _run(monkeypatch, script, *args):
+    monkeypatch.setattr(sys, "argv", [script.__name__, *map(str, args)])
+    script()
+
+
+def _assert_same_tables(file1, file2, names):
+    for name in names:
+        assert ak.to_list(lh5.read(name, file1).view_as("ak")) == ak.to_list(
+            lh5.read(name, file2).view_as("ak")
+        )
+
+
+def test_blinded_tiers(tmp_path, monkeypatch):
+    from legenddataflow.blinding import BlindingIndex
+    from legenddataflow.lh5_utils import get_lh5_inventory
+    from legenddataflow.scripts.tier.dsp import build_tier_dsp
+    from legenddataflow.scripts.tier.raw_blind import build_tier_raw_blind
+    from legenddataflow.scripts.tier.tcm import build_tier_tcm
+
+    monkeypatch.setenv("METADATA_NO_GIT_REPO", "1")
+    channels = {
+        "V01": ("geds", 1104000),
+        "V02": ("geds", 1104001),
+        "S01": ("spms", 1057600),
+        "A01": ("auxs", 1027201),
+        "B01": ("blsns", 1027202),
+        "P01": ("puls", 1027203),
+    }
+    metadata, configs = _write_setup(tmp_path, channels)
+    raw_file = tmp_path / "raw.lh5"
+    # the last channel is not in the channel map so it is not blinded
+    _write_raw(str(raw_file), [rawid for _, rawid in channels.values()] + [1080000])
+    with h5py.File(raw_file, "a") as f:
+        for channel in f:
+            dset = f[channel]["raw"].create_dataset("timestamp", data=np.arange(1000.0))
+            dset.attrs["datatype"] = "array<1>{real}"
+            f[channel]["raw"].attrs["datatype"] = "table{daqenergy,timestamp}"
+    _write_curves(tmp_path / "curves.json", ["V01", "V02"])
+
+    common = ["--datatype", "phy", "--timestamp", "20230201T000000Z"]
+    common += ["--configs", configs]
+    for mode, output in [("copy", "raw_blind.lh5"), ("index", "blind_index.lh5")]:
+        _run(
+            monkeypatch,
+            build_tier_raw_blind,
+            *["--input", raw_file, "--output", tmp_path / output],
+            *["--blind-curve", tmp_path / "curves.json", "--metadata", metadata],
+            *["--mode", mode],
+            *common,
+        )
+    blind_file = tmp_path / "raw_blind.lh5"
+    index = BlindingIndex.read_from(str(tmp_path / "blind_index.lh5"))
+    assert 0 < len(index.idx) < 1000
+    assert not index.hides(1080000)
+    for channel in get_lh5_inventory(raw_file).ls():
+        assert ak.to_list(
+            lh5.read(f"{channel}/raw", str(blind_file)).view_as("ak")
+        ) == ak.to_list(index.read(f"{channel}/raw", str(raw_file)).view_as("ak"))
+
+    # the tiers built from the raw file through the index match the ones
+    # built from the blinded copy
+    for mode in ["sequential", "parallel"]:
+        for label, input_file, extra in [
+            ("copy", blind_file, []),
+            ("index", raw_file, ["--blind-index", tmp_path / "blind_index.lh5"]),
+        ]:
+            _run(
+                monkeypatch,
+                build_tier_tcm,
+                *[input_file, tmp_path / f"tcm_{label}_{mode}.lh5", "--mode", mode],
+                *extra,
+                *common,
+            )
+        _assert_same_tables(
+            str(tmp_path / f"tcm_copy_{mode}.lh5"),
+            str(tmp_path / f"tcm_index_{mode}.lh5"),
+            get_lh5_inventory(tmp_path / f"tcm_copy_{mode}.lh5").ls(),
+        )
+
+    for label, input_file, extra in [
+        ("copy", blind_file, []),
+        ("index", raw_file, ["--blind-index", tmp_path / "blind_index.lh5"]),
+    ]:
+        _run(
+            monkeypatch,
+            build_tier_dsp,
+            *["--input", input_file, "--output", tmp_path / f"dsp_{label}.lh5"],
+            *["--db-file", tmp_path / f"dsp_{label}.json", "--metadata", metadata],
+            *["--tier", "dsp"],
+            *extra,
+            *common,
+        )
+    dsp_tables = [
+        f"ch{rawid}/dsp" for rawid in sorted(rawid for _, rawid in channels.values())
+    ]
+    assert get_lh5_inventory(tmp_path / "dsp_copy.lh5").ls() == [
+        table.split("/")[0] for table in dsp_tables
+    ]
+    _assert_same_tables(
+        str(tmp_path / "dsp_copy.lh5"), str(tmp_path / "dsp_index.lh5"), dsp_tables
+    )
@@ -131,3 +131,38 @@ def test_get_wildcard_constraints(input_file_json):
     cal_grouping = CalGrouping(setup, input_file_json)
     constraints = cal_grouping.get_wildcard_constraints("calgroup001a", "default")
     assert isinstance(constraints, str)
+
+
+def test_get_par_files_cached(tmp_path):
+    data = {
+        "default": {"calgroup001a": {"p01": ["r002"]}, "calgroup001b": {"p01": "all"}},
+        "V01234A": {"calgroup001a": {"p01": ["r001"]}},
+    }
+    file = tmp_path / "input.yaml"
+    file.write_text(yaml.dump(data))
+    cal_grouping = CalGrouping(setup, file)
+
+    par_files = cal_grouping.get_par_files(catalog, "calgroup001a", "default", "dsp")
+    assert par_files == [
+        str(
+            Path(setup["paths"]["tmp_par"])
+            / "l200-p01-r002-cal-20210102T000000Z-{channel}-par_dsp.yaml"
+        )
+    ]
+    assert cal_grouping.get_par_files(catalog, "calgroup001a", "V01234A", "dsp") == [
+        str(
+            Path(setup["paths"]["tmp_par"])
+            / "l200-p01-r001-cal-20210101T000000Z-V01234A-par_dsp.yaml"
+        )
+    ]
+    assert (
+        len(cal_grouping.get_par_files(catalog, "calgroup001b", "default", "dsp")) == 2
+    )
+
+    # the catalog is only indexed once and the results are cached
+    index = cal_grouping.get_catalog_index(catalog, "dsp")
+    assert cal_grouping.get_catalog_index(catalog, "dsp")[1] is index[1]
+    par_files.append("extra")
+    assert (
+        len(cal_grouping.get_par_files(catalog, "calgroup001a", "default", "dsp")) == 1
+    )
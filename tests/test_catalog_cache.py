@@ -0,0 +1,63 @@
+import json
+
+from legenddataflow import FileKey, ParsKeyResolve
+from legenddataflow.catalog_cache import cached_glob, get_cache_file
+from legenddataflow.inventory import get_inventory
+
+
+def _make_run(tmp_path, run, timestamps):
+    run_dir = tmp_path / "raw" / "cal" / "p00" / run
+    run_dir.mkdir(parents=True)
+    for timestamp in timestamps:
+        (run_dir / f"l200-p00-{run}-cal-{timestamp}-tier_raw.lh5").touch()
+    return run_dir
+
+
+def test_cached_glob(tmp_path):
+    _make_run(tmp_path, "r000", ["20230101T000000Z", "20230101T010000Z"])
+    pattern = str(tmp_path / "raw" / "*" / "*" / "*" / "*-tier_raw.lh5")
+    cache_file = tmp_path / "cache" / "cache.json"
+
+    files = cached_glob(pattern, cache_file)
+    assert len(files) == 2
+    assert cache_file.is_file()
+
+    # unchanged directories are taken from the cache
+    cache = json.loads(cache_file.read_text())
+    run_dir = str(tmp_path / "raw" / "cal" / "p00" / "r000")
+    cache["dirs"][run_dir]["files"].append("l200-p00-r000-cal-fake-tier_raw.lh5")
+    cache_file.write_text(json.dumps(cache))
+    assert len(cached_glob(pattern, cache_file)) == 3
+
+    # new directories are scanned in the next invocation
+    _make_run(tmp_path, "r001", ["20230102T000000Z"])
+    get_inventory().clear()
+    assert len(cached_glob(pattern, cache_file)) == 4
+
+    # refresh ignores the cache
+    assert len(cached_glob(pattern, cache_file, refresh=True)) == 3
+
+
+def test_get_keys_cached(tmp_path):
+    _make_run(tmp_path, "r000", ["20230101T000000Z"])
+    _make_run(tmp_path, "r001", ["20230102T000000Z"])
+    search_pattern = (
+        tmp_path
+        / "raw"
+        / "{datatype}"
+        / "{period}"
+        / "{run}"
+        / "{experiment}-{period}-{run}-{datatype}-{timestamp}-tier_raw.lh5"
+    )
+    cache_dir = tmp_path / "cache"
+
+    keys = ParsKeyResolve.get_keys("-*-*-*-cal", search_pattern)
+    cached_keys = ParsKeyResolve.get_keys(
+        "-*-*-*-cal", search_pattern, cache_dir=cache_dir
+    )
+    assert sorted(keys) == sorted(cached_keys)
+    assert FileKey("l200", "p00", "r001", "cal", "20230102T000000Z") in cached_keys
+    assert get_cache_file(cache_dir, search_pattern, "-*-*-*-cal").is_file()
+    assert sorted(
+        ParsKeyResolve.get_keys("-*-*-*-cal", search_pattern, cache_dir=cache_dir)
+    ) == sorted(keys)
@@ -0,0 +1,46 @@
+import os
+
+from dbetto.catalog import Catalog
+from legenddataflow.catalog_registry import CatalogRegistry, IndexedCatalog
+
+
+def _write_validity(path, files):
+    path.write_text(
+        "".join(
+            f"- valid_from: {timestamp}\n  category: all\n  apply:\n    - {file}\n"
+            for timestamp, file in files
+        )
+    )
+
+
+def test_registry(tmp_path):
+    validity = tmp_path / "validity.yaml"
+    _write_validity(
+        validity,
+        [("20230101T000000Z", "a.yaml"), ("20230201T000000Z", "b.yaml")],
+    )
+    registry = CatalogRegistry()
+    # the loaded catalogs are looked up with the bisect search
+    assert isinstance(registry.get(validity), IndexedCatalog)
+    registry.clear()
+
+    for timestamp in ["20230115T000000Z", "20230215T000000Z"]:
+        assert registry.get_files(validity, timestamp) == Catalog.get_files(
+            validity, timestamp
+        )
+    assert registry.misses == 1
+    assert registry.hits == 1
+
+    # modifying the returned list does not modify the cached catalog
+    files = registry.get_files(validity, "20230115T000000Z")
+    files.append("c.yaml")
+    assert registry.get_files(validity, "20230115T000000Z") == ["a.yaml"]
+
+    # the file is read again once it changes
+    _write_validity(validity, [("20230101T000000Z", "c.yaml")])
+    stat = validity.stat()
+    os.utime(validity, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert registry.get_files(validity, "20230115T000000Z") == ["c.yaml"]
+    assert registry.misses == 2
+
+    assert registry.valid_for(validity, "20220101T000000Z", allow_none=True) is None
@@ -0,0 +1,80 @@
+import pytest
+import yaml
+from legenddataflow import chanlist
+
+
+def _write_db(tmp_path):
+    status = tmp_path / "status" / "statuses"
+    status.mkdir(parents=True)
+    chmap = tmp_path / "chmap" / "channelmaps"
+    chmap.mkdir(parents=True)
+
+    with (status / "s0.yaml").open("w") as f:
+        yaml.dump(
+            {
+                "V01": {"processable": True},
+                "V02": {"processable": False},
+                "S01": {"processable": True},
+            },
+            f,
+        )
+    with (status / "validity.yaml").open("w") as f:
+        yaml.dump(
+            [
+                {
+                    "valid_from": "20230101T000000Z",
+                    "category": "all",
+                    "apply": ["s0.yaml"],
+                }
+            ],
+            f,
+        )
+
+    with (chmap / "c0.yaml").open("w") as f:
+        yaml.dump(
+            {
+                "V01": {"system": "geds"},
+                "V02": {"system": "geds"},
+                "S01": {"system": "spms"},
+            },
+            f,
+        )
+    with (chmap / "validity.yaml").open("w") as f:
+        yaml.dump(
+            [
+                {
+                    "valid_from": "20230101T000000Z",
+                    "category": "all",
+                    "apply": ["c0.yaml"],
+                }
+            ],
+            f,
+        )
+    return tmp_path / "status", tmp_path / "chmap"
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_get_chanlist(tmp_path):
+    det_status, chmap = _write_db(tmp_path)
+    ts = "20230201T000000Z"
+
+    assert chanlist.get_chanlist(det_status, chmap, ts, "cal") == ["V01"]
+    assert chanlist.get_chanlist(det_status, chmap, ts, "cal", "spms") == ["S01"]
+
+    hits = chanlist._get_chanlist.cache_info().hits
+    channels = chanlist.get_chanlist(det_status, chmap, ts, "cal")
+    assert chanlist._get_chanlist.cache_info().hits == hits + 1
+
+    # returned lists are copies so callers cannot modify the cache
+    channels.append("V03")
+    assert chanlist.get_chanlist(det_status, chmap, ts, "cal") == ["V01"]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_get_chanlist_missing_channel(tmp_path):
+    det_status, chmap = _write_db(tmp_path)
+    with (chmap / "channelmaps" / "c0.yaml").open("w") as f:
+        yaml.dump({"V02": {"system": "geds"}}, f)
+
+    with pytest.raises(RuntimeError):
+        chanlist.get_chanlist(det_status, chmap, "20230201T000000Z", "cal")
@@ -0,0 +1,66 @@
+import numpy as np
+from legenddataflow.coincidence import coincidence_mask, find_coincident_values
+
+
+def _find_matching_values_with_delay(arr1, arr2, jit_delay):
+    # previous implementation of the evt muon flag, kept as reference
+    matching_values = []
+    delays = np.arange(0, int(1e9 * jit_delay)) * jit_delay
+    for delay in delays:
+        arr2_delayed = arr2 + delay
+        mask = np.isin(arr1, arr2_delayed, assume_unique=True)
+        matching_values.extend(arr1[mask])
+    return np.unique(matching_values)
+
+
+def test_against_previous_implementation():
+    rng = np.random.default_rng(42)
+    jitter = 2e-7
+    n_delays = int(1e9 * jitter)
+    delays = np.arange(0, n_delays) * jitter
+
+    muons = np.sort(rng.uniform(0, 1000, 200))
+    # triggers delayed from a muon by one of the scanned delays
+    coincident = (
+        muons[rng.integers(0, len(muons), 300)] + delays[rng.integers(0, n_delays, 300)]
+    )
+    # triggers far from any muon
+    others = rng.uniform(0, 1000, 2000)
+    others = others[~coincidence_mask(others, muons, max_delay=1e-3, min_delay=-1e-3)]
+    triggers = np.unique(np.concatenate([coincident, others]))
+    rng.shuffle(triggers)
+
+    expected = _find_matching_values_with_delay(triggers, muons, jitter)
+    assert len(expected) > 0
+    assert np.array_equal(
+        find_coincident_values(triggers, muons, max_delay=(n_delays - 1) * jitter),
+        expected,
+    )
+    assert np.array_equal(
+        coincidence_mask(triggers, muons, max_delay=(n_delays - 1) * jitter),
+        np.isin(triggers, expected),
+    )
+
+
+def test_coincidence_mask():
+    muons = np.array([10.0, 1.0, 5.0])
+    times = np.array([0.5, 1.0, 1.5, 3.0, 5.2, 12.0, np.nan])
+    assert coincidence_mask(times, muons, max_delay=0.5).tolist() == [
+        False,
+        True,
+        True,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert coincidence_mask(times, muons, max_delay=0.5, min_delay=0.1).tolist() == [
+        False,
+        False,
+        True,
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert not coincidence_mask(times, [], max_delay=1).any()
@@ -0,0 +1,125 @@
+import awkward as ak
+import numpy as np
+import pytest
+from legenddataflow.column_cache import ColumnCache
+from lgdo import Array, Table, VectorOfVectors, lh5
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+def _write_file(file):
+    for ch in ["ch0000001", "ch0000002"]:
+        tbl = Table(
+            col_dict={
+                "energy": Array(np.arange(10.0)),
+                "timestamp": Array(np.arange(10.0) * 2),
+                "peaks": VectorOfVectors([[i] * (i % 3) for i in range(10)]),
+            }
+        )
+        lh5.write(tbl, f"{ch}/hit", file, wo_mode="a")
+
+
+def test_column_cache(tmp_path):
+    file = str(tmp_path / "hit.lh5")
+    _write_file(file)
+    idx = np.array([0, 2, 3, 7])
+
+    cache = ColumnCache(lh5)
+    for field_mask in [None, ["timestamp", "energy"], ["peaks"]]:
+        expected = lh5.read_as(
+            "ch0000001/hit/", file, idx=idx, field_mask=field_mask, library="ak"
+        )
+        result = cache.read_as(
+            "ch0000001/hit/", file, idx=idx, field_mask=field_mask, library="ak"
+        )
+        assert ak.fields(result) == ak.fields(expected)
+        assert ak.to_list(result) == ak.to_list(expected)
+
+    assert np.array_equal(
+        cache.read_as("ch0000002/hit/energy", file, idx=idx, library="np"),
+        lh5.read_as("ch0000002/hit/energy", file, idx=idx, library="np"),
+    )
+    assert cache.ls(file, "ch0000001/hit/") == lh5.ls(file, "ch0000001/hit/")
+
+    # each column was read from disk once
+    assert cache.n_reads == 4
+    assert cache.n_hits == 3
+
+
+def test_column_cache_patch(tmp_path):
+    file = str(tmp_path / "hit.lh5")
+    _write_file(file)
+
+    original = lh5.read_as
+    with ColumnCache(lh5).patch() as cache:
+        lh5.read_as("ch0000001/hit/energy", file, library="np")
+        lh5.read_as("ch0000001/hit/energy", file, idx=[1, 2], library="np")
+        assert cache.n_reads == 1
+    assert lh5.read_as is original
+
+
+def test_build_evt_with_column_cache(tmp_path):
+    from pygama.evt import build_evt
+    from pygama.evt import utils as evt_utils
+
+    rng = np.random.default_rng(1)
+    chans = [1084803, 1084804, 1121600]
+    keys, rows = [], []
+    n_rows = dict.fromkeys(chans, 0)
+    for _ in range(200):
+        evt_chans = sorted(rng.choice(chans, rng.integers(1, 4), replace=False))
+        keys.append([int(ch) for ch in evt_chans])
+        rows.append([n_rows[ch] for ch in evt_chans])
+        for ch in evt_chans:
+            n_rows[ch] += 1
+    tcm = Table(
+        col_dict={
+            "table_key": VectorOfVectors(keys),
+            "row_in_table": VectorOfVectors(rows),
+        }
+    )
+    lh5.write(tcm, "hardware_tcm_1", str(tmp_path / "tcm.lh5"))
+    for ch, n in n_rows.items():
+        hit = Table(col_dict={"energy": Array(rng.uniform(0, 100, n))})
+        lh5.write(hit, f"ch{ch}/hit", str(tmp_path / "hit.lh5"), wo_mode="a")
+        dsp = Table(col_dict={"tp_0": Array(rng.uniform(0, 100, n))})
+        lh5.write(dsp, f"ch{ch}/dsp", str(tmp_path / "dsp.lh5"), wo_mode="a")
+
+    file_table = {
+        "tcm": (str(tmp_path / "tcm.lh5"), "hardware_tcm_1", "ch{}"),
+        "dsp": (str(tmp_path / "dsp.lh5"), "dsp", "ch{}"),
+        "hit": (str(tmp_path / "hit.lh5"), "hit", "ch{}"),
+        "evt": (None, "evt"),
+    }
+    config = {
+        "channels": {"geds_on": [f"ch{ch}" for ch in chans]},
+        "outputs": ["energy_sum", "multiplicity", "tp_0"],
+        "operations": {
+            "energy_sum": {
+                "channels": "geds_on",
+                "aggregation_mode": "sum",
+                "expression": "hit.energy",
+                "initial": 0.0,
+            },
+            "multiplicity": {
+                "channels": "geds_on",
+                "aggregation_mode": "sum",
+                "expression": "hit.energy > 50",
+                "initial": 0,
+            },
+            "tp_0": {
+                "channels": "geds_on",
+                "aggregation_mode": "gather",
+                "expression": "dsp.tp_0",
+            },
+        },
+    }
+
+    expected = build_evt(file_table, config)
+    with ColumnCache(evt_utils.lh5).patch() as cache:
+        result = build_evt(file_table, config)
+        assert cache.n_hits > 0
+    for field in config["outputs"]:
+        assert ak.to_list(result[field].view_as("ak")) == ak.to_list(
+            expected[field].view_as("ak")
+        )
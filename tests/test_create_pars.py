@@ -69,3 +69,56 @@ def test_create_pars_keylist():
         "cal/p00/r000/l200-p00-r000-cal-20230101T123456Z-par_dsp.yaml",
         "lar/p00/r000/l200-p00-r000-lar-20230110T123456Z-par_dsp.yaml",
     }
+
+
+def _reference_par_keylist(keys):
+    # original quadratic implementation, kept to check the output is unchanged
+    keylist = []
+    keys = sorted(keys, key=FileKey.get_unix_timestamp)
+    keylist.append(keys[0])
+    for key in keys[1:]:
+        matched_key = ParsKeyResolve.match_keys(keylist[-1], key)
+        if matched_key not in keylist:
+            keylist.append(matched_key)
+    return keylist
+
+
+def _reference_all_entries(entrylist, name_dict):
+    out_list = [ParsKeyResolve.entry_from_filekey(entrylist[0], name_dict)]
+    for entry in entrylist[1:]:
+        new_entry = ParsKeyResolve.entry_from_filekey(entry, name_dict)
+        ParsKeyResolve.match_entries(out_list[-1], new_entry)
+        out_list.append(new_entry)
+    return out_list
+
+
+def test_par_catalog_regression(tmp_path):
+    keys = []
+    for per in range(3):
+        for run in range(20):
+            for datatype, offset in (("cal", 0), ("lar", 5), ("cal", 3)):
+                keys.append(
+                    FileKey(
+                        "l200",
+                        f"p{per:02}",
+                        f"r{run:03}",
+                        datatype,
+                        f"2023{per + 1:02}{run + 1:02}T{offset:02}0000Z",
+                    )
+                )
+    # duplicated keys as found when searching more than one pattern
+    keys += keys[::7]
+    name_dict = {"cal": ["par_dsp", "par_hit"], "lar": ["par_dsp"]}
+
+    keylist = ParsKeyResolve.generate_par_keylist(keys)
+    assert keylist == _reference_par_keylist(keys)
+
+    new = ParsKeyResolve({"all": ParsKeyResolve.match_all_entries(keylist, name_dict)})
+    ref = ParsKeyResolve({"all": _reference_all_entries(keylist, name_dict)})
+    assert new.entries == ref.entries
+
+    new.write_to(tmp_path / "new-validity.yaml")
+    ref.write_to(tmp_path / "ref-validity.yaml")
+    assert (tmp_path / "new-validity.yaml").read_text() == (
+        tmp_path / "ref-validity.yaml"
+    ).read_text()
@@ -0,0 +1,151 @@
+import awkward as ak
+import numpy as np
+import pytest
+from lgdo import Array, Table, VectorOfVectors, lh5
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+CHANNELS = [1084803, 1084804, 1121600]
+MUON_CHANNEL = 1121600
+
+
+def _write_tiers(path, n_events=100):
+    rng = np.random.default_rng(1)
+    event_times = np.arange(n_events) * 1e-6
+    keys, rows = [], []
+    hits = {ch: [] for ch in CHANNELS}
+    for i in range(n_events):
+        evt_chans = sorted(rng.choice(CHANNELS, rng.integers(1, 4), replace=False))
+        keys.append([int(ch) for ch in evt_chans])
+        rows.append([len(hits[ch]) for ch in evt_chans])
+        for ch in evt_chans:
+            hits[ch].append(i)
+
+    muon_keys = [[MUON_CHANNEL]] * len(hits[MUON_CHANNEL])
+    muon_rows = [[row] for row in range(len(hits[MUON_CHANNEL]))]
+    for name, tcm_keys, tcm_rows in [
+        ("hardware_tcm_1", keys, rows),
+        ("hardware_tcm_2", muon_keys, muon_rows),
+    ]:
+        tcm = Table(
+            col_dict={
+                "table_key": VectorOfVectors(tcm_keys),
+                "row_in_table": VectorOfVectors(tcm_rows),
+            }
+        )
+        lh5.write(tcm, name, str(path / "tcm.lh5"), wo_mode="a")
+
+    for ch, events in hits.items():
+        hit = Table(
+            col_dict={
+                "energy": Array(rng.uniform(0, 100, len(events))),
+                "timestamp": Array(event_times[events]),
+            }
+        )
+        lh5.write(hit, f"ch{ch}/hit", str(path / "hit.lh5"), wo_mode="a")
+        dsp = Table(col_dict={"tp_0": Array(rng.uniform(0, 100, len(events)))})
+        lh5.write(dsp, f"ch{ch}/dsp", str(path / "dsp.lh5"), wo_mode="a")
+
+    return {
+        "tcm": (str(path / "tcm.lh5"), "hardware_tcm_1", "ch{}"),
+        "dsp": (str(path / "dsp.lh5"), "dsp", "ch{}"),
+        "hit": (str(path / "hit.lh5"), "hit", "ch{}"),
+        "evt": (None, "evt"),
+    }
+
+
+def test_write_evt_chunked(tmp_path):
+    from legenddataflow.scripts.tier.evt import write_evt
+
+    file_table = _write_tiers(tmp_path)
+    evt_config = {
+        "channels": {"geds_on": [f"ch{ch}" for ch in CHANNELS]},
+        "outputs": [
+            "trigger___timestamp",
+            "geds___energy_sum",
+            "geds___tp_0",
+            "coincident___multiplicity",
+        ],
+        "operations": {
+            "trigger___timestamp": {
+                "channels": "geds_on",
+                "aggregation_mode": "sum",
+                "expression": "hit.timestamp",
+                "initial": 0.0,
+            },
+            "geds___energy_sum": {
+                "channels": "geds_on",
+                "aggregation_mode": "sum",
+                "expression": "hit.energy",
+                "initial": 0.0,
+            },
+            "geds___tp_0": {
+                "channels": "geds_on",
+                "aggregation_mode": "gather",
+                "expression": "dsp.tp_0",
+            },
+            "coincident___multiplicity": {
+                "channels": "geds_on",
+                "aggregation_mode": "sum",
+                "expression": "hit.energy > 50",
+                "initial": 0,
+            },
+        },
+    }
+    muon_config = {
+        "channels": {"muon": [f"ch{MUON_CHANNEL}"]},
+        "outputs": ["timestamp", "flag"],
+        "operations": {
+            "timestamp": {
+                "channels": "muon",
+                "aggregation_mode": "sum",
+                "expression": "hit.timestamp",
+                "initial": 0.0,
+            },
+            "flag": {
+                "channels": "muon",
+                "aggregation_mode": "any",
+                "expression": "hit.energy > 50",
+                "initial": False,
+            },
+        },
+    }
+    field_config = {
+        "ged_timestamp": {"table": "trigger", "field": "timestamp"},
+        "muon_timestamp": {"field": "timestamp"},
+        "muon_flag": {"field": "flag"},
+        "output_field": {"table": "coincident", "field": "muon"},
+        "jitter": 2e-8,
+    }
+
+    for output, buffer_len in [("one_shot.lh5", None), ("chunked.lh5", 7)]:
+        write_evt(
+            file_table,
+            evt_config,
+            str(tmp_path / output),
+            muon_config=muon_config,
+            field_config=field_config,
+            buffer_len=buffer_len,
+        )
+
+    expected = lh5.read("evt", str(tmp_path / "one_shot.lh5"))
+    result = lh5.read("evt", str(tmp_path / "chunked.lh5"))
+    assert list(result) == list(expected)
+    for table in expected:
+        assert list(result[table]) == list(expected[table])
+        assert ak.to_list(result[table].view_as("ak")) == ak.to_list(
+            expected[table].view_as("ak")
+        )
+    assert expected["coincident"]["muon"].nda.any()
+
+    # first_at/last_at aggregations differ when evaluated blockwise
+    evt_config["outputs"].append("geds___first_energy")
+    evt_config["operations"]["geds___first_energy"] = {
+        "channels": "geds_on",
+        "aggregation_mode": "first_at:dsp.tp_0",
+        "expression": "hit.energy",
+        "initial": np.nan,
+    }
+    with pytest.raises(ValueError, match="first_at"):
+        write_evt(file_table, evt_config, str(tmp_path / "first_at.lh5"), buffer_len=7)
+    assert not (tmp_path / "first_at.lh5").exists()
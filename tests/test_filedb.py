@@ -0,0 +1,112 @@
+import json
+
+import h5py
+import numpy as np
+import pytest
+from legenddataflow.filedb import get_manifest_file, update_filedb, update_filedbs
+
+
+def _config(tmp_path):
+    return {
+        "data_dir": str(tmp_path),
+        "tier_dirs": {"raw": "/raw", "dsp": "/dsp"},
+        "file_format": {
+            tier: f"/{{type}}/{{period}}/{{run}}/l200-{{period}}-{{run}}-{{type}}-{{timestamp}}-tier_{tier}.lh5"
+            for tier in ["raw", "dsp"]
+        },
+        "table_format": {"raw": "ch{ch:07d}/raw", "dsp": "ch{ch:07d}/dsp"},
+    }
+
+
+def _write_file(tmp_path, tier, timestamp, fields, run="r000"):
+    path = tmp_path / tier / "cal" / "p00" / run
+    path.mkdir(parents=True, exist_ok=True)
+    file = path / f"l200-p00-{run}-cal-{timestamp}-tier_{tier}.lh5"
+    with h5py.File(file, "w") as f:
+        for channel in [1, 2]:
+            tbl = f.create_group(f"ch{channel:07d}/{tier}")
+            tbl.attrs["datatype"] = f"table{{{','.join(fields)}}}"
+            for field in fields:
+                dset = tbl.create_dataset(field, data=np.arange(3.0))
+                dset.attrs["datatype"] = "array<1>{real}"
+    return file
+
+
+def _full_build(config, scan_path):
+    from pygama.flow.file_db import FileDB
+
+    fdb = FileDB(json.loads(json.dumps(config)), scan=False)
+    fdb.scan_files([scan_path])
+    fdb.scan_tables_columns(dir_files_conform=False)
+    return fdb
+
+
+def _read(file):
+    from pygama.flow.file_db import FileDB
+
+    return FileDB([str(file)])
+
+
+def _assert_same(fdb, ref):
+    def _columns(db, tier):
+        return [
+            None if idx is None else [db.columns[i] for i in idx]
+            for idx in db.df[f"{tier}_col_idx"]
+        ]
+
+    assert list(fdb.df["raw_file"]) == list(ref.df["raw_file"])
+    assert list(fdb.df["file_status"]) == list(ref.df["file_status"])
+    for tier in ["raw", "dsp"]:
+        assert list(fdb.df[f"{tier}_tables"]) == list(ref.df[f"{tier}_tables"])
+        assert list(fdb.df[f"{tier}_size"]) == list(ref.df[f"{tier}_size"])
+        assert _columns(fdb, tier) == _columns(ref, tier)
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_update_filedb(tmp_path):
+    config = _config(tmp_path)
+    out_file = tmp_path / "filedb" / "l200-p00-r000-cal-filedb.h5"
+    for timestamp in ["20230101T000000Z", "20230101T010000Z"]:
+        _write_file(tmp_path, "raw", timestamp, ["timestamp"])
+    _write_file(tmp_path, "dsp", "20230101T000000Z", ["energy"])
+
+    assert update_filedb(config, "cal/p00/r000", out_file) == 2
+    assert get_manifest_file(out_file).is_file()
+    _assert_same(_read(out_file), _full_build(config, "cal/p00/r000"))
+
+    # nothing changed
+    assert update_filedb(config, "cal/p00/r000", out_file) == 0
+
+    # only the rows of the new and changed files are rescanned
+    _write_file(tmp_path, "dsp", "20230101T010000Z", ["energy", "trapEmax"])
+    _write_file(tmp_path, "raw", "20230101T020000Z", ["timestamp"])
+    assert update_filedb(config, "cal/p00/r000", out_file) == 2
+    _assert_same(_read(out_file), _full_build(config, "cal/p00/r000"))
+
+    # rows of removed files are dropped
+    (
+        tmp_path
+        / "raw"
+        / "cal"
+        / "p00"
+        / "r000"
+        / "l200-p00-r000-cal-20230101T020000Z-tier_raw.lh5"
+    ).unlink()
+    assert update_filedb(config, "cal/p00/r000", out_file) == 0
+    _assert_same(_read(out_file), _full_build(config, "cal/p00/r000"))
+
+    # a different configuration or refresh rescans everything
+    assert update_filedb(config, "cal/p00/r000", out_file, refresh=True) == 2
+    config["sortby"] = "timestamp"
+    assert update_filedbs(config, {"cal/p00/r000": out_file}) == {"cal/p00/r000": 2}
+
+    # the runs are updated in separate processes
+    _write_file(tmp_path, "raw", "20230102T000000Z", ["timestamp"], run="r001")
+    out_file2 = tmp_path / "filedb" / "l200-p00-r001-cal-filedb.h5"
+    outputs = {"cal/p00/r000": out_file, "cal/p00/r001": out_file2}
+    assert update_filedbs(config, outputs, n_workers=2) == {
+        "cal/p00/r000": 0,
+        "cal/p00/r001": 1,
+    }
+    _assert_same(_read(out_file2), _full_build(config, "cal/p00/r001"))
@@ -3,6 +3,7 @@ from pathlib import Path
 import yaml
 from legenddataflow import (
     FileKey,
+    ProcessingFileKey,
     patterns,
     subst_vars,
     utils,
@@ -39,3 +40,22 @@ def test_filekey():
         ).name
         == key.name
     )
+
+
+def test_parse_many():
+    pattern = patterns.get_pattern_tier(setup, "dsp")
+    files = [
+        f"{utils.get_tier_path(setup, 'dsp')}/cal/p00/r000/l200-p00-r000-cal-20230101T123456Z-tier_dsp.lh5",
+        f"{utils.get_tier_path(setup, 'dsp')}/phy/p00/r001/l200-p00-r001-phy-20230102T123456Z-tier_dsp.lh5",
+        "not_a_key.lh5",
+    ]
+    keys = FileKey.parse_many(files, pattern)
+    assert keys == [FileKey.get_filekey_from_pattern(file, pattern) for file in files]
+    assert keys[1] == FileKey("l200", "p00", "r001", "phy", "20230102T123456Z")
+    assert keys[2] is None
+
+    keys = ProcessingFileKey.parse_many(
+        ["l200-p00-r000-cal-20230101T123456Z-par_dsp.yaml"]
+    )
+    assert keys[0].processing_step == "par_dsp"
+    assert keys[0].timestamp == "20230101T123456Z"
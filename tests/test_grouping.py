@@ -0,0 +1,27 @@
+from legenddataflow.grouping import (
+    group_by_period,
+    group_by_run,
+    per_grouper,
+    run_grouper,
+)
+
+files = [
+    "/tier/dsp/cal/p01/r001/l200-p01-r001-cal-20230101T000000Z-tier_dsp.lh5",
+    "/tier/dsp/cal/p01/r002/l200-p01-r002-cal-20230102T000000Z-tier_dsp.lh5",
+    "/tier/dsp/cal/p01/r001/l200-p01-r001-cal-20230101T010000Z-tier_dsp.lh5",
+    "/tier/dsp/cal/p02/r000/l200-p02-r000-cal-20230201T000000Z-tier_dsp.lh5",
+]
+
+
+def test_group_by_run():
+    groups = group_by_run(files)
+    assert list(groups) == ["l200-p01-r001", "l200-p01-r002", "l200-p02-r000"]
+    assert groups["l200-p01-r001"] == [files[0], files[2]]
+    assert run_grouper(files) == [[files[0], files[2]], [files[1]], [files[3]]]
+
+
+def test_group_by_period():
+    groups = group_by_period(files)
+    assert list(groups) == ["l200-p01", "l200-p02"]
+    assert groups["l200-p01"] == files[:3]
+    assert per_grouper(files) == [files[:3], [files[3]]]
@@ -0,0 +1,73 @@
+import glob
+
+from legenddataflow import FileKey
+from legenddataflow.inventory import DirectoryInventory
+
+
+def _make_tree(tmp_path):
+    for period, run, timestamps in [
+        ("p00", "r000", ["20230101T000000Z", "20230101T010000Z"]),
+        ("p00", "r001", ["20230102T000000Z"]),
+        ("p01", "r000", ["20230201T000000Z"]),
+    ]:
+        run_dir = tmp_path / "raw" / "phy" / period / run
+        run_dir.mkdir(parents=True)
+        for timestamp in timestamps:
+            (run_dir / f"l200-{period}-{run}-phy-{timestamp}-tier_raw.lh5").touch()
+        (run_dir / ".hidden.lh5").touch()
+        (run_dir / "daq.log").touch()
+
+
+def test_glob(tmp_path):
+    _make_tree(tmp_path)
+    inventory = DirectoryInventory()
+
+    for pattern in [
+        tmp_path / "raw" / "phy" / "*" / "*" / "*.lh5",
+        tmp_path / "raw" / "phy" / "p00" / "r000" / "l200-p00-r000-phy-*",
+        tmp_path / "raw" / "phy" / "p0?" / "r000" / "*",
+        tmp_path / "raw" / "*" / "p02" / "*" / "*",
+        tmp_path / "raw" / "phy" / "p00" / "r000" / "daq.log",
+        tmp_path / "raw" / "phy" / "p00" / "r002" / "daq.log",
+    ]:
+        assert inventory.glob(pattern) == sorted(glob.glob(str(pattern)))  # noqa: PTH207
+
+
+def test_saved_scans(tmp_path):
+    _make_tree(tmp_path)
+    inventory = DirectoryInventory()
+    pattern = str(tmp_path / "raw" / "phy" / "*" / "*" / "*-tier_raw.lh5")
+
+    files = inventory.glob(pattern)
+    assert len(files) == 4
+    n_scans = inventory.n_scans
+    assert inventory.saved_scans == 0
+
+    # the same directories are not scanned again
+    assert inventory.glob(pattern) == files
+    assert inventory.glob(str(tmp_path / "raw" / "phy" / "p00" / "*" / "*")) != []
+    assert inventory.n_scans == n_scans
+    assert inventory.saved_scans > 0
+
+    inventory.clear()
+    assert inventory.n_scans == 0
+    assert inventory.glob(pattern) == files
+
+
+def test_get_filekeys(tmp_path):
+    _make_tree(tmp_path)
+    inventory = DirectoryInventory()
+    search_pattern = (
+        tmp_path
+        / "raw"
+        / "{datatype}"
+        / "{period}"
+        / "{run}"
+        / "{experiment}-{period}-{run}-{datatype}-{timestamp}-tier_raw.lh5"
+    )
+    files = inventory.glob(tmp_path / "raw" / "phy" / "p00" / "r000" / "*")
+    keys = inventory.get_filekeys(files, search_pattern)
+    assert keys == [FileKey.get_filekey_from_pattern(f, search_pattern) for f in files]
+    assert FileKey("l200", "p00", "r000", "phy", "20230101T000000Z") in keys
+    assert keys[0] is None  # daq.log
+    assert inventory.get_filekeys(files, search_pattern) == keys
@@ -0,0 +1,140 @@
+import h5py
+import numpy as np
+import pytest
+from legenddataflow.lh5_utils import (
+    LH5Inventory,
+    copy_lh5_objects,
+    get_lh5_inventory,
+    merge_lh5_files,
+    run_groups_to_parts,
+    split_groups,
+)
+
+
+def _write_channel(file, channel, values, mode="w"):
+    with h5py.File(file, mode) as f:
+        fields = list(f)
+        f.attrs["datatype"] = f"struct{{{','.join([*fields, channel])}}}"
+        grp = f.create_group(f"{channel}")
+        grp.attrs["datatype"] = "struct{dsp}"
+        tbl = grp.create_group("dsp")
+        tbl.attrs["datatype"] = "table{energy}"
+        dset = tbl.create_dataset("energy", data=values)
+        dset.attrs["datatype"] = "array<1>{real}"
+        dset.attrs["units"] = "keV"
+
+
+def test_merge_lh5_files(tmp_path):
+    _write_channel(tmp_path / "a.lh5", "ch0000001", np.arange(5.0))
+    _write_channel(tmp_path / "a.lh5", "ch0000002", np.arange(3.0), mode="a")
+    _write_channel(tmp_path / "b.lh5", "ch0000003", np.ones(4))
+
+    out_file = tmp_path / "out" / "merged.lh5"
+    merge_lh5_files([tmp_path / "a.lh5", tmp_path / "b.lh5"], out_file)
+
+    with h5py.File(out_file, "r") as f:
+        assert f.attrs["datatype"] == "struct{ch0000001,ch0000002,ch0000003}"
+        assert list(f) == ["ch0000001", "ch0000002", "ch0000003"]
+        assert np.array_equal(f["ch0000001/dsp/energy"][:], np.arange(5.0))
+        assert np.array_equal(f["ch0000003/dsp/energy"][:], np.ones(4))
+        assert f["ch0000003/dsp"].attrs["datatype"] == "table{energy}"
+        assert f["ch0000003/dsp/energy"].attrs["units"] == "keV"
+
+
+def test_merge_lh5_files_duplicate(tmp_path):
+    _write_channel(tmp_path / "a.lh5", "ch0000001", np.arange(5.0))
+    _write_channel(tmp_path / "b.lh5", "ch0000001", np.arange(5.0))
+
+    with pytest.raises(RuntimeError):
+        merge_lh5_files([tmp_path / "a.lh5", tmp_path / "b.lh5"], tmp_path / "c.lh5")
+
+
+def test_merge_lh5_files_names(tmp_path):
+    _write_channel(tmp_path / "a.lh5", "ch0000001", np.arange(5.0))
+    _write_channel(tmp_path / "a.lh5", "ch0000002", np.arange(3.0), mode="a")
+    _write_channel(tmp_path / "b.lh5", "ch0000003", np.ones(4))
+
+    out_file = tmp_path / "merged.lh5"
+    merge_lh5_files(
+        [tmp_path / "a.lh5", tmp_path / "b.lh5"],
+        out_file,
+        names=["ch0000001", "ch0000003"],
+    )
+    with h5py.File(out_file, "r") as f:
+        assert list(f) == ["ch0000001", "ch0000003"]
+        assert f.attrs["datatype"] == "struct{ch0000001,ch0000003}"
+        assert np.array_equal(f["ch0000003/dsp/energy"][:], np.ones(4))
+
+    with pytest.raises(ValueError, match="one object name"):
+        merge_lh5_files([tmp_path / "a.lh5"], out_file, names=[])
+
+
+def _write_channels(channels, file, n_values):
+    for i, channel in enumerate(channels):
+        _write_channel(
+            file, channel, np.arange(float(n_values)), mode="a" if i else "w"
+        )
+
+
+def test_run_groups_to_parts(tmp_path):
+    channels = [f"ch000000{i}" for i in range(5)]
+    groups = split_groups(channels, 2)
+    assert groups == [channels[:3], channels[3:]]
+    assert split_groups(channels, 10) == [[channel] for channel in channels]
+
+    out_file = tmp_path / "out.lh5"
+    run_groups_to_parts(_write_channels, groups, out_file, n_values=4)
+    with h5py.File(out_file, "r") as f:
+        assert list(f) == channels
+        assert np.array_equal(f["ch0000004/dsp/energy"][:], np.arange(4.0))
+    # the parts are removed
+    assert list(tmp_path.iterdir()) == [out_file]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_lh5_inventory(tmp_path):
+    from lgdo import lh5
+
+    file = tmp_path / "a.lh5"
+    _write_channel(file, "ch0000001", np.arange(5.0))
+    _write_channel(file, "ch0000002", np.arange(3.0), mode="a")
+    with h5py.File(file, "a") as f:
+        f.create_dataset("hardware_tcm_1", data=np.arange(3))
+
+    inventory = LH5Inventory(file)
+    for group in [
+        "",
+        "/ch*",
+        "ch0000001/dsp",
+        "ch0000003/dsp",
+        "ch0000001/dsp/",
+        "ch*/dsp/energy",
+    ]:
+        assert inventory.ls(group) == lh5.ls(file, group)
+
+    assert inventory.tables() == {"ch0000001/dsp", "ch0000002/dsp"}
+    assert inventory.fields("ch0000002/dsp") == ["energy"]
+
+    assert get_lh5_inventory(file) is get_lh5_inventory(file)
+
+
+def test_copy_lh5_objects(tmp_path):
+    _write_channel(tmp_path / "a.lh5", "ch0000001", np.arange(5.0))
+    _write_channel(tmp_path / "a.lh5", "ch0000002", np.arange(3.0), mode="a")
+    with h5py.File(tmp_path / "a.lh5", "a") as f:
+        f["ch0000002/dsp"].create_dataset(
+            "waveform", data=np.ones((3, 100)), compression="gzip"
+        )
+
+    out_file = tmp_path / "out.lh5"
+    copy_lh5_objects(tmp_path / "a.lh5", out_file, ["ch0000002/dsp"], mode="w")
+    with h5py.File(out_file, "r") as f:
+        assert list(f) == ["ch0000002"]
+        assert f["ch0000002"].attrs["datatype"] == "struct{dsp}"
+        assert f["ch0000002/dsp"].attrs["datatype"] == "table{energy}"
+        assert np.array_equal(f["ch0000002/dsp/energy"][:], np.arange(3.0))
+        # the data is copied with its compression
+        assert f["ch0000002/dsp/waveform"].compression == "gzip"
+
+    with pytest.raises(RuntimeError):
+        copy_lh5_objects(tmp_path / "a.lh5", out_file, ["ch0000002/dsp"])
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from legenddataflow.log_scan import check_log_files, find_log_files, scan_log_file
+
+
+def _write_logs(log_path):
+    logs = {
+        "dsp/p03/b.log": "INFO: start\nWARNING: low stats\nINFO: done\n",
+        "dsp/p03/a.log": "ERROR: failed\nWARNING: retry\nERROR: failed again",
+        "hit/c.log": "INFO: all good\n",
+        "evt/d.log": "WARNING: no muon channel\n",
+    }
+    for name, text in logs.items():
+        (log_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (log_path / name).write_text(text)
+    (log_path / "evt" / "keep.txt").write_text("not a log")
+
+
+def test_scan_log_file(tmp_path):
+    _write_logs(tmp_path)
+    errors, warnings = scan_log_file(tmp_path / "dsp/p03/a.log")
+    assert errors == ["ERROR: failed", "ERROR: failed again"]
+    assert warnings == ["WARNING: retry"]
+
+    files, dirs = find_log_files(tmp_path)
+    assert [Path(file).relative_to(tmp_path).as_posix() for file in files] == [
+        "dsp/p03/a.log",
+        "dsp/p03/b.log",
+        "evt/d.log",
+        "hit/c.log",
+    ]
+    # children come before their parents
+    assert dirs.index(str(tmp_path / "dsp" / "p03")) < dirs.index(str(tmp_path / "dsp"))
+
+
+def test_check_log_files(tmp_path):
+    log_path = tmp_path / "log"
+    _write_logs(log_path)
+
+    summary = tmp_path / "out" / "summary.log"
+    warning = tmp_path / "out" / "warning.log"
+    n_errors, n_warnings = check_log_files(
+        log_path, summary, "all-p03.gen", warning_file=warning, n_workers=4
+    )
+    assert (n_errors, n_warnings) == (2, 3)
+
+    lines = summary.read_text().splitlines()
+    assert lines[0].startswith("all-p03.gen successfully generated at ")
+    assert lines[0].endswith("with errors ")
+    assert lines[1:] == ["a.log : ERROR: failed", "a.log : ERROR: failed again"]
+    lines = warning.read_text().splitlines()
+    assert lines[0].endswith("with warnings ")
+    assert lines[1:] == [
+        "a.log : WARNING: retry",
+        "b.log : WARNING: low stats",
+        "d.log : WARNING: no muon channel",
+    ]
+
+    # the logs are deleted with the directories left empty
+    assert not (log_path / "dsp").exists()
+    assert not (log_path / "hit").exists()
+    assert [path.name for path in log_path.rglob("*")] == ["evt", "keep.txt"]
+
+    check_log_files(log_path, summary, "all-p03.gen")
+    assert summary.read_text().endswith("with no errors \n")
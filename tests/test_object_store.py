@@ -0,0 +1,66 @@
+import pickle as pkl
+import shelve
+
+import numpy as np
+import pytest
+from legenddataflow.object_store import (
+    ObjectStore,
+    is_object_store,
+    open_objects,
+    write_object_store,
+)
+
+
+def _fail():
+    msg = "entry should not be unpickled"
+    raise AssertionError(msg)
+
+
+class Unloadable:
+    # unpickling this object fails, to check entries are loaded independently
+    def __reduce__(self):
+        return (_fail, ())
+
+
+def test_object_store(tmp_path):
+    objects = {
+        "ch1104000": {"pars": np.arange(10.0), "results": {"a": 1}},
+        "ch1104001": Unloadable(),
+        "common": [1, 2, 3],
+    }
+    path = tmp_path / "objects.pkldb"
+    write_object_store(path, ((key, obj) for key, obj in objects.items()))
+    assert is_object_store(path)
+
+    with ObjectStore(path) as store:
+        assert list(store) == list(objects)
+        assert len(store) == 3
+        assert "ch1104001" in store
+        assert "ch0000000" not in store
+        assert np.array_equal(store["ch1104000"]["pars"], np.arange(10.0))
+        assert store["common"] == [1, 2, 3]
+        with pytest.raises(KeyError):
+            store["ch0000000"]
+
+    with pytest.raises(KeyError, match="duplicate"):
+        write_object_store(path, [("a", 1), ("a", 2)])
+
+    not_a_store = tmp_path / "objects.pkl"
+    not_a_store.write_bytes(b"not a store at all")
+    assert not is_object_store(not_a_store)
+    with pytest.raises(ValueError, match="not an object store"):
+        ObjectStore(not_a_store)
+
+
+def test_open_objects(tmp_path):
+    objects = {"ch1104000": {"a": 1}, "ch1104001": {"b": 2}}
+
+    write_object_store(tmp_path / "objects.pkldb", objects)
+    with (tmp_path / "objects.pkl").open("wb") as f:
+        pkl.dump(objects, f)
+    with shelve.open(str(tmp_path / "objects"), "c") as shelf:
+        shelf.update(objects)
+
+    for file in ["objects.pkldb", "objects.pkl", "objects.dir"]:
+        with open_objects(tmp_path / file) as loaded:
+            assert dict(loaded) == objects
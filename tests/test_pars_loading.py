@@ -1,30 +1,59 @@
 import logging
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import pytest
+from dbetto.catalog import Catalog
 from legenddataflow.pars_loading import ParsCatalog
 
 log = logging.getLogger(__name__)
 
 
 def test_match_pars_files():
-    filelist1 = ["file1_step1_typeA", "file2_step2_typeB"]
-    filelist2 = ["file3_step1_typeA", "file4_step3_typeC"]
+    filelist1 = [
+        "l200-p00-r000-cal-20230101T000000Z-par_dsp.yaml",
+        "l200-p00-r000-cal-20230101T000000Z-par_hit.yaml",
+    ]
+    filelist2 = [
+        "l200-p00-r001-cal-20230110T000000Z-par_hit.yaml",
+        "l200-p00-r001-cal-20230110T000000Z-par_dsp.yaml",
+        "l200-p00-r001-phy-20230110T000000Z-par_dsp.yaml",
+    ]
 
-    with patch(
-        "legenddataflow.pars_loading.ProcessingFileKey.get_filekey_from_pattern"
-    ) as mock_get_filekey:
-        mock_get_filekey.side_effect = [
-            MagicMock(processing_step="step1", datatype="typeA"),
-            MagicMock(processing_step="step2", datatype="typeB"),
-            MagicMock(processing_step="step1", datatype="typeA"),
-            MagicMock(processing_step="step3", datatype="typeC"),
-        ]
+    result1, result2 = ParsCatalog.match_pars_files(filelist1, filelist2)
+
+    assert result1 == [
+        "l200-p00-r001-cal-20230110T000000Z-par_dsp.yaml",
+        "l200-p00-r001-cal-20230110T000000Z-par_hit.yaml",
+    ]
+    assert result2 == ["l200-p00-r001-phy-20230110T000000Z-par_dsp.yaml"]
 
-        result1, result2 = ParsCatalog.match_pars_files(filelist1, filelist2)
 
-        assert result1 == ["file1_step1_typeA", "file3_step1_typeA"]
-        assert result2 == ["file4_step3_typeC"]
+def test_valid_for():
+    validity = [
+        {"valid_from": "20230101T000000Z", "apply": ["file1.yaml"]},
+        {"valid_from": "20230201T000000Z", "apply": ["file2.yaml"]},
+        {"valid_from": "20230301T000000Z", "category": "cal", "apply": ["cal.yaml"]},
+    ]
+    catalog = ParsCatalog(Catalog.get(validity).entries)
+    reference = Catalog.get(validity)
+
+    for timestamp in [
+        "20230101T000000Z",
+        "20230115T000000Z",
+        "20230201T000000Z",
+        "20230401T000000Z",
+    ]:
+        for category in ["all", "cal", "phy"]:
+            assert catalog.valid_for(timestamp, category) == reference.valid_for(
+                timestamp, category
+            )
+
+    assert catalog.valid_for("20220101T000000Z", allow_none=True) is None
+    with pytest.warns(DeprecationWarning):
+        assert catalog.valid_for("20230401T000000Z", system="cal") == ["cal.yaml"]
+    with pytest.raises(RuntimeError):
+        catalog.valid_for("20220101T000000Z")
 
 
 def test_get_par_file():
@@ -44,19 +73,18 @@ def test_get_par_file():
     ) as mock_get_pars_path, patch(
         "legenddataflow.pars_loading.par_overwrite_path"
     ) as mock_par_overwrite_path, patch(
-        "legenddataflow.pars_loading.ParsCatalog.read_from"
-    ) as mock_read_from, patch(
+        "legenddataflow.pars_loading.get_catalog_registry"
+    ) as mock_get_catalog_registry, patch(
         "legenddataflow.pars_loading.ParsCatalog.valid_for"
     ) as mock_valid_for, patch(
         "legenddataflow.pars_loading.ParsCatalog.match_pars_files"
     ) as mock_match_pars_files:
         mock_get_pars_path.return_value = "/pars/path"
         mock_par_overwrite_path.return_value = "/overwrite/path"
-        mock_read_from.return_value = ParsCatalog({"all": []})
-        mock_valid_for.side_effect = [
-            ["file1.yaml", "file2.yaml"],  # pars_files
-            ["file3.yaml"],  # pars_files_overwrite
-        ]
+        mock_valid_for.return_value = ["file1.yaml", "file2.yaml"]  # pars_files
+        mock_get_catalog_registry.return_value.valid_for.return_value = [
+            "file3.yaml"
+        ]  # pars_files_overwrite
         mock_match_pars_files.return_value = (
             ["file1.yaml", "file2.yaml"],
             ["file3.yaml"],
@@ -0,0 +1,67 @@
+import pickle as pkl
+
+import numpy as np
+import pytest
+from legenddataflow import plot_data
+
+
+def _energy_plot():
+    rng = np.random.default_rng(1)
+    energy = rng.normal(2614, 2, 1000)
+    return plot_data.plot(
+        plot_data.panel(
+            plot_data.hist(energy, bins=np.arange(0, 3000, 1)),
+            ylabel="counts",
+            yscale="log",
+        ),
+        plot_data.panel(
+            plot_data.hist2d(
+                rng.uniform(1.6e9, 1.6e9 + 3600, 1000),
+                energy,
+                bins=[np.arange(1.6e9, 1.6e9 + 3780, 180), np.arange(2600, 2630)],
+            ),
+            ylabel="Energy(keV)",
+            ylim=(2600, 2630),
+            xaxis="timestamp",
+        ),
+        title="V01234A",
+        figsize=(8, 10),
+    )
+
+
+def test_plot_data():
+    plot = _energy_plot()
+    assert plot_data.is_plot_data(plot)
+    assert not plot_data.is_plot_data({"ecal": plot})
+    # the data is stored binned
+    assert plot["panels"][0]["layers"][0]["counts"].sum() == 1000
+    assert plot["panels"][1]["layers"][0]["counts"].shape == (20, 29)
+    assert plot_data.is_plot_data(pkl.loads(pkl.dumps(plot)))
+
+    with pytest.raises(ValueError, match="unknown xaxis"):
+        plot_data.panel(xaxis="time")
+
+
+def test_render():
+    from matplotlib.figure import Figure
+
+    fig = plot_data.render(_energy_plot())
+    assert isinstance(fig, Figure)
+    top, bottom = fig.axes[:2]
+    assert top.get_yscale() == "log"
+    assert top.get_ylabel() == "counts"
+    assert bottom.get_ylim() == (2600, 2630)
+    assert bottom.get_xlabel().startswith("Time starting : ")
+    assert fig.get_suptitle() == "V01234A"
+
+    dates = plot_data.plot(
+        plot_data.panel(
+            plot_data.scatter([1.6e9, 1.61e9], [1.0, 2.0]),
+            plot_data.hline(1.5, color="r"),
+            xlabel="time",
+            xaxis="date",
+        )
+    )
+    rendered = plot_data.render_all({"psp": {"field": dates}, "common": 1})
+    assert isinstance(rendered["psp"]["field"], Figure)
+    assert rendered["common"] == 1
@@ -0,0 +1,50 @@
+from legenddataflow.profiler import DagProfiler
+
+
+class Helpers:
+    def method(self, x):
+        return x + 1
+
+    @staticmethod
+    def static(x):
+        return x + 2
+
+    @classmethod
+    def cls_method(cls, x):
+        return x + 3
+
+
+def get_filelist(x):
+    return [x]
+
+
+def test_instrument(tmp_path):
+    profiler = DagProfiler()
+    profiler.instrument(Helpers, "method")
+    profiler.instrument(Helpers, "static")
+    profiler.instrument(Helpers, "cls_method")
+    # instrumenting twice does not wrap again
+    profiler.instrument(Helpers, "method")
+
+    for _ in range(3):
+        assert Helpers().method(1) == 2
+    assert Helpers.static(1) == 3
+    assert Helpers().static(1) == 3
+    assert Helpers.cls_method(1) == 4
+
+    namespace = {"get_filelist": get_filelist}
+    profiler.instrument_namespace(namespace)
+    assert namespace["get_filelist"](1) == [1]
+
+    calls = {(row[0], row[1]): row[2] for row in profiler.summary()}
+    assert calls[("Helpers.method", None)] == 3
+    assert calls[("Helpers.method", "(snakefile)")] == 3
+    assert calls[("Helpers.static", None)] == 2
+    assert calls[("Helpers.cls_method", None)] == 1
+    assert calls[("get_filelist", None)] == 1
+
+    totals = [row[3] for row in profiler.summary()]
+    assert totals == sorted(totals, reverse=True)
+
+    profiler.write_report(tmp_path / "profile.txt")
+    assert "Helpers.method" in (tmp_path / "profile.txt").read_text()
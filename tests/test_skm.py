@@ -0,0 +1,64 @@
+import awkward as ak
+import numpy as np
+import pytest
+from lgdo import Array, Table, VectorOfVectors, lh5
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+def _write_evt(file, n_events=50):
+    rng = np.random.default_rng(1)
+    evt = Table(
+        col_dict={
+            "geds": Table(
+                col_dict={
+                    "energy": Array(
+                        rng.uniform(0, 100, n_events), attrs={"units": "keV"}
+                    ),
+                    "multiplicity": Array(rng.integers(0, 3, n_events)),
+                    "rawid": VectorOfVectors([[i] for i in range(n_events)]),
+                }
+            ),
+            "coincident": Table(
+                col_dict={"puls": Array(rng.integers(0, 2, n_events).astype(bool))}
+            ),
+            "trigger": Table(col_dict={"timestamp": Array(np.arange(n_events) * 1.0)}),
+        }
+    )
+    lh5.write(evt, "evt", file)
+
+
+def test_get_filter_fields(tmp_path):
+    from legenddataflow.scripts.tier.skm import get_field_mask, get_filter_fields
+
+    file = str(tmp_path / "evt.lh5")
+    _write_evt(file)
+
+    assert get_filter_fields(
+        "(evt.geds.multiplicity == 1) & ~evt['coincident']['puls']", file
+    ) == ["geds.multiplicity", "coincident.puls"]
+    assert get_filter_fields("evt.geds.energy.to_numpy() > 1", file) == ["geds.energy"]
+    assert get_filter_fields("ak.num(evt) > 0", file) is None
+    assert get_field_mask(["geds", "geds.energy", "trigger.timestamp"]) == [
+        "geds",
+        "trigger/timestamp",
+    ]
+
+
+def test_write_skm(tmp_path):
+    from legenddataflow.scripts.tier.skm import build_skm_table, write_skm
+
+    file = str(tmp_path / "evt.lh5")
+    _write_evt(file)
+    evt_filter = "(evt.geds.multiplicity == 1) & ~evt.coincident.puls"
+    keep_fields = ["geds.energy", "geds.rawid", "trigger"]
+
+    expected = build_skm_table(
+        lh5.read_as("evt", file, "ak"), evt_filter, list(keep_fields)
+    )
+    write_skm(file, str(tmp_path / "skm.lh5"), evt_filter, keep_fields, buffer_len=7)
+    result = lh5.read("skm", str(tmp_path / "skm.lh5"))
+
+    assert len(result) == len(expected) > 0
+    assert ak.to_list(result.view_as("ak")) == ak.to_list(expected.view_as("ak"))
+    assert result["geds"].attrs == expected["geds"].attrs
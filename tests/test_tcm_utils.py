@@ -0,0 +1,96 @@
+import awkward as ak
+import numpy as np
+import pytest
+from lgdo import Array, Table, lh5
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+def _write_raw(file, fcid_channels, n_events=500):
+    rng = np.random.default_rng(1)
+    # events spread over the channels, with the same timestamp in coincident rows
+    evt_times = np.sort(rng.uniform(0, 100, n_events))
+    for tables in fcid_channels.values():
+        for table in tables:
+            times = np.sort(rng.choice(evt_times, n_events // 2, replace=False))
+            raw = Table(
+                col_dict={
+                    "timestamp": Array(times),
+                    "daqenergy": Array(rng.uniform(0, 5000, len(times))),
+                }
+            )
+            lh5.write(raw, table, file, wo_mode="a")
+
+
+def test_build_hardware_tcms(tmp_path):
+    from legenddataflow.tcm_utils import build_hardware_tcms
+    from pygama.evt.build_tcm import build_tcm
+
+    raw_file = str(tmp_path / "raw.lh5")
+    fcid_channels = {
+        0: ["/ch1104000/raw", "/ch1104001/raw", "/ch1104002/raw"],
+        1: ["/ch1105600/raw", "/ch1105601/raw"],
+    }
+    _write_raw(raw_file, fcid_channels)
+    # a channel without raw table is skipped
+    lh5.write(
+        Table(col_dict={"baseline": Array(np.zeros(3))}),
+        "ch1104003/dsp",
+        raw_file,
+        wo_mode="a",
+    )
+    fcid_channels[0].append("/ch1104003/raw")
+
+    for fcid, tables in fcid_channels.items():
+        build_tcm(
+            [(raw_file, tables)],
+            coin_cols="timestamp",
+            out_file=str(tmp_path / "expected.lh5"),
+            out_name=f"hardware_tcm_{fcid}",
+            wo_mode="o",
+        )
+    build_hardware_tcms(
+        raw_file,
+        fcid_channels,
+        str(tmp_path / "tcm.lh5"),
+        coin_cols="timestamp",
+        n_workers=2,
+    )
+
+    for fcid in fcid_channels:
+        expected = lh5.read(f"hardware_tcm_{fcid}", str(tmp_path / "expected.lh5"))
+        result = lh5.read(f"hardware_tcm_{fcid}", str(tmp_path / "tcm.lh5"))
+        assert result.attrs == expected.attrs
+        for field in ["table_key", "row_in_table"]:
+            assert ak.to_list(result[field].view_as("ak")) == ak.to_list(
+                expected[field].view_as("ak")
+            )
+
+
+def test_build_tcm_table_blinded(tmp_path):
+    from legenddataflow.blinding import BlindingIndex
+    from legenddataflow.tcm_utils import build_hardware_tcms, build_tcm_table
+
+    raw_file = str(tmp_path / "raw.lh5")
+    fcid_channels = {0: ["ch1104000/raw", "ch1104001/raw"]}
+    _write_raw(raw_file, fcid_channels, n_events=10)
+
+    index = BlindingIndex([0, 3], [1104000], 5)
+    build_hardware_tcms(
+        raw_file,
+        fcid_channels,
+        str(tmp_path / "tcm.lh5"),
+        coin_cols="timestamp",
+        blind_index=index,
+    )
+    tcm = lh5.read("hardware_tcm_0", str(tmp_path / "tcm.lh5"))
+    keys = ak.flatten(tcm.table_key.view_as("ak")).to_numpy()
+    rows = ak.flatten(tcm.row_in_table.view_as("ak")).to_numpy()
+    # the rows of the blinded channel are renumbered after the hidden rows
+    assert sorted(rows[keys == 1104000]) == [0, 1, 2]
+    assert sorted(rows[keys == 1104001]) == [0, 1, 2, 3, 4]
+
+    empty = build_tcm_table(
+        {"ch1104000/raw": {"timestamp": np.array([])}}, coin_cols="timestamp"
+    )
+    assert len(empty) == 0
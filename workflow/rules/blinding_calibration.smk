@@ -61,7 +61,9 @@ rule build_plts_blinding:
             name="blindcal",
         ),
     output:
-        get_pattern_plts(config, "raw", name="blindcal"),
+        get_pattern_plts(
+            config, "raw", name="blindcal", extension=objects_extension
+        ),
     group:
         "merge-blindcal"
     shell:
@@ -80,7 +82,9 @@ rule build_pars_blinding:
             chan_maps,
             name="blindcal",
         ),
-        plts=get_pattern_plts(config, "raw", name="blindcal"),
+        plts=get_pattern_plts(
+            config, "raw", name="blindcal", extension=objects_extension
+        ),
     output:
         get_pattern_pars(config, "raw", name="blindcal", check_in_cycle=check_in_cycle),
     group:
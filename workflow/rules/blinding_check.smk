@@ -62,7 +62,7 @@ rule build_plts_raw:
             chan_maps,
         ),
     output:
-        get_pattern_plts(config, "raw"),
+        get_pattern_plts(config, "raw", extension=objects_extension),
     group:
         "merge-raw"
     shell:
@@ -83,6 +83,7 @@ rule build_pars_raw:
         plts=get_pattern_plts(
             config,
             "raw",
+            extension=objects_extension,
         ),
     output:
         get_pattern_pars(config, "raw", check_in_cycle=check_in_cycle),
@@ -19,7 +19,7 @@ def build_merge_rules(tier, lh5_merge=False, lh5_tier=None):
                 chan_maps,
             ),
         output:
-            patterns.get_pattern_plts(config, tier),
+            patterns.get_pattern_plts(config, tier, extension=objects_extension),
         group:
             f"merge-{tier}"
         shell:
@@ -46,7 +46,7 @@ def build_merge_rules(tier, lh5_merge=False, lh5_tier=None):
                 config,
                 tier,
                 name="objects",
-                extension="dir",
+                extension=objects_extension,
                 check_in_cycle=check_in_cycle,
             ),
         group:
@@ -131,12 +131,12 @@ def build_merge_rules(tier, lh5_merge=False, lh5_tier=None):
                 tier,
                 datatype="cal",
             ) if lh5_merge is True else [],
-            plts=patterns.get_pattern_plts(config, tier),
+            plts=patterns.get_pattern_plts(config, tier, extension=objects_extension),
             objects=patterns.get_pattern_pars(
                 config,
                 tier,
                 name="objects",
-                extension="dir",
+                extension=objects_extension,
                 check_in_cycle=check_in_cycle,
             ),
         output:
@@ -5,8 +5,17 @@ Helper functions for running data production
 from pathlib import Path
 from legenddataflow import patterns as patt
 from legenddataflow import ProcessingFileKey, ParsCatalog
-from dbetto.catalog import Catalog
 from legenddataflow import utils
+from legenddataflow.catalog_registry import get_catalog_registry
+
+# validity files are only read once per invocation
+catalogs = get_catalog_registry()
+
+# "copy" writes a blinded copy of the phy raw files, "index" only the rows to hide
+blinding_mode = config.get("blinding_mode", "copy")
+
+# "dir" merges the channel objects and plots in shelve databases, "pkldb" in object stores
+objects_extension = config.get("objects_extension", "dir")
 
 
 def ro(path):
@@ -15,7 +24,7 @@ def ro(path):
 
 def get_blinding_curve_file(wildcards):
     """func to get the blinding calibration curves from the overrides"""
-    par_files = Catalog.get_files(
+    par_files = catalogs.get_files(
         Path(patt.par_overwrite_path(config)) / "raw" / "validity.yaml",
         wildcards.timestamp,
     )
@@ -41,6 +50,22 @@ def get_blinding_check_file(
         ]
 
 
+def get_blinding_index_file(wildcards):
+    """func to get the blinding index of the raw file when blinding by index"""
+    if blinding_mode != "index" or wildcards.datatype != "phy":
+        return []
+    return str(patt.get_pattern_tier_raw_blind_index(config)).format(
+        **dict(wildcards.items())
+    )
+
+
+def get_blinding_index_arg(input):
+    """func to pass the blinding index to the tier scripts if there is one"""
+    if len(input.blind_index) == 0:
+        return ""
+    return f"--blind-index {ro(input.blind_index)} "
+
+
 def set_last_rule_name(workflow, new_name):
     """Sets the name of the most recently created rule to be `new_name`.
     Useful when creating rules dynamically (i.e. unnamed).
@@ -69,7 +94,7 @@ def set_last_rule_name(workflow, new_name):
 def get_input_par_file(setup, wildcards, tier, name):
     allow_none = setup.get("allow_none", False)
     par_overwrite_file = Path(patt.par_overwrite_path(config)) / tier / "validity.yaml"
-    pars_files_overwrite = Catalog.get_files(
+    pars_files_overwrite = catalogs.get_files(
         par_overwrite_file,
         wildcards.timestamp,
         category=wildcards.datatype if hasattr(wildcards, "datatype") else "all",
@@ -86,12 +111,12 @@ def get_input_par_file(setup, wildcards, tier, name):
 def get_overwrite_file(tier, wildcards=None, timestamp=None, name=None):
     par_overwrite_file = Path(patt.par_overwrite_path(config)) / tier / "validity.yaml"
     if timestamp is not None:
-        pars_files_overwrite = Catalog.get_files(
+        pars_files_overwrite = catalogs.get_files(
             par_overwrite_file,
             timestamp,
         )
     else:
-        pars_files_overwrite = Catalog.get_files(
+        pars_files_overwrite = catalogs.get_files(
             par_overwrite_file,
             wildcards.timestamp,
         )
@@ -6,6 +6,7 @@ Snakemake rules for processing dsp tier.
 
 from legenddataflow.pars_loading import ParsCatalog
 from legenddataflow.create_pars_keylist import ParsKeyResolve
+from legenddataflow.utils import catalog_cache_path
 from pathlib import Path
 from legenddataflow import patterns as patt
 from legenddataflow.execenv import execenv_pyexe
@@ -16,6 +17,8 @@ dsp_par_catalog = ParsKeyResolve.get_par_catalog(
     ["-*-*-*-cal"],
     get_pattern_tier(config, "raw", check_in_cycle=False),
     {"cal": ["par_dsp"], "lar": ["par_dsp"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 
@@ -37,10 +40,12 @@ rule build_dsp:
     input:
         raw_file=patt.get_pattern_tier(config, "raw", check_in_cycle=False),
         pars_files=ancient(lambda wildcards: _make_input_pars_file(wildcards)),
+        blind_index=get_blinding_index_file,
     params:
         timestamp="{timestamp}",
         datatype="{datatype}",
         ro_input=lambda _, input: {k: ro(v) for k, v in input.items()},
+        blind_index=lambda _, input: get_blinding_index_arg(input),
     output:
         tier_file=patt.get_pattern_tier(config, "dsp", check_in_cycle=check_in_cycle),
         db_file=patt.get_pattern_pars_tmp(config, "dsp_db"),
@@ -48,12 +53,15 @@ rule build_dsp:
         patt.get_pattern_log(config, "tier_dsp", time),
     group:
         "tier-dsp"
+    threads: 1
     resources:
         runtime=300,
         mem_swap=lambda wildcards: 35 if wildcards.datatype == "cal" else 25,
     shell:
         execenv_pyexe(config, "build-tier-dsp") + "--log {log} "
         "--tier dsp "
+        "--workers {threads} "
+        "{params.blind_index}"
         f"--configs {ro(configs)} "
         "--metadata {meta} "
         "--datatype {params.datatype} "
@@ -11,6 +11,9 @@ from legenddataflow.patterns import (
 )
 from legenddataflow.execenv import execenv_pyexe
 
+# number of events built at once, the whole file is built in memory if unset
+evt_buffer_len = config.get("evt_buffer_len", None)
+
 
 rule build_evt:
     input:
@@ -41,7 +44,7 @@ rule build_evt:
         "tier-evt"
     resources:
         runtime=300,
-        mem_swap=50,
+        mem_swap=50 if evt_buffer_len is None else 15,
     run:
         shell_string = (
             execenv_pyexe(config, "build-tier-evt") + f"--configs {ro(configs)} "
@@ -59,6 +62,8 @@ rule build_evt:
         )
         if input.ann_file is not None:
             shell_string += "--ann-file {params.ro_input[ann_file]} "
+        if evt_buffer_len is not None:
+            shell_string += f"--buffer-len {evt_buffer_len} "
 
         shell(shell_string)
 
@@ -92,7 +97,7 @@ rule build_pet:
         "tier-evt"
     resources:
         runtime=300,
-        mem_swap=50,
+        mem_swap=50 if evt_buffer_len is None else 15,
     run:
         shell_string = (
             execenv_pyexe(config, "build-tier-evt") + f"--configs {ro(configs)} "
@@ -110,6 +115,8 @@ rule build_pet:
         )
         if input.ann_file is not None:
             shell_string += "--ann-file {params.ro_input[ann_file]} "
+        if evt_buffer_len is not None:
+            shell_string += f"--buffer-len {evt_buffer_len} "
 
         shell(shell_string)
 
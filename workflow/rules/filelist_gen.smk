@@ -1,8 +1,9 @@
-import glob
 import json, yaml
 from pathlib import Path
 
-from legenddataflow.FileKey import FileKey, run_grouper
+from legenddataflow.FileKey import FileKey
+from legenddataflow.grouping import run_grouper
+from legenddataflow.inventory import get_inventory
 from legenddataflow import patterns as patt
 
 concat_datatypes = ["phy"]
@@ -171,13 +172,15 @@ def build_filelist(
     phy_filenames = []
     other_filenames = []
 
+    # directories are only listed once per invocation, see legenddataflow.inventory
+    inventory = get_inventory()
+    if Path(search_pattern).suffix == ".*":
+        search_pattern = Path(search_pattern).with_suffix(".{ext}")
+
     for key in filekeys:
-        if Path(search_pattern).suffix == ".*":
-            search_pattern = Path(search_pattern).with_suffix(".{ext}")
         fn_glob_pattern = key.get_path_from_filekey(search_pattern, ext="*")[0]
-        files = glob.glob(fn_glob_pattern)
-        for f in files:
-            _key = FileKey.get_filekey_from_pattern(f, search_pattern)
+        files = inventory.glob(fn_glob_pattern)
+        for f, _key in zip(files, inventory.get_filekeys(files, search_pattern)):
             if Path(f).suffix in ignore_suffixes:
                 pass
             elif _key is None:
@@ -187,7 +190,12 @@ def build_filelist(
             else:
                 if tier == "blind" and _key.datatype in blind_datatypes:
                     filename = FileKey.get_path_from_filekey(
-                        _key, patt.get_pattern_tier_raw_blind(config)
+                        _key,
+                        (
+                            patt.get_pattern_tier_raw_blind(config)
+                            if blinding_mode == "copy"
+                            else patt.get_pattern_tier_raw_blind_index(config)
+                        ),
                     )
                 elif tier == "skm":
                     filename = FileKey.get_path_from_filekey(
@@ -7,6 +7,7 @@ Snakemake rules for processing hit tier. This is done in 4 steps:
 """
 
 from legenddataflow.create_pars_keylist import ParsKeyResolve
+from legenddataflow.utils import catalog_cache_path
 from legenddataflow.pars_loading import ParsCatalog
 from pathlib import Path
 from legenddataflow.patterns import (
@@ -20,6 +21,8 @@ hit_par_catalog = ParsKeyResolve.get_par_catalog(
     ["-*-*-*-cal"],
     get_pattern_tier(config, "raw", check_in_cycle=False),
     {"cal": ["par_hit"], "lar": ["par_hit"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 build_merge_rules("hit", lh5_merge=False)
@@ -7,6 +7,7 @@ Snakemake rules for processing pht (partition hit) tier data. This is done in 4
 """
 
 from legenddataflow.create_pars_keylist import ParsKeyResolve
+from legenddataflow.utils import catalog_cache_path
 from legenddataflow.pars_loading import ParsCatalog
 from pathlib import Path
 from legenddataflow.utils import filelist_path, set_last_rule_name
@@ -21,6 +22,8 @@ pht_par_catalog = ParsKeyResolve.get_par_catalog(
     ["-*-*-*-cal"],
     get_pattern_tier(config, "raw", check_in_cycle=False),
     {"cal": ["par_pht"], "lar": ["par_pht"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 intier = "psp"
@@ -9,7 +9,11 @@ Snakemake rules for processing pht (partition hit) tier data. This is done in 4
 from legenddataflow.pars_loading import ParsCatalog
 from legenddataflow.create_pars_keylist import ParsKeyResolve
 from pathlib import Path
-from legenddataflow.utils import filelist_path, set_last_rule_name
+from legenddataflow.utils import (
+    catalog_cache_path,
+    filelist_path,
+    set_last_rule_name,
+)
 from legenddataflow.patterns import (
     get_pattern_pars_tmp_channel,
     get_pattern_plts_tmp_channel,
@@ -26,6 +30,8 @@ pht_par_catalog = ParsKeyResolve.get_par_catalog(
     ["-*-*-*-cal"],
     get_pattern_tier(config, "raw", check_in_cycle=False),
     {"cal": ["par_pht"], "lar": ["par_pht"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 intier = "psp"
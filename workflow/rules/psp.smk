@@ -6,6 +6,7 @@ Snakemake rules for processing psp (partition dsp) tier data.
 
 from legenddataflow.pars_loading import ParsCatalog
 from legenddataflow.create_pars_keylist import ParsKeyResolve
+from legenddataflow.utils import catalog_cache_path
 from pathlib import Path
 from legenddataflow.patterns import (
     get_pattern_plts,
@@ -20,6 +21,8 @@ psp_par_catalog = ParsKeyResolve.get_par_catalog(
     ["-*-*-*-cal"],
     get_pattern_tier(config, "raw", check_in_cycle=False),
     {"cal": ["par_psp"], "lar": ["par_psp"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 build_merge_rules("psp", lh5_merge=True, lh5_tier="dsp")
@@ -33,10 +36,12 @@ rule build_psp:
                 config, wildcards.timestamp, "psp"
             )
         ),
+        blind_index=get_blinding_index_file,
     params:
         timestamp="{timestamp}",
         datatype="{datatype}",
         ro_input=lambda _, input: {k: ro(v) for k, v in input.items()},
+        blind_index=lambda _, input: get_blinding_index_arg(input),
     output:
         tier_file=get_pattern_tier(config, "psp", check_in_cycle=check_in_cycle),
         db_file=get_pattern_pars_tmp(config, "psp_db"),
@@ -44,12 +49,15 @@ rule build_psp:
         get_pattern_log(config, "tier_psp", time),
     group:
         "tier-dsp"
+    threads: 1
     resources:
         runtime=300,
         mem_swap=lambda wildcards: 35 if wildcards.datatype == "cal" else 25,
     shell:
         execenv_pyexe(config, "build-tier-dsp") + "--log {log} "
         "--tier psp "
+        "--workers {threads} "
+        "{params.blind_index}"
         f"--configs {ro(configs)} "
         "--metadata {meta} "
         "--datatype {params.datatype} "
@@ -140,7 +140,7 @@ rule build_plts_pht_phy:
             name="qcphy",
         ),
     output:
-        get_pattern_plts(config, "pht", "qc_phy"),
+        get_pattern_plts(config, "pht", "qc_phy", extension=objects_extension),
     group:
         "merge-hit"
     shell:
@@ -159,7 +159,7 @@ rule build_pars_pht_phy:
             chan_maps,
             name="qcphy",
         ),
-        plts=get_pattern_plts(config, "pht", "qc_phy"),
+        plts=get_pattern_plts(config, "pht", "qc_phy", extension=objects_extension),
     output:
         get_pattern_pars(config, "pht", name="qc_phy", check_in_cycle=check_in_cycle),
     group:
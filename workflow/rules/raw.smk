@@ -5,8 +5,9 @@ from legenddataflow.patterns import (
     get_pattern_tier,
     get_pattern_log,
     get_pattern_tier_raw_blind,
+    get_pattern_tier_raw_blind_index,
 )
-from legenddataflow.utils import set_last_rule_name
+from legenddataflow.utils import catalog_cache_path, set_last_rule_name
 from legenddataflow.create_pars_keylist import ParsKeyResolve
 from legenddataflow.execenv import execenv_pyexe
 
@@ -19,6 +20,8 @@ raw_par_catalog = ParsKeyResolve.get_par_catalog(
         get_pattern_tier(config, "raw", check_in_cycle=False),
     ],
     {"cal": ["par_raw"]},
+    cache_dir=catalog_cache_path(config),
+    refresh=config.get("refresh_catalogs", False),
 )
 
 
@@ -134,7 +137,8 @@ rule build_raw_mgdo:
 rule build_raw_blind:
     """
     This rule runs the data blinding, it takes in the raw file, calibration curve stored in the overrides
-    and runs only if the blinding check file is on disk. Output is just the blinded raw file.
+    and runs only if the blinding check file is on disk. Output is just the blinded raw file, or
+    the index of the rows to hide if blinding_mode is "index".
     """
     input:
         tier_file=str(get_pattern_tier(config, "raw", check_in_cycle=False)).replace(
@@ -144,20 +148,28 @@ rule build_raw_blind:
     params:
         timestamp="{timestamp}",
         datatype="phy",
+        mode=blinding_mode,
         ro_input=lambda _, input: {k: ro(v) for k, v in input.items()},
     output:
-        get_pattern_tier_raw_blind(config),
+        (
+            get_pattern_tier_raw_blind(config)
+            if blinding_mode == "copy"
+            else get_pattern_tier_raw_blind_index(config)
+        ),
     log:
         str(get_pattern_log(config, "tier_raw_blind", time)).replace(
             "{datatype}", "phy"
         ),
     group:
         "tier-raw"
+    threads: 1
     resources:
         mem_swap=110,
         runtime=300,
     shell:
         execenv_pyexe(config, "build-tier-raw-blind") + "--log {log} "
+        "--workers {threads} "
+        "--mode {params.mode} "
         f"--configs {ro(configs)} "
         f"--chan-maps {ro(chan_maps)} "
         f"--metadata {ro(meta)} "
@@ -10,21 +10,28 @@ from legenddataflow.patterns import (
 )
 from legenddataflow.execenv import execenv_pyexe
 
+# "parallel" builds the tcms of all fcids in memory on the threads of the job
+tcm_mode = config.get("tcm_mode", "sequential")
+
 
 # This rule builds the tcm files each raw file
 rule build_tier_tcm:
     input:
-        get_pattern_tier(config, "raw", check_in_cycle=False),
+        raw_file=get_pattern_tier(config, "raw", check_in_cycle=False),
+        blind_index=get_blinding_index_file,
     params:
         timestamp="{timestamp}",
         datatype="{datatype}",
-        input=lambda _, input: ro(input),
+        input=lambda _, input: ro(input.raw_file),
+        blind_index=lambda _, input: get_blinding_index_arg(input),
+        mode=tcm_mode,
     output:
         get_pattern_tier(config, "tcm", check_in_cycle=check_in_cycle),
     log:
         get_pattern_log(config, "tier_tcm", time),
     group:
         "tier-tcm"
+    threads: min(workflow.cores, 8) if tcm_mode == "parallel" else 1
     resources:
         runtime=300,
         mem_swap=20,
@@ -33,6 +40,9 @@ rule build_tier_tcm:
         f"--configs {ro(configs)} "
         "--datatype {params.datatype} "
         "--timestamp {params.timestamp} "
+        "--mode {params.mode} "
+        "--workers {threads} "
+        "{params.blind_index}"
         "-- {params.input} {output}"
 
 
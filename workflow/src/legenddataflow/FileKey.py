@@ -5,6 +5,7 @@ This module contains classes to convert between keys and files using the pattern
 import re
 import string
 from collections import namedtuple
+from functools import lru_cache
 from itertools import product
 from pathlib import Path
 
@@ -39,6 +40,20 @@ def regex_from_filepattern(filepattern):
     return "".join(f)
 
 
+@lru_cache(maxsize=None)
+def compiled_regex_from_filepattern(filepattern):
+    """
+    Returns the compiled regex for a file pattern, patterns are only compiled
+    the first time they are seen
+    """
+    return re.compile(regex_from_filepattern(filepattern))
+
+
+@lru_cache(maxsize=None)
+def _compiled_re_pattern(re_pattern):
+    return re.compile(re_pattern)
+
+
 class FileKey(
     namedtuple("FileKey", ["experiment", "period", "run", "datatype", "timestamp"])
 ):
@@ -70,26 +85,52 @@ class FileKey(
     def get_filekey_from_filename(cls, filename):
         return cls.get_filekey_from_pattern(filename, processing_pattern())
 
+    @classmethod
+    def _key_builder(cls, key_pattern_rx):
+        """
+        Returns a function building a key from a match of `key_pattern_rx`,
+        fields missing from the pattern are set to "*"
+        """
+        fields = tuple(cls._fields)
+        if all(field in key_pattern_rx.groupindex for field in fields):
+            return lambda m: cls(*m.group(*fields))
+
+        def build(m):
+            d = m.groupdict()
+            return cls(*[d.get(field, "*") for field in fields])
+
+        return build
+
     @classmethod
     def get_filekey_from_pattern(cls, filename, pattern=None):
         if isinstance(pattern, Path):
             pattern = pattern.as_posix()
-        filename = str(filename)
-        key_pattern_rx = re.compile(
-            regex_from_filepattern(cls.key_pattern if pattern is None else pattern)
+        key_pattern_rx = compiled_regex_from_filepattern(
+            cls.key_pattern if pattern is None else str(pattern)
         )
-
-        if key_pattern_rx.match(filename) is None:
+        m = key_pattern_rx.match(str(filename))
+        if m is None:
             return None
-        else:
-            d = key_pattern_rx.match(filename).groupdict()
-            for entry in list(d):
-                if entry not in cls._fields:
-                    d.pop(entry)
-            for wildcard in cls._fields:
-                if wildcard not in d:
-                    d[wildcard] = "*"
-            return cls(**d)
+        return cls._key_builder(key_pattern_rx)(m)
+
+    @classmethod
+    def parse_many(cls, filenames, pattern=None):
+        """
+        Parses a list of filenames against a single pattern in one pass,
+        returns a list of keys with None for any filename not matching the pattern
+        """
+        if isinstance(pattern, Path):
+            pattern = pattern.as_posix()
+        key_pattern_rx = compiled_regex_from_filepattern(
+            cls.key_pattern if pattern is None else str(pattern)
+        )
+        match = key_pattern_rx.match
+        build = cls._key_builder(key_pattern_rx)
+        keys = []
+        for filename in filenames:
+            m = match(str(filename))
+            keys.append(None if m is None else build(m))
+        return keys
 
     @classmethod
     def unix_time_from_string(cls, value):
@@ -101,8 +142,7 @@ class FileKey(
 
     @classmethod
     def parse_keypart(cls, keypart):
-        keypart_rx = re.compile(cls.re_pattern)
-        d = keypart_rx.match(keypart).groupdict()
+        d = _compiled_re_pattern(cls.re_pattern).match(keypart).groupdict()
         for key in d:
             if d[key] is None:
                 d[key] = "*"
@@ -252,36 +292,3 @@ class ChannelProcKey(FileKey):
             file = formatter.vformat(par_pattern, (), wildcards_dict)
             filenames.append(file)
         return filenames
-
-
-def per_grouper(files):
-    """
-    Returns list containing lists of each run
-    """
-
-    pers = []
-    per_files = []
-    for file in files:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(file).name)
-        if f"{fk.experiment}-{fk.period}" not in pers:
-            pers.append(f"{fk.experiment}-{fk.period}")
-            per_files.append([])
-        for i, run in enumerate(pers):
-            if run == f"{fk.experiment}-{fk.period}":
-                per_files[i].append(file)
-    return per_files
-
-
-def run_grouper(files):
-    """Returns list containing lists of each run"""
-    runs = []
-    run_files = []
-    for file in files:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(file).name)
-        if f"{fk.experiment}-{fk.period}-{fk.run}" not in runs:
-            runs.append(f"{fk.experiment}-{fk.period}-{fk.run}")
-            run_files.append([])
-        for i, run in enumerate(runs):
-            if run == f"{fk.experiment}-{fk.period}-{fk.run}":
-                run_files[i].append(file)
-    return run_files
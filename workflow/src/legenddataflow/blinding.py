@@ -0,0 +1,178 @@
+"""
+This module computes which rows of a raw file must be blinded. The daqenergy of
+each blinded Ge channel is calibrated with its blinding curve and the rows
+falling in the blinding window of any channel are combined into a single
+boolean mask, which can then be used to drop these rows from a copy of the
+file or to hide them when reading it through a `BlindingIndex`.
+"""
+
+from functools import lru_cache
+
+import h5py
+import numexpr as ne
+import numpy as np
+from dbetto.catalog import Props
+from lgdo import Array, Struct, lh5
+
+
+@lru_cache
+def _load_blind_curves(blind_curve_files: tuple) -> dict:
+    return Props.read_from(list(blind_curve_files))
+
+
+def load_blind_curves(blind_curve_files: str | list) -> dict:
+    """
+    Returns the blinding curves in `blind_curve_files` keyed by detector
+    name, the files are only read once per process
+    """
+    if isinstance(blind_curve_files, str):
+        blind_curve_files = [blind_curve_files]
+    return _load_blind_curves(tuple(blind_curve_files))
+
+
+def calibrate_daqenergy(daqenergy, blind_curve: dict):
+    """Calibrates `daqenergy` with the ``daqenergy_cal`` operation of `blind_curve`"""
+    return ne.evaluate(
+        blind_curve["daqenergy_cal"]["expression"],
+        local_dict=dict(
+            daqenergy=daqenergy, **blind_curve["daqenergy_cal"]["parameters"]
+        ),
+    )
+
+
+def get_blinding_mask(
+    raw_file: str,
+    channels: dict,
+    blind_curves: dict,
+    centroid: float,
+    width: float,
+    n_rows: int | None = None,
+) -> np.ndarray:
+    """
+    Returns the boolean mask of the rows of `raw_file` to blind.
+
+    Parameters
+    ----------
+    raw_file
+        Raw file
+    channels
+        Mapping of the rawids of the Ge channels to blind to their detector
+        names, used to look up their blinding curves
+    blind_curves
+        Blinding curves keyed by detector name, see `load_blind_curves`
+    centroid
+        Centre of the blinding window in keV
+    width
+        Half width of the blinding window in keV
+    n_rows
+        Number of events in the file, taken from the first channel if not given
+
+    Returns
+    -------
+    array
+        Mask which is True for the rows to blind, with one entry per event
+    """
+    if n_rows is None and len(channels) == 0:
+        msg = "no channels to blind, the number of events must be given"
+        raise ValueError(msg)
+
+    mask = None if n_rows is None else np.zeros(n_rows, dtype=bool)
+    # the file is opened once for all channels
+    with h5py.File(raw_file, "r") as f:
+        for rawid, name in channels.items():
+            daqenergy = lh5.read_as(f"ch{rawid}/raw/daqenergy", f, "np")
+            if mask is None:
+                # all Ge channels have the same number of events
+                mask = np.zeros(len(daqenergy), dtype=bool)
+            daqenergy_cal = calibrate_daqenergy(
+                daqenergy, blind_curves[name]["pars"]["operations"]
+            )
+            mask |= np.abs(np.asarray(daqenergy_cal) - centroid) <= width
+    return mask
+
+
+class BlindingIndex:
+    """
+    Rows of a raw file hidden by the blinding. Instead of writing a blinded
+    copy of the raw file, the index is written next to it and the raw tables
+    are read through `read`, which skips the hidden rows of the blinded
+    channels.
+
+    Parameters
+    ----------
+    idx
+        Indices of the rows to hide
+    channels
+        Rawids of the channels whose rows are hidden
+    n_rows
+        Number of rows of the blinded channels
+    """
+
+    def __init__(self, idx, channels, n_rows: int):
+        self.idx = np.unique(np.asarray(idx, dtype=np.int64))
+        self.channels = sorted(int(channel) for channel in channels)
+        self.n_rows = int(n_rows)
+        self._channels = set(self.channels)
+        self._entry_list = None
+
+    @classmethod
+    def from_mask(cls, mask, channels) -> "BlindingIndex":
+        """Builds the index from a blinding mask, see `get_blinding_mask`"""
+        return cls(np.flatnonzero(mask), channels, len(mask))
+
+    @classmethod
+    def read_from(cls, lh5_file: str) -> "BlindingIndex":
+        """Reads the index written by `write_to`"""
+        obj = lh5.read("blinding", lh5_file)
+        return cls(obj["idx"].nda, obj["channels"].nda, obj.attrs["n_rows"])
+
+    def write_to(self, lh5_file: str) -> None:
+        """Writes the index to `lh5_file`"""
+        obj = Struct(
+            {"idx": Array(self.idx), "channels": Array(np.array(self.channels))},
+            attrs={"n_rows": self.n_rows},
+        )
+        lh5.write(obj, "blinding", lh5_file, wo_mode="of")
+
+    def hides(self, channel: str | int) -> bool:
+        """Returns True if rows of `channel` (rawid or ``ch{rawid}``) are hidden"""
+        if isinstance(channel, str):
+            channel = int(channel.strip("/").split("/")[0][2:])
+        return channel in self._channels
+
+    def entry_list(self) -> np.ndarray:
+        """Returns the indices of the rows which are not hidden"""
+        if self._entry_list is None:
+            keep = np.ones(self.n_rows, dtype=bool)
+            keep[self.idx] = False
+            self._entry_list = np.flatnonzero(keep)
+        return self._entry_list
+
+    def read(self, name: str, raw_file: str, field_mask=None):
+        """
+        Reads the object `name` of `raw_file` without the hidden rows if it
+        belongs to a blinded channel
+        """
+        try:
+            hidden = self.hides(name)
+        except ValueError:
+            hidden = False
+        idx = self.entry_list() if hidden else None
+        return lh5.read(name, raw_file, idx=idx, field_mask=field_mask)
+
+    def write_unblinded(
+        self, raw_file: str, out_file: str, tables: list, field_mask=None
+    ) -> None:
+        """
+        Writes the `tables` of `raw_file` read through `read` to `out_file`,
+        used to run tools which can only read files on the blinded data
+        """
+        for table in tables:
+            channel, name = table.strip("/").rsplit("/", 1)
+            lh5.write(
+                self.read(table, raw_file, field_mask=field_mask),
+                name,
+                out_file,
+                group=channel,
+                wo_mode="w",
+            )
@@ -27,6 +27,8 @@ class CalGrouping:
                 self.datasets = yaml.safe_load(r)
         self.expand_runs()
         self.setup = setup
+        self._catalog_index = {}
+        self._par_files = {}
 
     def expand_runs(self):
         for channel, chan_dict in self.datasets.items():
@@ -72,49 +74,99 @@ class CalGrouping:
         name=None,
         extension="yaml",
         pattern_func=get_pattern_pars_tmp_channel,
+    ):
+        cache_key = (
+            id(catalog),
+            dataset,
+            channel,
+            tier,
+            experiment,
+            datatype,
+            name,
+            extension,
+            pattern_func,
+        )
+        if cache_key not in self._par_files:
+            self._par_files[cache_key] = self._resolve_par_files(
+                catalog,
+                dataset,
+                channel,
+                tier,
+                experiment,
+                datatype,
+                name,
+                extension,
+                pattern_func,
+            )
+        return list(self._par_files[cache_key])
+
+    def get_catalog_index(self, catalog, tier):
+        """
+        Returns the index of the par files of a tier in the catalog, the index is
+        built once per catalog and tier and maps (experiment, datatype, period)
+        to a dictionary of run to the positions of the par files in `keys`
+
+        Returns
+        -------
+        keys : list
+            Keys of the par files in the order they appear in the catalog
+        index : dict
+            Nested dictionary of (experiment, datatype, period) -> run -> positions
+        """
+        cached = self._catalog_index.get((id(catalog), tier))
+        # the catalog is stored with the index so its id cannot be reused
+        if cached is not None and cached[0] is catalog:
+            return cached[1], cached[2]
+
+        suffix = str(
+            get_pattern_pars(self.setup, tier, check_in_cycle=False).name
+        ).split("-")[-1]
+        par_files = [
+            Path(par_file).name
+            for item in catalog.entries["all"]
+            for par_file in item.file
+            if par_file.split("-")[-1] == suffix
+        ]
+        keys = ProcessingFileKey.parse_many(par_files)
+        index = {}
+        for i, fk in enumerate(keys):
+            runs = index.setdefault((fk.experiment, fk.datatype, fk.period), {})
+            runs.setdefault(fk.run, []).append(i)
+        self._catalog_index[(id(catalog), tier)] = (catalog, keys, index)
+        return keys, index
+
+    def _resolve_par_files(
+        self,
+        catalog,
+        dataset,
+        channel,
+        tier,
+        experiment,
+        datatype,
+        name,
+        extension,
+        pattern_func,
     ):
         dataset = self.get_dataset(dataset, channel)
-        all_par_files = []
-        for item in catalog.entries["all"]:
-            par_files = item.file
-            for par_file in par_files:
-                if (
-                    par_file.split("-")[-1]
-                    == str(
-                        get_pattern_pars(self.setup, tier, check_in_cycle=False).name
-                    ).split("-")[-1]
-                ):
-                    all_par_files.append(par_file)
+        keys, index = self.get_catalog_index(catalog, tier)
+        positions = []
+        for period, runs in dataset.items():
+            period_index = index.get((experiment, datatype, period), {})
+            if runs == "all":
+                for run_positions in period_index.values():
+                    positions += run_positions
+            else:
+                for run, run_positions in period_index.items():
+                    if run in runs:
+                        positions += run_positions
+
         if channel == "default":
             channel = "{channel}"
-        selected_par_files = []
-        for par_file in all_par_files:
-            fk = ProcessingFileKey.get_filekey_from_pattern(Path(par_file).name)
-            if (
-                fk.datatype == datatype
-                and fk.experiment == experiment
-                and fk.period in list(dataset)
-                and (dataset[fk.period] == "all" or fk.run in dataset[fk.period])
-            ):
-                if name is not None:
-                    selected_par_files.append(
-                        fk.get_path_from_filekey(
-                            pattern_func(
-                                self.setup, tier, name=name, extension=extension
-                            ),
-                            channel=channel,
-                        )[0]
-                    )
-                else:
-                    selected_par_files.append(
-                        fk.get_path_from_filekey(
-                            pattern_func(
-                                self.setup, tier, name=name, extension=extension
-                            ),
-                            channel=channel,
-                        )[0]
-                    )
-        return selected_par_files
+        pattern = pattern_func(self.setup, tier, name=name, extension=extension)
+        return tuple(
+            keys[i].get_path_from_filekey(pattern, channel=channel)[0]
+            for i in sorted(positions)
+        )
 
     def get_plt_files(
         self,
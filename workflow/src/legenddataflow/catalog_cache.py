@@ -0,0 +1,105 @@
+"""
+This module caches the files found on disk when building the parameter catalogs.
+The cache is stored per search pattern and keypart, and the files are stored
+per run directory along with the directory modification time so only run
+directories that have changed since the last search are rescanned.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from .inventory import get_inventory
+
+log = logging.getLogger(__name__)
+
+
+def get_cache_file(cache_dir, search_pattern, keypart):
+    """Returns the cache file for a given search pattern and keypart"""
+    if isinstance(search_pattern, Path):
+        search_pattern = search_pattern.as_posix()
+    digest = hashlib.sha1(f"{search_pattern}\n{keypart}".encode()).hexdigest()
+    return Path(cache_dir) / f"catalog-{digest}.json"
+
+
+def read_cache(cache_file):
+    if not Path(cache_file).is_file():
+        return {}
+    try:
+        with Path(cache_file).open() as r:
+            return json.load(r)
+    except (OSError, ValueError):
+        msg = f"could not read catalog cache {cache_file}, rescanning"
+        log.warning(msg)
+        return {}
+
+
+def write_cache(cache_file, cache):
+    temp_file = Path(f"{cache_file}.{os.getpid()}")
+    try:
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        with temp_file.open("w") as w:
+            json.dump(cache, w)
+        temp_file.rename(cache_file)
+    except OSError:
+        msg = f"could not write catalog cache {cache_file}"
+        log.warning(msg)
+        temp_file.unlink(missing_ok=True)
+
+
+def cached_glob(fn_glob_pattern, cache_file, refresh=False):
+    """
+    Globs for files matching `fn_glob_pattern`, using the cache in `cache_file`
+    for run directories whose modification time has not changed
+
+    Parameters
+    ----------
+    fn_glob_pattern : str
+        Glob pattern of the files
+    cache_file : str or Path
+        Path to the cache file
+    refresh : bool
+        If True ignore the existing cache and rescan all directories
+
+    Returns
+    -------
+    list
+        List of files found
+    """
+    fn_glob_pattern = str(fn_glob_pattern)
+    p = Path(fn_glob_pattern)
+
+    cache = {} if refresh else read_cache(cache_file)
+    if cache.get("pattern") != fn_glob_pattern:
+        cache = {}
+    cached_dirs = cache.get("dirs", {})
+
+    inventory = get_inventory()
+    dirs = {}
+    files = []
+    n_scanned = 0
+    for directory in map(Path, inventory.glob(p.parent)):
+        if not directory.is_dir():
+            continue
+        mtime = directory.stat().st_mtime_ns
+        entry = cached_dirs.get(str(directory))
+        if entry is None or entry["mtime"] != mtime:
+            entry = {
+                "mtime": mtime,
+                "files": [
+                    Path(file).name for file in inventory.glob(directory / p.name)
+                ],
+            }
+            n_scanned += 1
+        dirs[str(directory)] = entry
+        files += [str(directory / file) for file in entry["files"]]
+
+    msg = f"{fn_glob_pattern}: rescanned {n_scanned} of {len(dirs)} directories"
+    log.debug(msg)
+
+    if n_scanned > 0 or len(dirs) != len(cached_dirs):
+        write_cache(cache_file, {"pattern": fn_glob_pattern, "dirs": dirs})
+
+    return files
@@ -0,0 +1,149 @@
+"""
+This module holds a registry of the validity catalogs loaded in the process.
+Each validity file is only read once and is read again only if its modification
+time changes, lookups are then answered from the loaded catalog with the bisect
+search of `IndexedCatalog`.
+"""
+
+import bisect
+import os
+import warnings
+from functools import cached_property
+from pathlib import Path
+
+from dbetto import time
+from dbetto.catalog import Catalog
+
+
+class IndexedCatalog(Catalog):
+    """
+    Catalog whose validity lookups bisect the entry start times of each
+    category, indexed once instead of on every lookup
+    """
+
+    @cached_property
+    def _valid_from(self) -> dict:
+        """
+        Sorted entry start times of each category, only built the first time
+        they are needed
+        """
+        return {
+            category: [entry.valid_from for entry in entries]
+            for category, entries in self.entries.items()
+        }
+
+    def valid_for(
+        self,
+        timestamp: str,
+        category: str = "all",
+        allow_none: bool = False,
+        *,
+        system: str | None = None,
+    ) -> list:
+        """
+        Get the valid entries for a given timestamp and category using a bisect
+        search of the entry start times
+
+        Parameters
+        ----------
+        timestamp : str
+            Timestamp
+        category : str
+            Category of the entries, falls back to "all" if no entries are found
+        allow_none : bool
+            If True return None if no entries are found instead of raising
+        system : str
+            Deprecated alias of `category`
+
+        Returns
+        -------
+        list
+            List of files valid for the timestamp
+        """
+        if system is not None:
+            warnings.warn(
+                "the 'system' argument is deprecated, use 'category' instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            category = system
+
+        if category in self.entries:
+            pos = bisect.bisect_right(
+                self._valid_from[category], time.unix_time(timestamp)
+            )
+            if pos > 0:
+                return self.entries[category][pos - 1].file
+            if category != "all":
+                return self.valid_for(timestamp, "all", allow_none=allow_none)
+            if allow_none:
+                return None
+            msg = f"No valid entries found for timestamp: {timestamp}, category: {category}"
+            raise RuntimeError(msg)
+
+        if category != "all":
+            return self.valid_for(timestamp, "all", allow_none=allow_none)
+        if allow_none:
+            return None
+        msg = f"No entries found for category: {category}"
+        raise RuntimeError(msg)
+
+
+class CatalogRegistry:
+    """
+    Registry of validity catalogs keyed by path and modification time
+    """
+
+    def __init__(self):
+        self._catalogs = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, catalog_file):
+        """Returns the catalog of `catalog_file`, only reading it if it has changed"""
+        path = os.fspath(catalog_file)
+        mtime = Path(path).stat().st_mtime_ns
+        cached = self._catalogs.get(path)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        catalog = IndexedCatalog(Catalog.read_from(path).entries)
+        self._catalogs[path] = (mtime, catalog)
+        return catalog
+
+    def valid_for(self, catalog_file, timestamp, category="all", allow_none=False):
+        """
+        Returns the entries of `catalog_file` valid for a given timestamp and
+        category, the returned list is a copy so it can be modified by the caller
+        """
+        files = self.get(catalog_file).valid_for(
+            timestamp, category, allow_none=allow_none
+        )
+        if isinstance(files, list):
+            return list(files)
+        return files
+
+    def get_files(self, catalog_file, timestamp, category="all"):
+        """Cached equivalent of `Catalog.get_files`"""
+        return self.valid_for(catalog_file, timestamp, category)
+
+    def report(self):
+        return (
+            f"validity catalogs: {len(self._catalogs)} loaded, "
+            f"{self.hits} hits, {self.misses} misses"
+        )
+
+    def clear(self):
+        """Clears the registry so all catalogs are read again"""
+        self._catalogs.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_registry = CatalogRegistry()
+
+
+def get_catalog_registry():
+    """Returns the catalog registry shared by the whole process"""
+    return _registry
@@ -0,0 +1,62 @@
+"""
+This module resolves the list of processable channels for a given timestamp,
+datatype and system from the detector status and channel maps
+"""
+
+from functools import lru_cache
+
+from dbetto import TextDB
+
+
+@lru_cache(maxsize=None)
+def _textdb(path):
+    return TextDB(path, lazy=True)
+
+
+@lru_cache(maxsize=None)
+def _get_chanlist(det_status, channelmap, timestamp, datatype, system):
+    status_map = _textdb(det_status).statuses.on(timestamp, system=datatype)
+    chmap = _textdb(channelmap).channelmaps.on(timestamp)
+
+    # only restrict to a certain system (geds, spms, ...)
+    channels = []
+    for channel, status in status_map.items():
+        # start with channels marked as processable in the status map
+        if status.processable is False:
+            continue
+
+        if channel not in chmap:
+            msg = f"{channel} is marked as processable but is not found in the channel map (on {timestamp})"
+            raise RuntimeError(msg)
+
+        if chmap[channel].system == system:
+            channels.append(channel)
+    return tuple(channels)
+
+
+def get_chanlist(det_status, channelmap, timestamp, datatype, system="geds"):
+    """
+    Returns the list of processable channels of a system, results are
+    memoized per (timestamp, datatype, system)
+
+    Parameters
+    ----------
+    det_status : str
+        Path to the detector status database
+    channelmap : str
+        Path to the channel map database
+    timestamp : str
+        Timestamp
+    datatype : str
+        Datatype
+    system : str
+        System e.g. geds, spms, pmts
+
+    Returns
+    -------
+    list
+        List of channel names
+    """
+    return list(
+        _get_chanlist(str(det_status), str(channelmap), timestamp, datatype, system)
+    )
@@ -0,0 +1,50 @@
+"""
+This module finds time coincidences between two sets of timestamps using
+sorted arrays, it is used for the muon flag in the evt tier and can be used
+for any other timing coincidence cut
+"""
+
+import numpy as np
+
+
+def coincidence_mask(times, ref_times, max_delay, min_delay=0):
+    """
+    Flags the timestamps in `times` which have at least one timestamp in
+    `ref_times` preceding them by a delay in [`min_delay`, `max_delay`].
+    `ref_times` is sorted once and each timestamp is then looked up with a
+    binary search, so the cost is O((n + m) log m).
+
+    Parameters
+    ----------
+    times : array
+        Timestamps to flag
+    ref_times : array
+        Reference timestamps e.g. the muon triggers
+    max_delay : float
+        Maximum delay between the reference and the timestamp
+    min_delay : float
+        Minimum delay between the reference and the timestamp
+
+    Returns
+    -------
+    array
+        Boolean mask of `times`
+    """
+    times = np.asarray(times)
+    ref_times = np.sort(np.asarray(ref_times))
+    if len(ref_times) == 0:
+        return np.zeros(len(times), dtype=bool)
+    # first reference at or after the start of the window of each timestamp
+    idx = np.searchsorted(ref_times, times - max_delay, side="left")
+    in_range = idx < len(ref_times)
+    mask = np.zeros(len(times), dtype=bool)
+    mask[in_range] = ref_times[idx[in_range]] <= times[in_range] - min_delay
+    return mask
+
+
+def find_coincident_values(times, ref_times, max_delay, min_delay=0):
+    """
+    Returns the unique values of `times` flagged by `coincidence_mask`
+    """
+    times = np.asarray(times)
+    return np.unique(times[coincidence_mask(times, ref_times, max_delay, min_delay)])
@@ -0,0 +1,99 @@
+"""
+This module contains an in-memory cache of LH5 columns used while building the
+evt tier. The evt builder reads the same hit and dsp columns once per
+operation and channel, and again when the muon evt config is evaluated on the
+second TCM. With the cache each column is read from disk once and the rows
+requested by each call are selected in memory.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import awkward as ak
+
+from .lh5_utils import get_lh5_inventory
+
+
+class ColumnCache:
+    """
+    Cache of full LH5 columns serving the `read_as` and `ls` calls of an lh5
+    module, calls which cannot be served from the cache (other libraries,
+    multiple files, extra keyword arguments) are forwarded to the module.
+
+    Parameters
+    ----------
+    lh5_module
+        The lh5 module used by the code to run with the cache, e.g. the one
+        imported by `pygama.evt`
+    """
+
+    def __init__(self, lh5_module):
+        self.lh5 = lh5_module
+        self._read = lh5_module.read
+        self._read_as = lh5_module.read_as
+        self._ls = lh5_module.ls
+        self.columns = {}
+        self.n_reads = 0
+        self.n_hits = 0
+
+    def column(self, name: str, lh5_file: str | Path):
+        """Returns the LGDO `name` in `lh5_file`, reading it only on first use"""
+        key = (str(lh5_file), name.strip("/"))
+        if key in self.columns:
+            self.n_hits += 1
+        else:
+            self.columns[key] = self._read(key[1], key[0])
+            self.n_reads += 1
+        return self.columns[key]
+
+    def read_as(self, name, lh5_file, library, idx=None, field_mask=None, **kwargs):
+        """Cached version of `lh5.read_as` for the ``ak`` and ``np`` libraries"""
+        if (
+            len(kwargs) > 0
+            or library not in ("ak", "np")
+            or not isinstance(lh5_file, str | Path)
+            or not isinstance(field_mask, list | tuple | None)
+        ):
+            return self._read_as(
+                name, lh5_file, library, idx=idx, field_mask=field_mask, **kwargs
+            )
+
+        name = name.strip("/")
+        datatype = get_lh5_inventory(lh5_file).datatypes.get(name)
+        if datatype is not None and datatype.startswith("table"):
+            if library != "ak":
+                return self._read_as(
+                    name, lh5_file, library, idx=idx, field_mask=field_mask
+                )
+            fields = get_lh5_inventory(lh5_file).fields(name)
+            if field_mask is not None:
+                fields = [field for field in fields if field in field_mask]
+            columns = {}
+            for field in fields:
+                col = self.column(f"{name}/{field}", lh5_file).view_as("ak")
+                columns[field] = col if idx is None else col[idx]
+            return ak.Array(columns)
+
+        obj = self.column(name, lh5_file).view_as(library)
+        return obj if idx is None else obj[idx]
+
+    def ls(self, lh5_file, lh5_group="", **kwargs):
+        """Version of `lh5.ls` served from the file inventory"""
+        if len(kwargs) > 0 or not isinstance(lh5_file, str | Path):
+            return self._ls(lh5_file, lh5_group, **kwargs)
+        return get_lh5_inventory(lh5_file).ls(lh5_group)
+
+    @contextmanager
+    def patch(self):
+        """
+        Serves the `read_as` and `ls` calls of the lh5 module from the cache
+        inside the context, the cached columns are released on exit
+        """
+        self.lh5.read_as = self.read_as
+        self.lh5.ls = self.ls
+        try:
+            yield self
+        finally:
+            self.lh5.read_as = self._read_as
+            self.lh5.ls = self._ls
+            self.columns.clear()
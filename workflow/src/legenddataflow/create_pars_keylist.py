@@ -2,13 +2,14 @@
 This module creates the validity files used for determining the time validity of data
 """
 
-import re
 import warnings
 from pathlib import Path
 
 from dbetto import time
 
-from .FileKey import FileKey, ProcessingFileKey, regex_from_filepattern
+from .catalog_cache import cached_glob, get_cache_file
+from .FileKey import FileKey, ProcessingFileKey, compiled_regex_from_filepattern
+from .inventory import get_inventory
 from .pars_loading import ParsCatalog
 from .patterns import par_validity_pattern
 
@@ -40,15 +41,14 @@ class ParsKeyResolve(ParsCatalog):
 
     @staticmethod
     def generate_par_keylist(keys):
-        keylist = []
         keys = sorted(keys, key=FileKey.get_unix_timestamp)
-        keylist.append(keys[0])
+        keylist = [keys[0]]
+        seen = {keys[0]}
         for key in keys[1:]:
             matched_key = ParsKeyResolve.match_keys(keylist[-1], key)
-            if matched_key not in keylist:
+            if matched_key not in seen:
                 keylist.append(matched_key)
-            else:
-                pass
+                seen.add(matched_key)
         return keylist
 
     @staticmethod
@@ -62,16 +62,24 @@ class ParsKeyResolve(ParsCatalog):
 
     @staticmethod
     def match_all_entries(entrylist, name_dict):
+        """
+        Builds the entries for each key, each entry carries forward the files
+        of the previous entry for all datatypes other than its own
+        """
         out_list = []
-        out_list.append(ParsKeyResolve.entry_from_filekey(entrylist[0], name_dict))
-        for entry in entrylist[1:]:
-            new_entry = ParsKeyResolve.entry_from_filekey(entry, name_dict)
-            ParsKeyResolve.match_entries(out_list[-1], new_entry)
+        datatype_files = {}
+        for key in entrylist:
+            new_entry = ParsKeyResolve.entry_from_filekey(key, name_dict)
+            datatype_files.pop(key.datatype, None)
+            datatype_files = {key.datatype: list(new_entry.file), **datatype_files}
+            new_entry.file[:] = [
+                file for files in datatype_files.values() for file in files
+            ]
             out_list.append(new_entry)
         return out_list
 
     @staticmethod
-    def get_keys(keypart, search_pattern):
+    def get_keys(keypart, search_pattern, cache_dir=None, refresh=False):
         d = FileKey.parse_keypart(keypart)
         if Path(search_pattern).suffix == ".*":
             search_pattern = Path(search_pattern).with_suffix(".{ext}")
@@ -79,12 +87,17 @@ class ParsKeyResolve(ParsCatalog):
         else:
             wildcard_dict = d._asdict()
 
-        tier_pattern_rx = re.compile(regex_from_filepattern(str(search_pattern)))
+        tier_pattern_rx = compiled_regex_from_filepattern(str(search_pattern))
         key = FileKey.get_filekey_from_pattern(search_pattern, search_pattern)
         fn_glob_pattern = key.get_path_from_filekey(search_pattern, **wildcard_dict)[0]
-        p = Path(fn_glob_pattern)
-        parts = p.parts[p.is_absolute() :]
-        files = Path(p.root).glob(str(Path(*parts)))
+        if cache_dir is None:
+            files = get_inventory().glob(fn_glob_pattern)
+        else:
+            files = cached_glob(
+                fn_glob_pattern,
+                get_cache_file(cache_dir, search_pattern, keypart),
+                refresh=refresh,
+            )
         keys = []
         for f in files:
             m = tier_pattern_rx.match(str(f))
@@ -97,7 +110,26 @@ class ParsKeyResolve(ParsCatalog):
         return keys
 
     @classmethod
-    def get_par_catalog(cls, keypart, search_patterns, name_dict):
+    def get_par_catalog(
+        cls, keypart, search_patterns, name_dict, cache_dir=None, refresh=False
+    ):
+        """
+        Builds the parameter catalog from the keys of the files found on disk
+
+        Parameters
+        ----------
+        keypart : str or list
+            Keypart(s) to search for e.g. "-*-*-*-cal"
+        search_patterns : str, Path or list
+            File pattern(s) to search
+        name_dict : dict
+            Dictionary of datatype to the par file processing steps
+        cache_dir : str or Path, optional
+            Directory to cache the files found on disk, if set only run
+            directories modified since the last search are rescanned
+        refresh : bool
+            If True ignore any existing cache and rescan all directories
+        """
         if isinstance(keypart, str):
             keypart = [keypart]
         if isinstance(search_patterns, (str, Path)):
@@ -105,10 +137,11 @@ class ParsKeyResolve(ParsCatalog):
         keylist = []
         for search_pattern in search_patterns:
             for keypar in keypart:
-                keylist += ParsKeyResolve.get_keys(keypar, search_pattern)
+                keylist += ParsKeyResolve.get_keys(
+                    keypar, search_pattern, cache_dir=cache_dir, refresh=refresh
+                )
         if len(keylist) != 0:
-            keys = sorted(keylist, key=FileKey.get_unix_timestamp)
-            keylist = ParsKeyResolve.generate_par_keylist(keys)
+            keylist = ParsKeyResolve.generate_par_keylist(keylist)
             entrylist = ParsKeyResolve.match_all_entries(keylist, name_dict)
         else:
             msg = "No Keys found"
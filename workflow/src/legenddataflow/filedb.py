@@ -0,0 +1,216 @@
+"""
+This module builds the `pygama.flow.FileDB` of each processed run.
+Next to each FileDB a manifest records the modification time and the size of
+the files of every tier of the run, so that when the FileDB is updated only
+the files added or changed since are opened to read their tables and columns,
+the others being taken from the existing FileDB.
+"""
+
+import copy
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+
+def get_manifest_file(filedb_file):
+    """Returns the manifest file of a FileDB file"""
+    return Path(filedb_file).with_suffix(".json")
+
+
+def read_manifest(manifest_file):
+    if not Path(manifest_file).is_file():
+        return {}
+    try:
+        with Path(manifest_file).open() as r:
+            return json.load(r)
+    except (OSError, ValueError):
+        msg = f"could not read FileDB manifest {manifest_file}, rescanning"
+        log.warning(msg)
+        return {}
+
+
+def _write_manifest(manifest_file, manifest):
+    temp_file = Path(f"{manifest_file}.{os.getpid()}")
+    with temp_file.open("w") as w:
+        json.dump(manifest, w)
+    temp_file.replace(manifest_file)
+
+
+def _file_stats(fdb):
+    # modification time and size of the file of each tier of each row, None
+    # if the file is not there
+    stats = {}
+    for tier in fdb.tiers:
+        tier_dir = Path(fdb.data_dir) / fdb.tier_dirs[tier].lstrip("/")
+        stats[tier] = {}
+        for file in fdb.df[f"{tier}_file"]:
+            try:
+                stat = (tier_dir / file.lstrip("/")).stat()
+                stats[tier][file] = [stat.st_mtime_ns, stat.st_size]
+            except FileNotFoundError:
+                stats[tier][file] = None
+    return stats
+
+
+def _merge_columns(columns, new_columns, col_idx):
+    # maps the indices of new_columns in col_idx to the ones in columns,
+    # adding the columns not in there yet
+    trans = []
+    for cols in new_columns:
+        if cols not in columns:
+            columns.append(cols)
+        trans.append(columns.index(cols))
+    return None if col_idx is None else [trans[idx] for idx in col_idx]
+
+
+def update_filedb(config, scan_path, output, refresh=False):
+    """
+    Builds or updates the FileDB of the files under `scan_path`. The files
+    found are compared with the manifest of the existing FileDB and only the
+    ones added or changed since it was written are opened, the tables and
+    columns of the others are kept. Rows of files that are gone are dropped.
+
+    Parameters
+    ----------
+    config : dict
+        FileDB configuration, the FileDB is rebuilt if it differs from the one
+        the existing FileDB was built with
+    scan_path : str
+        Directory to scan, see `pygama.flow.FileDB.scan_files`
+    output : str or Path
+        FileDB file, its manifest is written next to it
+    refresh : bool
+        If True ignore the existing FileDB and rescan all files
+
+    Returns
+    -------
+    int
+        Number of rows whose files were opened
+    """
+    from pygama.flow.file_db import FileDB
+
+    output = Path(output)
+    manifest_file = get_manifest_file(output)
+    config = json.loads(json.dumps(config))
+
+    # listing the files is cheap, it is opening them that is not
+    fdb = FileDB(copy.deepcopy(config), scan=False)
+    fdb.scan_files([str(scan_path)])
+    stats = _file_stats(fdb)
+
+    manifest = {} if refresh else read_manifest(manifest_file)
+    old = None
+    if manifest.get("config") == config and output.is_file():
+        if manifest["files"] == stats:
+            msg = f"{output} is up to date"
+            log.debug(msg)
+            return 0
+        old = FileDB([str(output)])
+
+    key = f"{fdb.tiers[0]}_file"
+    fields = [
+        f"{tier}_{field}" for tier in fdb.tiers for field in ["tables", "col_idx"]
+    ]
+    rows = {}
+    columns = []
+    if old is not None:
+        old_stats = manifest["files"]
+        columns = list(old.columns)
+        for row in old.df.to_dict("records"):
+            if all(
+                old_stats[tier].get(row[f"{tier}_file"], False)
+                == stats[tier].get(row[f"{tier}_file"])
+                for tier in fdb.tiers
+            ):
+                rows[row[key]] = {field: row[field] for field in fields}
+
+    changed = ~fdb.df[key].isin(list(rows))
+    n_changed = int(changed.sum())
+    if n_changed > 0:
+        new = FileDB(copy.deepcopy(config), scan=False)
+        new.df = fdb.df[changed].copy()
+        new.scan_tables_columns(dir_files_conform=True)
+        for row in new.df.to_dict("records"):
+            rows[row[key]] = {}
+            for tier in fdb.tiers:
+                # the directory cache of scan_tables_columns also fills the
+                # rows of the files that are not there
+                if stats[tier][row[f"{tier}_file"]] is None:
+                    row[f"{tier}_tables"] = row[f"{tier}_col_idx"] = None
+                rows[row[key]][f"{tier}_tables"] = row[f"{tier}_tables"]
+                rows[row[key]][f"{tier}_col_idx"] = _merge_columns(
+                    columns, new.columns, row[f"{tier}_col_idx"]
+                )
+
+    # drop the columns left only by files that are gone
+    used = sorted(
+        {
+            idx
+            for file in fdb.df[key]
+            for tier in fdb.tiers
+            for idx in rows[file][f"{tier}_col_idx"] or []
+        }
+    )
+    fdb.columns = [columns[idx] for idx in used]
+    trans = {idx: i for i, idx in enumerate(used)}
+    for tier in fdb.tiers:
+        fdb.df[f"{tier}_tables"] = [
+            rows[file][f"{tier}_tables"] for file in fdb.df[key]
+        ]
+        fdb.df[f"{tier}_col_idx"] = [
+            None
+            if rows[file][f"{tier}_col_idx"] is None
+            else [trans[idx] for idx in rows[file][f"{tier}_col_idx"]]
+            for file in fdb.df[key]
+        ]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output.with_name(f"{output.name}.{os.getpid()}")
+    fdb.to_disk(str(temp_file), wo_mode="of")
+    temp_file.replace(output)
+    _write_manifest(manifest_file, {"config": config, "files": stats})
+
+    msg = f"{output}: rescanned {n_changed} of {len(fdb.df)} files"
+    log.debug(msg)
+    return n_changed
+
+
+def update_filedbs(config, outputs, n_workers=1, refresh=False):
+    """
+    Updates the FileDBs of several runs with `update_filedb`, one run per task
+    on a pool of processes. Processes are used as the scan of the files is
+    HDF5 I/O, which h5py serialises within a process.
+
+    Parameters
+    ----------
+    config : dict
+        FileDB configuration
+    outputs : dict
+        Mapping of the directory to scan to the FileDB file of each run
+    n_workers : int
+        Number of processes, the runs are updated in this process if 1
+    refresh : bool
+        If True ignore the existing FileDBs and rescan all files
+
+    Returns
+    -------
+    dict
+        Number of rows whose files were opened for each directory scanned
+    """
+    if n_workers <= 1 or len(outputs) <= 1:
+        return {
+            scan_path: update_filedb(config, scan_path, output, refresh)
+            for scan_path, output in outputs.items()
+        }
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(outputs))) as executor:
+        futures = {
+            scan_path: executor.submit(
+                update_filedb, config, scan_path, output, refresh
+            )
+            for scan_path, output in outputs.items()
+        }
+        return {scan_path: future.result() for scan_path, future in futures.items()}
@@ -0,0 +1,76 @@
+"""
+This module groups lists of files by run or by period using their file keys,
+the grouping is done in a single pass over the files
+"""
+
+from pathlib import Path
+
+from .FileKey import ProcessingFileKey
+
+
+def _group(files, keys, fields):
+    if keys is None:
+        keys = ProcessingFileKey.parse_many([Path(file).name for file in files])
+    groups = {}
+    for file, key in zip(files, keys):
+        if key is None:
+            msg = f"could not get key from {file}"
+            raise ValueError(msg)
+        group = "-".join(getattr(key, field) for field in fields)
+        if group in groups:
+            groups[group].append(file)
+        else:
+            groups[group] = [file]
+    return groups
+
+
+def group_by_run(files, keys=None):
+    """
+    Groups files by run
+
+    Parameters
+    ----------
+    files : list
+        List of files
+    keys : list, optional
+        Keys of the files if already parsed, otherwise they are parsed from the
+        file names
+
+    Returns
+    -------
+    dict
+        Dictionary of {experiment}-{period}-{run} to the list of files in that
+        run, runs and files are in the order they first appear in `files`
+    """
+    return _group(files, keys, ("experiment", "period", "run"))
+
+
+def group_by_period(files, keys=None):
+    """
+    Groups files by period
+
+    Parameters
+    ----------
+    files : list
+        List of files
+    keys : list, optional
+        Keys of the files if already parsed, otherwise they are parsed from the
+        file names
+
+    Returns
+    -------
+    dict
+        Dictionary of {experiment}-{period} to the list of files in that
+        period, periods and files are in the order they first appear in `files`
+    """
+    return _group(files, keys, ("experiment", "period"))
+
+
+def run_grouper(files, keys=None):
+    """Returns list containing lists of each run"""
+    return list(group_by_run(files, keys).values())
+
+
+def per_grouper(files, keys=None):
+    """Returns list containing lists of each period"""
+    return list(group_by_period(files, keys).values())
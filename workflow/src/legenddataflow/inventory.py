@@ -0,0 +1,129 @@
+"""
+This module holds an in-memory inventory of the directories searched when
+building the file lists and catalogs. Each directory is only listed once per
+process and every later glob over it is answered from memory, file keys parsed
+from the files found are also kept so each file is only parsed once per pattern.
+"""
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+
+from .FileKey import FileKey
+
+_magic_check = re.compile(r"[*?[]")
+
+
+def _has_magic(part):
+    return _magic_check.search(part) is not None
+
+
+class DirectoryInventory:
+    """
+    In-memory inventory of directory listings, a directory is only scanned
+    the first time it is looked up
+    """
+
+    def __init__(self):
+        self._listings = {}
+        self._keys = {}
+        self.n_scans = 0
+        self.n_lookups = 0
+
+    def listdir(self, directory):
+        """
+        Returns the tuple (files, subdirectories) of names in `directory`,
+        both are empty if the directory does not exist
+        """
+        directory = os.fspath(directory)
+        self.n_lookups += 1
+        listing = self._listings.get(directory)
+        if listing is None:
+            files = []
+            dirs = []
+            try:
+                with os.scandir(directory or ".") as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            dirs.append(entry.name)
+                        else:
+                            files.append(entry.name)
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+            listing = (sorted(files), sorted(dirs))
+            self._listings[directory] = listing
+            self.n_scans += 1
+        return listing
+
+    def _match(self, directory, part, dirs_only):
+        files, dirs = self.listdir(directory)
+        names = dirs if dirs_only else files + dirs
+        if not _has_magic(part):
+            return [part] if part in names else []
+        if not part.startswith("."):
+            names = [name for name in names if not name.startswith(".")]
+        return fnmatch.filter(names, part)
+
+    def glob(self, pattern):
+        """
+        Returns the sorted list of paths matching the glob `pattern`, only
+        the leading part of the pattern without wildcards is checked directly
+        on disk, all other directories are looked up in the inventory
+        """
+        parts = Path(pattern).parts
+        n_literal = 0
+        while n_literal < len(parts) and not _has_magic(parts[n_literal]):
+            n_literal += 1
+        if n_literal == len(parts):
+            return [os.fspath(pattern)] if os.path.lexists(pattern) else []
+
+        paths = [Path(*parts[:n_literal])]
+        rest = parts[n_literal:]
+        for i, part in enumerate(rest):
+            dirs_only = i < len(rest) - 1
+            paths = [
+                path / name
+                for path in paths
+                for name in self._match(path, part, dirs_only)
+            ]
+        return sorted(str(path) for path in paths)
+
+    def get_filekeys(self, files, pattern, key_class=FileKey):
+        """
+        Returns the keys of `files` parsed with `pattern`, None for any file not
+        matching the pattern. Each file is only parsed once per pattern.
+        """
+        if isinstance(pattern, Path):
+            pattern = pattern.as_posix()
+        index = self._keys.setdefault((key_class, str(pattern)), {})
+        new_files = [file for file in files if file not in index]
+        if len(new_files) > 0:
+            index.update(zip(new_files, key_class.parse_many(new_files, pattern)))
+        return [index[file] for file in files]
+
+    @property
+    def saved_scans(self):
+        """Number of directory scans answered from the inventory"""
+        return self.n_lookups - self.n_scans
+
+    def report(self):
+        return (
+            f"directory inventory: {self.n_scans} directories scanned, "
+            f"{self.saved_scans} scans saved"
+        )
+
+    def clear(self):
+        """Clears the inventory so all directories are scanned again"""
+        self._listings.clear()
+        self._keys.clear()
+        self.n_scans = 0
+        self.n_lookups = 0
+
+
+_inventory = DirectoryInventory()
+
+
+def get_inventory():
+    """Returns the directory inventory shared by the whole process"""
+    return _inventory
@@ -0,0 +1,261 @@
+"""
+This module contains helpers working directly on the HDF5 structure of LH5
+files, so data can be moved between files without being decoded into LGDOs
+and the content of a file can be listed with a single open
+"""
+
+import fnmatch
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import h5py
+
+_struct_rx = re.compile(r"^struct\{(.*)\}$")
+
+
+def _struct_fields(datatype):
+    m = _struct_rx.match(datatype)
+    if m is None:
+        return None
+    return [field for field in m.group(1).split(",") if field != ""]
+
+
+def _merge_group(src: h5py.Group, dst: h5py.Group) -> None:
+    for name, obj in src.items():
+        if name not in dst:
+            src.copy(obj, dst, name=name)
+        elif isinstance(obj, h5py.Group) and isinstance(dst[name], h5py.Group):
+            _merge_group(obj, dst[name])
+        else:
+            msg = f"{obj.name} is present in more than one input file"
+            raise RuntimeError(msg)
+
+    for key, value in src.attrs.items():
+        if key not in dst.attrs:
+            dst.attrs[key] = value
+    _sync_struct_datatype(dst)
+
+
+def _sync_struct_datatype(grp: h5py.Group) -> None:
+    # keep the struct datatype in sync with the fields present in the group
+    datatype = grp.attrs.get("datatype")
+    if isinstance(datatype, bytes):
+        datatype = datatype.decode()
+    if datatype is not None:
+        fields = _struct_fields(datatype)
+        if fields is not None:
+            fields = [name for name in fields if name in grp]
+            fields += [name for name in grp if name not in fields]
+            grp.attrs["datatype"] = f"struct{{{','.join(fields)}}}"
+
+
+def _copy_object(src: h5py.File, dst: h5py.File, name: str) -> None:
+    *parents, leaf = name.strip("/").split("/")
+    src_grp, dst_grp = src, dst
+    dst_grps = []
+    for parent in ["", *parents]:
+        if parent != "":
+            src_grp = src_grp[parent]
+            if parent not in dst_grp:
+                dst_grp.create_group(parent)
+            dst_grp = dst_grp[parent]
+        for key, value in src_grp.attrs.items():
+            if key not in dst_grp.attrs:
+                dst_grp.attrs[key] = value
+        dst_grps.append(dst_grp)
+    if leaf in dst_grp:
+        msg = f"{name} is already present in {dst.filename}"
+        raise RuntimeError(msg)
+    src.copy(src_grp[leaf], dst_grp, name=leaf)
+    for grp in dst_grps:
+        _sync_struct_datatype(grp)
+
+
+def merge_lh5_files(
+    in_files: list, out_file: str | Path, mode: str = "w", names: list | None = None
+) -> None:
+    """
+    Merges LH5 files by copying their HDF5 groups and datasets into a single
+    file, the data is never decoded. Groups present in more than one file are
+    merged, datasets present in more than one file raise an error.
+
+    Parameters
+    ----------
+    in_files
+        Input LH5 files
+    out_file
+        Output LH5 file
+    mode
+        Mode used to open the output file, "w" to overwrite it or "a" to
+        append to an existing file
+    names
+        Object to copy from each input file e.g. the channel of a per-channel
+        file, see `copy_lh5_objects`. All the objects are copied if not given
+    """
+    if names is not None and len(names) != len(in_files):
+        msg = "one object name must be given per input file"
+        raise ValueError(msg)
+    Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(out_file, mode) as dst:
+        for i, in_file in enumerate(in_files):
+            with h5py.File(in_file, "r") as src:
+                if names is None:
+                    _merge_group(src, dst)
+                else:
+                    _copy_object(src, dst, names[i])
+
+
+def split_groups(items: list, n_groups: int) -> list:
+    """Splits `items` into at most `n_groups` consecutive groups of even size"""
+    size = -(-len(items) // n_groups)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def run_groups_to_parts(
+    func, groups: list, out_file: str | Path, mode: str = "w", **kwargs
+) -> None:
+    """
+    Runs ``func(group, part_file, **kwargs)`` for each group in a separate
+    process, each process writing its group to a temporary ``{out_file}.partN``
+    file. The parts are then merged into the output file without decoding the
+    data and removed.
+
+    Parameters
+    ----------
+    func
+        Function writing the objects of a group to an LH5 file, must be
+        picklable
+    groups
+        Groups of objects, one process is used per group
+    out_file
+        Output LH5 file
+    mode
+        Mode used to open the output file, see `merge_lh5_files`
+    kwargs
+        Passed to `func`
+    """
+    part_files = [f"{out_file}.part{i}" for i in range(len(groups))]
+    try:
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                executor.submit(func, group, part_file, **kwargs)
+                for group, part_file in zip(groups, part_files)
+            ]
+            for future in futures:
+                future.result()
+        merge_lh5_files(part_files, out_file, mode=mode)
+    finally:
+        for part_file in part_files:
+            Path(part_file).unlink(missing_ok=True)
+
+
+def copy_lh5_objects(
+    in_file: str | Path, out_file: str | Path, names: list, mode: str = "a"
+) -> None:
+    """
+    Copies the objects `names` of an LH5 file into another file at the HDF5
+    level, so their (compressed) data is copied without being decoded. The
+    groups containing the objects are created with the attributes they have
+    in the input file.
+
+    Parameters
+    ----------
+    in_file
+        Input LH5 file
+    out_file
+        Output LH5 file
+    names
+        Paths of the objects to copy e.g. ``ch1027200/raw``
+    mode
+        Mode used to open the output file, "w" to overwrite it or "a" to
+        append to an existing file
+    """
+    Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(in_file, "r") as src, h5py.File(out_file, mode) as dst:
+        for name in names:
+            _copy_object(src, dst, name)
+
+
+class LH5Inventory:
+    """
+    Inventory of the objects in an LH5 file, the file is opened once and the
+    whole group tree is kept in memory so listing its content does not reopen it
+    """
+
+    def __init__(self, lh5_file: str | Path):
+        self.lh5_file = str(lh5_file)
+        self.tree = {}
+        self.datatypes = {}
+        with h5py.File(self.lh5_file, "r") as f:
+            objects = []
+            h5py.h5o.visit(
+                f.id,
+                lambda name, info: objects.append((name.decode(), info.type)),
+                info=True,
+            )
+            # objects are visited in order so parents come before their content
+            for name, obj_type in objects:
+                *parents, leaf = name.split("/")
+                node = self.tree
+                for parent in parents:
+                    node = node[parent]
+                if obj_type == h5py.h5o.TYPE_GROUP:
+                    node[leaf] = {}
+                    datatype = f[name].attrs.get("datatype")
+                    if isinstance(datatype, bytes):
+                        datatype = datatype.decode()
+                    self.datatypes[name] = datatype
+                else:
+                    node[leaf] = None
+
+    def _ls(self, node, lh5_group):
+        if lh5_group == "":
+            lh5_group = "*"
+        splitpath = lh5_group.split("/", 1)
+        matching = fnmatch.filter(node, splitpath[0])
+        if len(splitpath) == 1:
+            return matching
+        return [
+            f"{key}/{path}"
+            for key in matching
+            if node[key] is not None
+            for path in self._ls(node[key], splitpath[1])
+        ]
+
+    def ls(self, lh5_group: str = "") -> list[str]:
+        """
+        Lists the objects matching `lh5_group`, with the same conventions as
+        `lgdo.lh5.ls`: wildcards are supported and a trailing ``/`` lists the
+        content of the group
+        """
+        return self._ls(self.tree, lh5_group.removeprefix("/"))
+
+    def tables(self) -> set[str]:
+        """Returns the set of paths of all tables in the file"""
+        return {
+            name
+            for name, datatype in self.datatypes.items()
+            if datatype is not None and datatype.startswith("table")
+        }
+
+    def fields(self, table: str) -> list[str]:
+        """Returns the fields of `table`"""
+        return [path.split("/")[-1] for path in self.ls(f"{table.rstrip('/')}/")]
+
+
+_inventories = {}
+
+
+def get_lh5_inventory(lh5_file: str | Path) -> LH5Inventory:
+    """
+    Returns the inventory of `lh5_file`, inventories are cached and only
+    rebuilt if the modification time of the file changes
+    """
+    lh5_file = str(lh5_file)
+    mtime = Path(lh5_file).stat().st_mtime_ns
+    cached = _inventories.get(lh5_file)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, LH5Inventory(lh5_file))
+        _inventories[lh5_file] = cached
+    return cached[1]
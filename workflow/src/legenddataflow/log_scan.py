@@ -0,0 +1,150 @@
+"""
+This module summarises the log files left by a production. The log files are
+scanned line by line on a thread pool, only the ERROR and WARNING lines are
+kept in memory, and the summaries are written in the order of the sorted log
+paths so they do not depend on the scheduling of the threads.
+"""
+
+import datetime
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+
+
+def find_log_files(log_path: str | Path) -> tuple[list, list]:
+    """
+    Returns the paths of the ``.log`` files under `log_path`, sorted, and of
+    all the directories under it, deepest first, walking the tree once
+    """
+    files, dirs = [], []
+    to_visit = [str(log_path)]
+    while len(to_visit) > 0:
+        path = to_visit.pop()
+        dirs.append(path)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    to_visit.append(entry.path)
+                elif entry.name.endswith(".log"):
+                    files.append(entry.path)
+    # a directory is always visited before its subdirectories
+    return sorted(files), dirs[::-1]
+
+
+def scan_log_file(
+    file: str | Path, delete: bool = False, block_size: int = 1 << 20
+) -> tuple[list, list]:
+    """
+    Returns the ERROR and the WARNING lines of a log file, streaming through
+    it in blocks of `block_size` characters, the file is deleted afterwards
+    if `delete`
+    """
+    errors, warnings = [], []
+    with Path(file).open(errors="replace") as r:
+        rest = ""
+        while True:
+            block = r.read(block_size)
+            at_end = len(block) == 0
+            block = rest + block
+            if not at_end:
+                # the last line may continue in the next block
+                block, _, rest = block.rpartition("\n")
+            # most blocks have neither, so they are not split into lines
+            if "ERROR" in block or "WARNING" in block:
+                for line in block.splitlines():
+                    if "ERROR" in line:
+                        errors.append(line)
+                    elif "WARNING" in line:
+                        warnings.append(line)
+            if at_end:
+                break
+    if delete:
+        Path(file).unlink()
+    return errors, warnings
+
+
+def check_log_files(
+    log_path: str | Path,
+    output_file: str | Path,
+    gen_output: str,
+    warning_file: str | Path | None = None,
+    n_workers: int = 1,
+    delete: bool = True,
+    batch_size: int = 256,
+) -> tuple[int, int]:
+    """
+    Writes the ERROR lines of the log files under `log_path` to `output_file`
+    and their WARNING lines to `warning_file`, each line prefixed by the name
+    of its log file.
+
+    Parameters
+    ----------
+    log_path
+        Directory containing the log files
+    output_file
+        Error summary
+    gen_output
+        Name of the output of the production, used in the summary headers
+    warning_file
+        Warning summary, the warnings are not reported if not given
+    n_workers
+        Number of threads scanning the log files
+    delete
+        Deletes the log files once scanned and the directories left empty
+    batch_size
+        Number of log files scanned by each task given to the threads
+
+    Returns
+    -------
+    tuple
+        Number of errors and of warnings
+    """
+    now = datetime.datetime.now(datetime.UTC).strftime("%d/%m/%y %H:%M")
+    files, dirs = find_log_files(log_path)
+
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    if warning_file is not None:
+        Path(warning_file).parent.mkdir(parents=True, exist_ok=True)
+
+    n_errors = 0
+    n_warnings = 0
+    with (
+        Path(output_file).open("w") as f,
+        Path(os.devnull if warning_file is None else warning_file).open("w") as w,
+        ThreadPoolExecutor(max_workers=max(n_workers, 1)) as executor,
+    ):
+        batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+        # map returns the results in the order of the files
+        results = executor.map(
+            lambda batch: [scan_log_file(file, delete) for file in batch], batches
+        )
+        for file, (errors, warnings) in zip(
+            files, itertools.chain.from_iterable(results), strict=True
+        ):
+            if len(errors) + len(warnings) == 0:
+                continue
+            name = Path(file).name
+            if len(errors) > 0 and n_errors == 0:
+                f.write(f"{gen_output} successfully generated at {now} with errors \n")
+            if len(warnings) > 0 and n_warnings == 0:
+                w.write(
+                    f"{gen_output} successfully generated at {now} with warnings \n"
+                )
+            f.writelines(f"{name} : {line}\n" for line in errors)
+            w.writelines(f"{name} : {line}\n" for line in warnings)
+            n_errors += len(errors)
+            n_warnings += len(warnings)
+        if n_errors == 0:
+            f.write(f"{gen_output} successfully generated at {now} with no errors \n")
+        if n_warnings == 0:
+            w.write(f"{gen_output} successfully generated at {now} with no warnings \n")
+
+    if delete:
+        # the directories are removed deepest first, the ones still holding
+        # other files are kept
+        for path in dirs:
+            with suppress(OSError):
+                Path(path).rmdir()
+    return n_errors, n_warnings
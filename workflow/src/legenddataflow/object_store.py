@@ -0,0 +1,155 @@
+"""
+This module contains a single-file store of pickled objects keyed by channel,
+used for the merged calibration objects and plots. Each entry is pickled and
+compressed separately and the file ends with an index of the entries, so an
+entry is read by memory-mapping the file and decompressing only its bytes
+instead of unpickling the whole file.
+
+Layout of the file::
+
+    MAGIC | entry blobs | JSON index | index offset (u64) | index size (u64) | MAGIC
+"""
+
+import json
+import mmap
+import pickle as pkl
+import shelve
+import struct
+import zlib
+from collections.abc import Iterable, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+MAGIC = b"LDFOBJS1"
+_trailer = struct.Struct("<QQ")
+
+
+def write_object_store(
+    path: str | Path, items: Mapping | Iterable, compression_level: int = 6
+) -> None:
+    """
+    Writes the objects in `items` to an object store at `path`.
+
+    Parameters
+    ----------
+    path
+        Output file, overwritten if it exists
+    items
+        Mapping of keys to objects or iterable of ``(key, object)`` pairs, the
+        objects are pickled and written one at a time so a generator can be
+        used to avoid holding them all in memory
+    compression_level
+        zlib compression level of the entries
+    """
+    if isinstance(items, Mapping):
+        items = items.items()
+    index = {}
+    with Path(path).open("wb") as f:
+        f.write(MAGIC)
+        for key, obj in items:
+            if key in index:
+                msg = f"duplicate key {key} in object store"
+                raise KeyError(msg)
+            blob = zlib.compress(
+                pkl.dumps(obj, protocol=pkl.HIGHEST_PROTOCOL), compression_level
+            )
+            index[key] = [f.tell(), len(blob)]
+            f.write(blob)
+        index_offset = f.tell()
+        index_bytes = json.dumps(index).encode()
+        f.write(index_bytes)
+        f.write(_trailer.pack(index_offset, len(index_bytes)))
+        f.write(MAGIC)
+
+
+def is_object_store(path: str | Path) -> bool:
+    """Returns True if `path` is a file written by `write_object_store`"""
+    path = Path(path)
+    if not path.is_file():
+        return False
+    with path.open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class ObjectStore(Mapping):
+    """
+    Read-only mapping over an object store written by `write_object_store`.
+    Only the index is read when the store is opened, the entries are
+    decompressed and unpickled from the memory-mapped file when accessed.
+
+    Parameters
+    ----------
+    path
+        Object store file
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise
+        size = _trailer.size + len(MAGIC)
+        if (
+            len(self._mmap) < len(MAGIC) + size
+            or self._mmap[: len(MAGIC)] != MAGIC
+            or self._mmap[-len(MAGIC) :] != MAGIC
+        ):
+            self.close()
+            msg = f"{path} is not an object store"
+            raise ValueError(msg)
+        index_offset, index_size = _trailer.unpack(self._mmap[-size : -len(MAGIC)])
+        self.index = json.loads(self._mmap[index_offset : index_offset + index_size])
+
+    def __getitem__(self, key):
+        offset, size = self.index[key]
+        return pkl.loads(zlib.decompress(self._mmap[offset : offset + size]))
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def close(self) -> None:
+        """Closes the file"""
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def open_objects(path: str | Path):
+    """
+    Opens merged per-channel objects whatever their format: an object store,
+    a shelve database (``.dat``/``.dir``) or a pickle file, which is loaded
+    whole.
+
+    Yields
+    ------
+    Mapping
+        The objects keyed by channel
+    """
+    path = Path(path)
+    if path.suffix in (".dat", ".dir", ".bak") or (
+        not path.exists() and path.with_suffix(".dir").exists()
+    ):
+        with shelve.open(str(path.with_suffix("")), "r") as shelf:
+            yield shelf
+    elif is_object_store(path):
+        with ObjectStore(path) as store:
+            yield store
+    else:
+        with path.open("rb") as f:
+            yield pkl.load(f)
@@ -5,15 +5,14 @@ to determine the par and par overwrite for a particular timestamp
 
 from pathlib import Path
 
-from dbetto.catalog import Catalog
-
+from .catalog_registry import IndexedCatalog, get_catalog_registry
 from .FileKey import ProcessingFileKey
 
 # from .patterns import
 from .utils import get_pars_path, par_overwrite_path, pars_path
 
 
-class ParsCatalog(Catalog):
+class ParsCatalog(IndexedCatalog):
     @staticmethod
     def match_pars_files(filelist1: list, filelist2: list) -> tuple[list, list]:
         """
@@ -35,7 +34,7 @@ class ParsCatalog(Catalog):
         filelist1 : list
             List of files
         filelist2 : list
-            List of files
+            Files of filelist2 not matching any file in filelist1
         """
         if (
             filelist1 is None
@@ -44,20 +43,20 @@ class ParsCatalog(Catalog):
             or len(filelist2) == 0
         ):
             return filelist1, filelist2
-        for file2 in filelist2:
-            fk2 = ProcessingFileKey.get_filekey_from_pattern(file2)
-            for j, file1 in enumerate(filelist1):
-                fk1 = ProcessingFileKey.get_filekey_from_pattern(file1)
-                if (
-                    fk1.processing_step == fk2.processing_step
-                    and fk1.datatype == fk2.datatype
-                ):
-                    filelist1[j] = file2
-                    if len(filelist2) > 1:
-                        filelist2.remove(file2)
-                    else:
-                        filelist2 = []
-        return filelist1, filelist2
+        # index the files in filelist1 by processing step and datatype
+        index = {}
+        for j, fk1 in enumerate(ProcessingFileKey.parse_many(filelist1)):
+            index.setdefault((fk1.processing_step, fk1.datatype), []).append(j)
+
+        unmatched = []
+        for file2, fk2 in zip(filelist2, ProcessingFileKey.parse_many(filelist2)):
+            matches = index.get((fk2.processing_step, fk2.datatype))
+            if matches is None:
+                unmatched.append(file2)
+                continue
+            for j in matches:
+                filelist1[j] = file2
+        return filelist1, unmatched
 
     def get_par_file(self, setup: dict, timestamp: str, tier: str) -> list:
         """
@@ -80,16 +79,18 @@ class ParsCatalog(Catalog):
             List of par files
         """
         allow_none = setup.get("allow_none_par", False)
+        catalogs = get_catalog_registry()
         if pars_path(setup) not in get_pars_path(setup, tier):
             par_file = Path(get_pars_path(setup, tier)) / "validity.yaml"
-            catalog = ParsCatalog.read_from(par_file)
-            pars_files = catalog.valid_for(timestamp, allow_none=allow_none)
+            pars_files = catalogs.valid_for(par_file, timestamp, allow_none=allow_none)
         else:
             pars_files = self.valid_for(timestamp, allow_none=allow_none)
+            if pars_files is not None:
+                # copy so matching the overwrites does not modify the catalog
+                pars_files = list(pars_files)
         par_overwrite_file = Path(par_overwrite_path(setup)) / tier / "validity.yaml"
-        overwrite_catalog = ParsCatalog.read_from(par_overwrite_file)
-        pars_files_overwrite = overwrite_catalog.valid_for(
-            timestamp, allow_none=allow_none
+        pars_files_overwrite = catalogs.valid_for(
+            par_overwrite_file, timestamp, allow_none=allow_none
         )
         pars_files, pars_files_overwrite = ParsCatalog.match_pars_files(
             pars_files, pars_files_overwrite
@@ -95,6 +95,16 @@ def get_pattern_tier_raw_blind(setup):
     )
 
 
+def get_pattern_tier_raw_blind_index(setup):
+    return (
+        Path(f"{tier_raw_blind_path(setup)}")
+        / "phy"
+        / "{period}"
+        / "{run}"
+        / "{experiment}-{period}-{run}-phy-{timestamp}-blind_index.lh5"
+    )
+
+
 def get_pattern_tier(setup, tier, check_in_cycle=True):
     if tier in ["raw", "tcm", "dsp", "hit", "ann", "evt", "psp", "pht", "pan", "pet"]:
         file_pattern = (
@@ -292,7 +302,7 @@ def get_pattern_plts_tmp_channel(setup, tier, name=None, extension="pkl"):
         )
 
 
-def get_pattern_plts(setup, tier, name=None):
+def get_pattern_plts(setup, tier, name=None, extension="dir"):
     if name is None:
         return (
             Path(f"{plts_path(setup)}")
@@ -300,7 +310,10 @@ def get_pattern_plts(setup, tier, name=None):
             / "cal"
             / "{period}"
             / "{run}"
-            / ("{experiment}-{period}-{run}-cal-{timestamp}-plt_" + tier + ".dir")
+            / (
+                "{experiment}-{period}-{run}-cal-{timestamp}-plt_"
+                + f"{tier}.{extension}"
+            )
         )
     else:
         return (
@@ -314,7 +327,7 @@ def get_pattern_plts(setup, tier, name=None):
                 + tier
                 + "_"
                 + name
-                + ".dir"
+                + f".{extension}"
             )
         )
 
@@ -0,0 +1,191 @@
+"""
+This module contains a plain-data description of the plots made by the par
+scripts. Instead of pickling matplotlib figures, the scripts store the binned
+data and the axes settings of each plot in dictionaries of numpy arrays, which
+are cheap to build and to pickle and do not need matplotlib. The figures are
+only made from them with `render` when the plots are looked at.
+
+A plot is a dictionary with the panels of the figure, each panel holding the
+layers drawn on its axes::
+
+    {
+        "plot_data": 1,
+        "title": ..., "figsize": ..., "fontsize": ...,
+        "panels": [
+            {"xlabel": ..., "ylabel": ..., ..., "layers": [{"kind": "hist", ...}]}
+        ],
+    }
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+PLOT_DATA_VERSION = 1
+
+
+def hist(x, bins, **style) -> dict:
+    """Histogram of `x` drawn as steps"""
+    counts, edges = np.histogram(np.asarray(x), bins=bins)
+    return {"kind": "hist", "counts": counts, "edges": edges, "style": style}
+
+
+def hist2d(x, y, bins, log: bool = True, **style) -> dict:
+    """2D histogram of `x` and `y`, with a log colour scale if `log`"""
+    counts, xedges, yedges = np.histogram2d(np.asarray(x), np.asarray(y), bins=bins)
+    return {
+        "kind": "hist2d",
+        "counts": counts,
+        "xedges": xedges,
+        "yedges": yedges,
+        "log": log,
+        "style": style,
+    }
+
+
+def scatter(x, y, **style) -> dict:
+    """Points at `x`, `y`"""
+    return {"kind": "scatter", "x": np.asarray(x), "y": np.asarray(y), "style": style}
+
+
+def hline(y: float, **style) -> dict:
+    """Horizontal line at `y`"""
+    return {"kind": "hline", "y": y, "style": style}
+
+
+def panel(
+    *layers,
+    xlabel: str | None = None,
+    ylabel: str | None = None,
+    title: str | None = None,
+    xscale: str | None = None,
+    yscale: str | None = None,
+    xlim: tuple | None = None,
+    ylim: tuple | None = None,
+    xaxis: str | None = None,
+) -> dict:
+    """
+    Axes of a plot and the `layers` drawn on them. `xaxis` is ``timestamp``
+    for unix timestamps labelled with the time of day from the start of the
+    axis or ``date`` for unix timestamps labelled with their date.
+    """
+    if xaxis not in (None, "timestamp", "date"):
+        msg = f"unknown xaxis {xaxis}"
+        raise ValueError(msg)
+    return {
+        "layers": list(layers),
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "title": title,
+        "xscale": xscale,
+        "yscale": yscale,
+        "xlim": xlim,
+        "ylim": ylim,
+        "xaxis": xaxis,
+    }
+
+
+def plot(
+    *panels,
+    title: str | None = None,
+    figsize: tuple | None = None,
+    fontsize: float | None = None,
+) -> dict:
+    """Plot made of `panels` stacked vertically"""
+    return {
+        "plot_data": PLOT_DATA_VERSION,
+        "panels": list(panels),
+        "title": title,
+        "figsize": figsize,
+        "fontsize": fontsize,
+    }
+
+
+def is_plot_data(obj) -> bool:
+    """Returns True if `obj` was made by `plot`"""
+    return isinstance(obj, dict) and "plot_data" in obj and "panels" in obj
+
+
+def _utc(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _draw(ax, layer, dates=False):
+    from matplotlib.colors import LogNorm
+
+    kind = layer["kind"]
+    if kind == "hist":
+        ax.stairs(layer["counts"], layer["edges"], **layer["style"])
+    elif kind == "hist2d":
+        counts = layer["counts"].T
+        if layer["log"]:
+            counts = np.ma.masked_less_equal(counts, 0)
+        ax.pcolormesh(
+            layer["xedges"],
+            layer["yedges"],
+            counts,
+            norm=LogNorm() if layer["log"] and counts.count() > 0 else None,
+            **layer["style"],
+        )
+    elif kind == "scatter":
+        x = [_utc(t) for t in layer["x"]] if dates else layer["x"]
+        ax.scatter(x, layer["y"], **layer["style"])
+    elif kind == "hline":
+        ax.axhline(y=layer["y"], **layer["style"])
+    else:
+        msg = f"unknown plot layer {kind}"
+        raise ValueError(msg)
+
+
+def render(plot_data: dict):
+    """
+    Makes the matplotlib figure of a plot made by `plot`.
+
+    Returns
+    -------
+    Figure
+        The figure, which is not registered with `pyplot`
+    """
+    import matplotlib as mpl
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+
+    rc = {} if plot_data["fontsize"] is None else {"font.size": plot_data["fontsize"]}
+    with mpl.rc_context(rc):
+        fig = Figure(figsize=plot_data["figsize"])
+        axes = fig.subplots(len(plot_data["panels"]), 1, squeeze=False)[:, 0]
+        for ax, pnl in zip(axes, plot_data["panels"], strict=True):
+            for layer in pnl["layers"]:
+                _draw(ax, layer, dates=pnl["xaxis"] == "date")
+            for key in ["xscale", "yscale", "xlim", "ylim", "title"]:
+                if pnl[key] is not None:
+                    getattr(ax, f"set_{key}")(pnl[key])
+            if pnl["xaxis"] == "timestamp":
+                ticks = ax.get_xticks()
+                ax.set_xticks(ticks, [_utc(tick).strftime("%H:%M") for tick in ticks])
+                ax.set_xlabel(
+                    f"Time starting : {_utc(ticks[0]).strftime('%d/%m/%y %H:%M')}"
+                )
+            elif pnl["xaxis"] == "date":
+                ax.xaxis.set_major_formatter(mdates.DateFormatter("%d/%m/%y"))
+                fig.autofmt_xdate()
+            if pnl["xaxis"] != "timestamp" and pnl["xlabel"] is not None:
+                ax.set_xlabel(pnl["xlabel"])
+            if pnl["ylabel"] is not None:
+                ax.set_ylabel(pnl["ylabel"])
+        if plot_data["title"] is not None:
+            fig.suptitle(plot_data["title"])
+    return fig
+
+
+def render_all(obj):
+    """
+    Returns `obj` with the plots made by `plot` in it, possibly nested in
+    dictionaries, replaced by their figures. Other objects e.g. figures
+    pickled by older versions are returned as they are.
+    """
+    if is_plot_data(obj):
+        return render(obj)
+    if isinstance(obj, dict):
+        return {key: render_all(value) for key, value in obj.items()}
+    return obj
@@ -0,0 +1,163 @@
+"""
+This module profiles the helper functions called by the rules while the
+Snakefile is loaded and the DAG is built. It is opt-in, once a helper is
+instrumented every call is timed and attributed to the rule evaluating it.
+"""
+
+import functools
+import inspect
+import math
+import sys
+import time
+from pathlib import Path
+
+from . import chanlist
+from .cal_grouping import CalGrouping
+from .catalog_registry import CatalogRegistry
+from .create_pars_keylist import ParsKeyResolve
+from .pars_loading import ParsCatalog
+
+# helpers of legenddataflow used by the rules
+HELPERS = [
+    (ParsCatalog, "get_par_file"),
+    (ParsCatalog, "match_pars_files"),
+    (ParsKeyResolve, "get_par_catalog"),
+    (CalGrouping, "get_filelists"),
+    (CalGrouping, "get_par_files"),
+    (CalGrouping, "get_plt_files"),
+    (CalGrouping, "get_log_file"),
+    (CalGrouping, "get_timestamp"),
+    (CalGrouping, "get_wildcard_constraints"),
+    (CatalogRegistry, "get_files"),
+    (chanlist, "get_chanlist"),
+]
+
+# helpers defined in the rule files
+RULE_HELPERS = [
+    "get_chanlist",
+    "get_par_chanlist",
+    "get_plt_chanlist",
+    "get_filelist",
+    "get_filelist_full_wildcards",
+    "build_filelist",
+    "get_input_par_file",
+    "get_overwrite_file",
+    "get_blinding_curve_file",
+    "get_blinding_check_file",
+    "get_table_name",
+]
+
+
+def _current_rule():
+    """Returns the name of the rule whose input is being evaluated"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        obj = frame.f_locals.get("self")
+        if type(obj).__name__ == "Rule" and type(obj).__module__ == "snakemake.rules":
+            return obj.name
+        frame = frame.f_back
+    return "(snakefile)"
+
+
+def _p95(durations):
+    durations = sorted(durations)
+    return durations[math.ceil(0.95 * len(durations)) - 1]
+
+
+class DagProfiler:
+    """
+    Records the number of calls and the time spent in each helper, per rule
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    def record(self, helper, rule, duration):
+        self.timings.setdefault((helper, rule), []).append(duration)
+
+    def wrap(self, func, name):
+        """Returns `func` wrapped so each call is recorded under `name`"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rule = _current_rule()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, rule, time.perf_counter() - start)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    def instrument(self, owner, attr, name=None):
+        """
+        Replaces `owner.attr` with a profiled version, `owner` can be a class
+        or a module, static and class methods are kept as such
+        """
+        if name is None:
+            name = f"{getattr(owner, '__name__', owner)}.{attr}"
+        static = inspect.getattr_static(owner, attr)
+        if getattr(getattr(static, "__func__", static), "__profiled__", False):
+            return
+        if isinstance(static, staticmethod):
+            setattr(owner, attr, staticmethod(self.wrap(static.__func__, name)))
+        elif isinstance(static, classmethod):
+            setattr(owner, attr, classmethod(self.wrap(static.__func__, name)))
+        else:
+            setattr(owner, attr, self.wrap(static, name))
+
+    def instrument_helpers(self):
+        """Instruments the legenddataflow helpers used by the rules"""
+        for owner, attr in HELPERS:
+            self.instrument(owner, attr)
+
+    def instrument_namespace(self, namespace, names=None):
+        """Instruments the functions defined in the rule files in `namespace`"""
+        for name in RULE_HELPERS if names is None else names:
+            func = namespace.get(name)
+            if callable(func) and not getattr(func, "__profiled__", False):
+                namespace[name] = self.wrap(func, name)
+
+    def summary(self):
+        """
+        Returns the rows (helper, rule, calls, total, p95) ranked by total
+        time, rows with rule None are the totals per helper over all rules
+        """
+        per_helper = {}
+        for (helper, _), durations in self.timings.items():
+            per_helper.setdefault(helper, []).extend(durations)
+        rows = [
+            (helper, None, len(durations), sum(durations), _p95(durations))
+            for helper, durations in per_helper.items()
+        ]
+        rows += [
+            (helper, rule, len(durations), sum(durations), _p95(durations))
+            for (helper, rule), durations in self.timings.items()
+        ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def report(self):
+        rows = self.summary()
+        lines = [
+            f"{'helper':<40} {'rule':<40} {'calls':>8} {'total [s]':>10} {'p95 [ms]':>10}"
+        ]
+        for helper, rule, calls, total, p95 in rows:
+            lines.append(
+                f"{helper:<40} {'(all)' if rule is None else rule:<40} "
+                f"{calls:>8} {total:>10.3f} {1000 * p95:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, file):
+        Path(file).parent.mkdir(parents=True, exist_ok=True)
+        with Path(file).open("w") as w:
+            w.write(self.report() + "\n")
+
+
+_profiler = DagProfiler()
+
+
+def get_profiler():
+    """Returns the profiler shared by the whole process"""
+    return _profiler
@@ -1,15 +1,14 @@
 # ruff: noqa: F821, T201
 
 import datetime
-import json
 import os
-import subprocess
 import time
 from pathlib import Path
 
 from legenddataflow import FileKey, patterns
 from legenddataflow import utils as ut
-from legenddataflow.execenv import _execenv2str, execenv_pyexe
+from legenddataflow.filedb import update_filedbs
+from legenddataflow.log_scan import check_log_files
 
 print("INFO: dataflow ran successfully, now few final checks and scripts")
 
@@ -18,74 +17,6 @@ def as_ro(path):
     return ut.as_ro(snakemake.params.setup, path)
 
 
-def check_log_files(log_path, output_file, gen_output, warning_file=None):
-    now = datetime.datetime.now(datetime.UTC).strftime("%d/%m/%y %H:%M")
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    if warning_file is not None:
-        Path(warning_file).parent.mkdir(parents=True, exist_ok=True)
-        with Path(warning_file).open("w") as w, Path(output_file).open("w") as f:
-            n_errors = 0
-            n_warnings = 0
-            for file in Path(log_path).rglob("*.log"):
-                with Path(file).open() as r:
-                    text = r.read()
-                    if "ERROR" in text or "WARNING" in text:
-                        for line in text.splitlines():
-                            if "ERROR" in line:
-                                if n_errors == 0:
-                                    f.write(
-                                        f"{gen_output} successfully generated at {now} with errors \n"
-                                    )
-                                if n_warnings == 0:
-                                    w.write(
-                                        f"{gen_output} successfully generated at {now} with warnings \n"
-                                    )
-                                f.write(f"{Path(file).name} : {line}\n")
-                                n_errors += 1
-                            elif "WARNING" in line:
-                                w.write(f"{Path(file).name} : {line}\n")
-                                n_warnings += 1
-                    else:
-                        pass
-                Path(file).unlink()
-                text = None
-            if n_errors == 0:
-                f.write(
-                    f"{gen_output} successfully generated at {now} with no errors \n"
-                )
-            if n_warnings == 0:
-                w.write(
-                    f"{gen_output} successfully generated at {now} with no warnings \n"
-                )
-    else:
-        with Path(output_file).open("w") as f:
-            n_errors = 0
-            for file in Path(log_path).rglob("*.log"):
-                with Path(file).open() as r:
-                    text = r.read()
-                    if "ERROR" in text:
-                        for line in text.splitlines():
-                            if "ERROR" in line:
-                                if n_errors == 0:
-                                    f.write(
-                                        f"{gen_output} successfully generated at {now} with errors \n"
-                                    )
-                                f.write(f"{Path(file).name} : {line}\n")
-                                n_errors += 1
-                    else:
-                        pass
-                Path(file).unlink()
-                text = None
-            if n_errors == 0:
-                f.write(
-                    f"{gen_output} successfully generated at {now} with no errors \n"
-                )
-    walk = list(os.walk(log_path))
-    for path, _, _ in walk[::-1]:
-        if len(os.listdir(path)) == 0:
-            Path(path).rmdir()
-
-
 def add_spaces(n):
     out_string = ""
     for _i in range(n):
@@ -190,52 +121,23 @@ def build_file_dbs(gen_tier_path, outdir):
     if not runs:
         print(f"WARNING: did not find any processed runs in {gen_tier_path}")
 
-    processes = set()
+    outdir.mkdir(parents=True, exist_ok=True)
+    outputs = {}
     for spec in runs:
         speck = spec.split("/")
-        outdir.mkdir(parents=True, exist_ok=True)
         # TODO: replace l200 with {experiment}
-        outfile = outdir / f"l200-{speck[1]}-{speck[2]}-{speck[0]}-filedb.h5"
-        logfile = (
-            Path(ut.tmp_log_path(snakemake.params.setup))
-            / outfile.with_suffix(".log").name
-        )
-
-        print(f"INFO: ......building {outfile}")
-        pre_cmdline, cmdenv = execenv_pyexe(
-            snakemake.params.setup, "build-filedb", as_string=False
-        )
-
-        cmdline = [
-            *pre_cmdline,
-            "--scan-path",
-            spec,
-            "--output",
-            str(outfile),
-            "--config",
-            str(outdir / "file_db_config.json"),
-            "--log",
-            str(logfile),
-        ]
-
-        if speck[0] == "phy":
-            cmdline += ["--assume-nonsparse"]
-
-        # TODO: forward stdout to log file
-        processes.add(subprocess.Popen(cmdline, env=cmdenv))
-
-        if len(processes) >= snakemake.threads:
-            os.wait()
-            processes.difference_update([p for p in processes if p.poll() is not None])
-
-    for p in processes:
-        if p.poll() is None:
-            p.wait()
-
-    for p in processes:
-        if p.returncode != 0:
-            msg = f"at least one FileDB building thread failed: {_execenv2str(p.args, cmdenv)}"
-            raise RuntimeError(msg)
+        outputs[spec] = outdir / f"l200-{speck[1]}-{speck[2]}-{speck[0]}-filedb.h5"
+
+    # only the files added or changed since the last update are opened
+    n_rescanned = update_filedbs(
+        file_db_config,
+        outputs,
+        n_workers=snakemake.threads,
+        refresh=snakemake.params.setup.get("refresh_filedb", False),
+    )
+    for spec, n in n_rescanned.items():
+        if n > 0:
+            print(f"INFO: ......updated {outputs[spec]} ({n} files rescanned)")
 
     toc = time.time()
     dt = datetime.timedelta(seconds=toc - tic)
@@ -284,15 +186,9 @@ file_db_config |= {
 }
 
 if snakemake.wildcards.tier != "daq":
-    print(f"INFO: ...building FileDBs with {snakemake.threads} threads")
-
-    Path(snakemake.params.filedb_path).mkdir(parents=True, exist_ok=True)
-
-    with (Path(snakemake.params.filedb_path) / "file_db_config.json").open("w") as f:
-        json.dump(file_db_config, f, indent=2)
+    print(f"INFO: ...building FileDBs with {snakemake.threads} processes")
 
     build_file_dbs(ut.tier_path(snakemake.params.setup), snakemake.params.filedb_path)
-    (Path(snakemake.params.filedb_path) / "file_db_config.json").unlink()
 
     build_valid_keys(
         Path(ut.tmp_par_path(snakemake.params.setup)) / "*_db.json",
@@ -306,6 +202,7 @@ check_log_files(
     snakemake.output.summary_log,
     snakemake.output.gen_output,
     warning_file=snakemake.output.warning_log,
+    n_workers=snakemake.threads,
 )
 
 Path(snakemake.output.gen_output).touch()
@@ -1,7 +1,7 @@
 import argparse
 from pathlib import Path
 
-from dbetto import TextDB
+from ..chanlist import get_chanlist
 
 
 def create_chankeylist() -> None:
@@ -16,24 +16,9 @@ def create_chankeylist() -> None:
 
     args = argparser.parse_args()
 
-    status_map = TextDB(args.det_status, lazy=True).statuses.on(
-        args.timestamp, system=args.datatype
+    channels = get_chanlist(
+        args.det_status, args.channelmap, args.timestamp, args.datatype, args.system
     )
-    chmap = TextDB(args.channelmap, lazy=True).channelmaps.on(args.timestamp)
-
-    # only restrict to a certain system (geds, spms, ...)
-    channels = []
-    for channel, status in status_map.items():
-        # start with channels marked as processable in the status map
-        if status.processable is False:
-            continue
-
-        if channel not in chmap:
-            msg = f"{channel} is marked as processable but is not found in the channel map (on {args.timestamp})"
-            raise RuntimeError(msg)
-
-        if chmap[channel].system == args.system:
-            channels.append(channel)
 
     if len(channels) == 0:
         print("WARNING: No channels found")  # noqa: T201
@@ -5,9 +5,10 @@ from pathlib import Path
 
 import numpy as np
 from dbetto.catalog import Props
-from lgdo import lh5
 
 from ..FileKey import ChannelProcKey
+from ..lh5_utils import merge_lh5_files
+from ..object_store import write_object_store
 
 
 def replace_path(d, old_path, new_path):
@@ -92,9 +93,7 @@ def merge_channels() -> None:
             for channel in channel_files:
                 with Path(channel).open("rb") as r:
                     channel_dict = pkl.load(r)
-                fkey = ChannelProcKey.get_filekey_from_pattern(
-                    Path(channel_files[0]).name
-                )
+                fkey = ChannelProcKey.get_filekey_from_pattern(Path(channel).name)
                 if isinstance(channel_dict, dict) and "common" in list(channel_dict):
                     chan_common_dict = channel_dict.pop("common")
                     common_dict[fkey.channel] = chan_common_dict
@@ -102,20 +101,32 @@ def merge_channels() -> None:
             if len(common_dict) > 0:
                 shelf["common"] = common_dict
 
+    elif file_extension == ".pkldb":
+        common_dict = {}
+
+        def _channel_objects():
+            # the channels are loaded one at a time as they are written
+            for channel in channel_files:
+                with Path(channel).open("rb") as r:
+                    channel_dict = pkl.load(r)
+                fkey = ChannelProcKey.get_filekey_from_pattern(Path(channel).name)
+                if isinstance(channel_dict, dict) and "common" in list(channel_dict):
+                    common_dict[fkey.channel] = channel_dict.pop("common")
+                yield fkey.channel, channel_dict
+            if len(common_dict) > 0:
+                yield "common", common_dict
+
+        write_object_store(temp_output, _channel_objects())
+        Path(temp_output).rename(out_file)
+
     elif file_extension == ".lh5":
         if args.in_db:
             db_dict = Props.read_from(args.in_db)
+        channels = []
         for channel in channel_files:
             if Path(channel).suffix == file_extension:
                 fkey = ChannelProcKey.get_filekey_from_pattern(Path(channel).name)
-                tb_in = lh5.read(f"{fkey.channel}", channel)
-
-                lh5.write(
-                    tb_in,
-                    name=fkey.channel,
-                    lh5_file=temp_output,
-                    wo_mode="a",
-                )
+                channels.append(fkey.channel)
                 if args.in_db:
                     db_dict[fkey.channel] = replace_path(
                         db_dict[fkey.channel], channel, args.output
@@ -123,6 +134,9 @@ def merge_channels() -> None:
             else:
                 msg = "Output file extension does not match input file extension"
                 raise RuntimeError(msg)
+
+        # the channel groups are copied without decoding their data
+        merge_lh5_files(channel_files, temp_output, names=channels)
         if args.out_db:
             Props.write_to(args.out_db, db_dict)
 
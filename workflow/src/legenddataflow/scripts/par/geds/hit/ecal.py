@@ -4,25 +4,23 @@ import argparse
 import copy
 import pickle as pkl
 import warnings
-from datetime import datetime
 from pathlib import Path
 
 import lgdo.lh5 as lh5
 import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy as np
 import pygama.math.distributions as pgf
 import pygama.math.histogram as pgh
 from dbetto import TextDB
 from dbetto.catalog import Props
 from legendmeta import LegendMetadata
-from matplotlib.colors import LogNorm
 from pygama.math.distributions import nb_poly
 from pygama.pargen.data_cleaning import get_mode_stdev
 from pygama.pargen.energy_cal import FWHMLinear, FWHMQuadratic, HPGeCalibration
 from pygama.pargen.utils import load_data
 from scipy.stats import binned_statistic
 
+from ..... import plot_data
 from .....convert_np import convert_dict_np_to_float
 from .....log import build_log
 from ....pulser_removal import get_pulser_mask
@@ -44,43 +42,35 @@ def plot_2614_timemap(
     dx=1,
     time_dx=180,
 ):
-    plt.rcParams["figure.figsize"] = figsize
-    plt.rcParams["font.size"] = fontsize
-
     selection = data.query(
         f"{cal_energy_param}>2560&{cal_energy_param}<2660&{selection_string}"
     )
 
-    fig = plt.figure()
-    if len(selection) == 0:
-        pass
-    else:
+    layers = []
+    if len(selection) > 0:
         time_bins = np.arange(
             (np.amin(data["timestamp"]) // time_dx) * time_dx,
             ((np.amax(data["timestamp"]) // time_dx) + 2) * time_dx,
             time_dx,
         )
-
-        plt.hist2d(
-            selection["timestamp"],
-            selection[cal_energy_param],
-            bins=[time_bins, np.arange(erange[0], erange[1] + dx, dx)],
-            norm=LogNorm(),
+        layers.append(
+            plot_data.hist2d(
+                selection["timestamp"],
+                selection[cal_energy_param],
+                bins=[time_bins, np.arange(erange[0], erange[1] + dx, dx)],
+            )
         )
 
-    ticks, labels = plt.xticks()
-    plt.xlabel(
-        f"Time starting : {datetime.utcfromtimestamp(ticks[0]).strftime('%d/%m/%y %H:%M')}"
+    return plot_data.plot(
+        plot_data.panel(
+            *layers,
+            ylabel="Energy(keV)",
+            ylim=(erange[0], erange[1]),
+            xaxis="timestamp",
+        ),
+        figsize=figsize,
+        fontsize=fontsize,
     )
-    plt.ylabel("Energy(keV)")
-    plt.ylim([erange[0], erange[1]])
-
-    plt.xticks(
-        ticks,
-        [datetime.utcfromtimestamp(tick).strftime("%H:%M") for tick in ticks],
-    )
-    plt.close()
-    return fig
 
 
 def plot_pulser_timemap(
@@ -94,9 +84,6 @@ def plot_pulser_timemap(
     time_dx=180,
     n_spread=3,
 ):
-    plt.rcParams["figure.figsize"] = figsize
-    plt.rcParams["font.size"] = fontsize
-
     time_bins = np.arange(
         (np.amin(data["timestamp"]) // time_dx) * time_dx,
         ((np.amax(data["timestamp"]) // time_dx) + 2) * time_dx,
@@ -104,36 +91,31 @@ def plot_pulser_timemap(
     )
 
     selection = data.query(pulser_field)
-    fig = plt.figure()
-    if len(selection) == 0:
-        pass
-
-    else:
+    layers = []
+    ylim = None
+    if len(selection) > 0:
         mean = np.nanpercentile(selection[cal_energy_param], 50)
         spread = mean - np.nanpercentile(selection[cal_energy_param], 10)
 
-        plt.hist2d(
-            selection["timestamp"],
-            selection[cal_energy_param],
-            bins=[
-                time_bins,
-                np.arange(mean - n_spread * spread, mean + n_spread * spread + dx, dx),
-            ],
-            norm=LogNorm(),
+        layers.append(
+            plot_data.hist2d(
+                selection["timestamp"],
+                selection[cal_energy_param],
+                bins=[
+                    time_bins,
+                    np.arange(
+                        mean - n_spread * spread, mean + n_spread * spread + dx, dx
+                    ),
+                ],
+            )
         )
-        plt.ylim([mean - n_spread * spread, mean + n_spread * spread])
-    ticks, labels = plt.xticks()
-    plt.xlabel(
-        f"Time starting : {datetime.utcfromtimestamp(ticks[0]).strftime('%d/%m/%y %H:%M')}"
-    )
-    plt.ylabel("Energy(keV)")
+        ylim = (mean - n_spread * spread, mean + n_spread * spread)
 
-    plt.xticks(
-        ticks,
-        [datetime.utcfromtimestamp(tick).strftime("%H:%M") for tick in ticks],
+    return plot_data.plot(
+        plot_data.panel(*layers, ylabel="Energy(keV)", ylim=ylim, xaxis="timestamp"),
+        figsize=figsize,
+        fontsize=fontsize,
     )
-    plt.close()
-    return fig
 
 
 def get_median(x):
@@ -280,9 +262,6 @@ def plot_baseline_timemap(
     n_spread=5,
     time_dx=180,
 ):
-    plt.rcParams["figure.figsize"] = figsize
-    plt.rcParams["font.size"] = fontsize
-
     time_bins = np.arange(
         (np.amin(data["timestamp"]) // time_dx) * time_dx,
         ((np.amax(data["timestamp"]) // time_dx) + 2) * time_dx,
@@ -291,30 +270,25 @@ def plot_baseline_timemap(
 
     mean = np.nanpercentile(data[parameter], 50)
     spread = mean - np.nanpercentile(data[parameter], 10)
-    fig = plt.figure()
-    plt.hist2d(
-        data["timestamp"],
-        data[parameter],
-        bins=[
-            time_bins,
-            np.arange(mean - n_spread * spread, mean + n_spread * spread + dx, dx),
-        ],
-        norm=LogNorm(),
-    )
-
-    ticks, labels = plt.xticks()
-    plt.xlabel(
-        f"Time starting : {datetime.utcfromtimestamp(ticks[0]).strftime('%d/%m/%y %H:%M')}"
-    )
-    plt.ylabel("Baseline Value")
-    plt.ylim([mean - n_spread * spread, mean + n_spread * spread])
-
-    plt.xticks(
-        ticks,
-        [datetime.utcfromtimestamp(tick).strftime("%H:%M") for tick in ticks],
+    return plot_data.plot(
+        plot_data.panel(
+            plot_data.hist2d(
+                data["timestamp"],
+                data[parameter],
+                bins=[
+                    time_bins,
+                    np.arange(
+                        mean - n_spread * spread, mean + n_spread * spread + dx, dx
+                    ),
+                ],
+            ),
+            ylabel="Baseline Value",
+            ylim=(mean - n_spread * spread, mean + n_spread * spread),
+            xaxis="timestamp",
+        ),
+        figsize=figsize,
+        fontsize=fontsize,
     )
-    plt.close()
-    return fig
 
 
 def bin_bl_stability(data, time_slice=180, parameter="bl_mean"):
@@ -18,8 +18,9 @@ from pygama.math.distributions import nb_poly
 from pygama.pargen.energy_cal import FWHMLinear, FWHMQuadratic, HPGeCalibration
 from pygama.pargen.utils import load_data
 
+from .....FileKey import ChannelProcKey, ProcessingFileKey
+from .....grouping import group_by_run
 from .....log import build_log
-from ....FileKey import ChannelProcKey, ProcessingFileKey
 from ....pulser_removal import get_pulser_mask
 from ....table_name import get_table_name
 
@@ -27,24 +28,6 @@ warnings.filterwarnings(action="ignore", category=RuntimeWarning)
 warnings.filterwarnings(action="ignore", category=np.RankWarning)
 
 
-def run_splitter(files):
-    """
-    Returns list containing lists of each run
-    """
-
-    runs = []
-    run_files = []
-    for file in files:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(file).name)
-        if f"{fk.period}-{fk.run}" not in runs:
-            runs.append(f"{fk.period}-{fk.run}")
-            run_files.append([])
-        for i, run in enumerate(runs):
-            if run == f"{fk.period}-{fk.run}":
-                run_files[i].append(file)
-    return run_files
-
-
 def update_cal_dicts(cal_dicts, update_dict):
     if re.match(r"(\d{8})T(\d{6})Z", next(iter(cal_dicts))):
         for tstamp in cal_dicts:
@@ -503,11 +486,10 @@ if __name__ == "__main__":
     )  # need this as sometimes files get double counted as it somehow puts in the p%-* filelist and individual runs also
 
     final_dict = {}
-    all_file = run_splitter(sorted(files))
-    for filelist in all_file:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(sorted(filelist)[0]).name)
+    for filelist in group_by_run(files).values():
+        fk = ProcessingFileKey.get_filekey_from_pattern(Path(filelist[0]).name)
         timestamp = fk.timestamp
-        final_dict[timestamp] = sorted(filelist)
+        final_dict[timestamp] = filelist
 
     channel_dict = config_dict["inputs"]["pars_pht_partcal_config"][args.channel]
     kwarg_dict = Props.read_from(channel_dict)
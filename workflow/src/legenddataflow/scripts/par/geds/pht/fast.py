@@ -16,8 +16,9 @@ from workflow.src.legenddataflow.scripts.par.geds.pht.aoe import run_aoe_calibra
 from workflow.src.legenddataflow.scripts.par.geds.pht.lq import run_lq_calibration
 from workflow.src.legenddataflow.scripts.par.geds.pht.partcal import calibrate_partition
 
+from .....FileKey import ChannelProcKey, ProcessingFileKey
+from .....grouping import group_by_run
 from .....log import build_log
-from ....FileKey import ChannelProcKey, ProcessingFileKey
 from ....pulser_removal import get_pulser_mask
 from ....table_name import get_table_name
 
@@ -25,24 +26,6 @@ warnings.filterwarnings(action="ignore", category=RuntimeWarning)
 warnings.filterwarnings(action="ignore", category=np.RankWarning)
 
 
-def run_splitter(files):
-    """
-    Returns list containing lists of each run
-    """
-
-    runs = []
-    run_files = []
-    for file in files:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(file).name)
-        if f"{fk.period}-{fk.run}" not in runs:
-            runs.append(f"{fk.period}-{fk.run}")
-            run_files.append([])
-        for i, run in enumerate(runs):
-            if run == f"{fk.period}-{fk.run}":
-                run_files[i].append(file)
-    return run_files
-
-
 def par_geds_pht_fast() -> None:
     argparser = argparse.ArgumentParser()
     argparser.add_argument(
@@ -126,11 +109,10 @@ def par_geds_pht_fast() -> None:
     )  # need this as sometimes files get double counted as it somehow puts in the p%-* filelist and individual runs also
 
     final_dict = {}
-    all_file = run_splitter(sorted(files))
-    for filelist in all_file:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(sorted(filelist)[0]).name)
+    for filelist in group_by_run(files).values():
+        fk = ProcessingFileKey.get_filekey_from_pattern(Path(filelist[0]).name)
         timestamp = fk.timestamp
-        final_dict[timestamp] = sorted(filelist)
+        final_dict[timestamp] = filelist
 
     kwarg_dict = Props.read_from(
         config_dict["pars_pht_partcal"]["inputs"]["pars_pht_partcal_config"][
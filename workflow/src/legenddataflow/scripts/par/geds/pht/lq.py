@@ -18,32 +18,15 @@ from pygama.pargen.lq_cal import *  # noqa: F403
 from pygama.pargen.lq_cal import LQCal
 from pygama.pargen.utils import load_data
 
+from .....FileKey import ChannelProcKey, ProcessingFileKey
+from .....grouping import group_by_run
 from .....log import build_log
-from ....FileKey import ChannelProcKey, ProcessingFileKey
 from ....pulser_removal import get_pulser_mask
 from ....table_name import get_table_name
 
 warnings.filterwarnings(action="ignore", category=RuntimeWarning)
 
 
-def run_splitter(files):
-    """
-    Returns list containing lists of each run
-    """
-
-    runs = []
-    run_files = []
-    for file in files:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(file).name)
-        if f"{fk.period}-{fk.run}" not in runs:
-            runs.append(f"{fk.period}-{fk.run}")
-            run_files.append([])
-        for i, run in enumerate(runs):
-            if run == f"{fk.period}-{fk.run}":
-                run_files[i].append(file)
-    return run_files
-
-
 def get_results_dict(lq_class):
     return {
         "cal_energy_param": lq_class.cal_energy_param,
@@ -326,11 +309,10 @@ if __name__ == "__main__":
     )  # need this as sometimes files get double counted as it somehow puts in the p%-* filelist and individual runs also
 
     final_dict = {}
-    all_file = run_splitter(sorted(files))
-    for filelist in all_file:
-        fk = ProcessingFileKey.get_filekey_from_pattern(Path(sorted(filelist)[0]).name)
+    for filelist in group_by_run(files).values():
+        fk = ProcessingFileKey.get_filekey_from_pattern(Path(filelist[0]).name)
         timestamp = fk.timestamp
-        final_dict[timestamp] = sorted(filelist)
+        final_dict[timestamp] = filelist
 
     # run lq cal
     if kwarg_dict.pop("run_lq") is True:
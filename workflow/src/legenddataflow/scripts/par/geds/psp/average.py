@@ -1,18 +1,14 @@
 import argparse
 import pickle as pkl
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
-import matplotlib as mpl
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
 from dbetto.catalog import Props, TextDB
 
+from .... import plot_data
 from ....FileKey import ChannelProcKey
 
-mpl.use("Agg")
-
 
 def par_geds_psp_average() -> None:
     argparser = argparse.ArgumentParser()
@@ -105,21 +101,22 @@ def par_geds_psp_average() -> None:
                 else:
                     val = val[key]
 
-        fig = plt.figure()
-        plt.scatter(
-            [datetime.strptime(tstamp, "%Y%m%dT%H%M%SZ") for tstamp in in_dicts], vals
+        times = [
+            datetime.strptime(tstamp, "%Y%m%dT%H%M%SZ")
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+            for tstamp in in_dicts
+        ]
+        plot_dict[field] = plot_data.plot(
+            plot_data.panel(
+                plot_data.scatter(times, vals),
+                plot_data.hline(mean_val, color="r", linestyle="-"),
+                xlabel="time",
+                ylabel=f"value {unit}" if unit is not None else "value",
+                title=field,
+                xaxis="date",
+            )
         )
-        plt.axhline(y=mean_val, color="r", linestyle="-")
-        plt.xlabel("time")
-        if unit is not None:
-            plt.ylabel(f"value {unit}")
-        else:
-            plt.ylabel("value")
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%d/%m/%y"))
-        plt.gcf().autofmt_xdate()
-        plt.title(field)
-        plot_dict[field] = fig
-        plt.close()
 
     for file in args.output:
         tstamp = ChannelProcKey.get_filekey_from_pattern(Path(file).name).timestamp
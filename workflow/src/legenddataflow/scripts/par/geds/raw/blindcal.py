@@ -9,17 +9,14 @@ import logging
 import pickle as pkl
 from pathlib import Path
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy as np
 from dbetto.catalog import Props
 from lgdo import lh5
 from pygama.pargen.energy_cal import HPGeCalibration
 
+from ..... import plot_data
 from ....table_name import get_table_name
 
-mpl.use("agg")
-
 
 def par_geds_raw_blindcal() -> None:
     argparser = argparse.ArgumentParser()
@@ -91,22 +88,23 @@ def par_geds_raw_blindcal() -> None:
     }
 
     # plot to check thagt the calibration is correct with zoom on 2.6 peak
-    fig = plt.figure(figsize=(8, 10))
-    ax = plt.subplot(211)
-    ax.hist(E_uncal * roughpars[0], bins=np.arange(0, 3000, 1), histtype="step")
-    ax.set_ylabel("counts")
-    ax.set_yscale("log")
-    ax2 = plt.subplot(212)
-    ax2.hist(
-        E_uncal * roughpars[0],
-        bins=np.arange(2600, 2630, 1 * roughpars[0]),
-        histtype="step",
+    fig = plot_data.plot(
+        plot_data.panel(
+            plot_data.hist(E_uncal * roughpars[0], bins=np.arange(0, 3000, 1)),
+            ylabel="counts",
+            yscale="log",
+        ),
+        plot_data.panel(
+            plot_data.hist(
+                E_uncal * roughpars[0], bins=np.arange(2600, 2630, 1 * roughpars[0])
+            ),
+            xlabel="energy (keV)",
+            ylabel="counts",
+        ),
+        title=args.channel,
+        figsize=(8, 10),
     )
-    ax2.set_xlabel("energy (keV)")
-    ax2.set_ylabel("counts")
-    plt.suptitle(args.channel)
     with Path(args.plot_file).open("wb") as w:
         pkl.dump(fig, w, protocol=pkl.HIGHEST_PROTOCOL)
-    plt.close()
 
     Props.write_to_file(args.blind_curve, out_dict)
@@ -10,8 +10,6 @@ import argparse
 import pickle as pkl
 from pathlib import Path
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numexpr as ne
 import numpy as np
 from dbetto import TextDB
@@ -21,11 +19,10 @@ from lgdo import lh5
 from pygama.math.histogram import get_hist
 from pygama.pargen.energy_cal import get_i_local_maxima
 
+from ..... import plot_data
 from .....log import build_log
 from ....table_name import get_table_name
 
-mpl.use("Agg")
-
 
 def par_geds_raw_blindcheck() -> None:
     argparser = argparse.ArgumentParser()
@@ -76,23 +73,27 @@ def par_geds_raw_blindcheck() -> None:
     log.info(f"peaks found at : {maxs}")
 
     # plot the energy spectrum to check calibration
-    fig = plt.figure(figsize=(8, 10))
-    ax = plt.subplot(211)
-    ax.hist(daqenergy_cal, bins=np.arange(0, 3000, 1), histtype="step")
-    ax.set_ylabel("counts")
-    ax.set_yscale("log")
-    ax2 = plt.subplot(212)
-    ax2.hist(
-        daqenergy_cal,
-        bins=np.arange(2600, 2630, 1 * blind_curve["daqenergy_cal"]["parameters"]["a"]),
-        histtype="step",
+    fig = plot_data.plot(
+        plot_data.panel(
+            plot_data.hist(daqenergy_cal, bins=np.arange(0, 3000, 1)),
+            ylabel="counts",
+            yscale="log",
+        ),
+        plot_data.panel(
+            plot_data.hist(
+                daqenergy_cal,
+                bins=np.arange(
+                    2600, 2630, 1 * blind_curve["daqenergy_cal"]["parameters"]["a"]
+                ),
+            ),
+            xlabel="energy (keV)",
+            ylabel="counts",
+        ),
+        title=args.channel,
+        figsize=(8, 10),
     )
-    ax2.set_xlabel("energy (keV)")
-    ax2.set_ylabel("counts")
-    plt.suptitle(args.channel)
     with Path(args.plot_file).open("wb") as w:
         pkl.dump(fig, w, protocol=pkl.HIGHEST_PROTOCOL)
-    plt.close()
 
     # check for peaks within +- 5keV of  2614 and 583 to ensure blinding still
     # valid and if so create file else raise error.  if detector is in ac mode it
@@ -0,0 +1,39 @@
+import argparse
+from collections.abc import Mapping
+from pathlib import Path
+
+from ..object_store import open_objects
+from ..plot_data import is_plot_data, render_all
+
+
+def _figures(obj, path):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from _figures(value, [*path, str(key)])
+    elif hasattr(obj, "savefig"):
+        yield "/".join(path), obj
+
+
+def render_plots() -> None:
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("input", help="plot file, merged or of a single channel")
+    argparser.add_argument("output", help="output pdf file")
+    argparser.add_argument(
+        "--channel", help="channels to render, all if not given", nargs="*"
+    )
+    args = argparser.parse_args()
+
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open_objects(args.input) as plots, PdfPages(args.output) as pdf:
+        channels = (
+            {Path(args.input).stem: plots}
+            if not isinstance(plots, Mapping) or is_plot_data(plots)
+            else plots
+        )
+        for key in args.channel or list(channels):
+            # the plots of each channel are only rendered when it is reached
+            for name, fig in _figures(render_all(channels[key]), [key]):
+                fig.text(0.01, 0.01, name, fontsize="small")
+                pdf.savefig(fig)
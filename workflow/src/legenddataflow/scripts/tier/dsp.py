@@ -7,8 +7,14 @@ from dbetto import TextDB
 from dbetto.catalog import Props
 from dspeed import build_dsp
 from legendmeta import LegendMetadata
-from lgdo import lh5
 
+from ...blinding import BlindingIndex
+from ...lh5_utils import (
+    get_lh5_inventory,
+    merge_lh5_files,
+    run_groups_to_parts,
+    split_groups,
+)
 from ...log import build_log
 
 
@@ -23,6 +29,38 @@ def _replace_list_with_array(dic):
     return dic
 
 
+def _build_dsp_tables(tables, output_file, input_file, chan_config, **kwargs):
+    """Runs build_dsp on the raw `tables` of `input_file`"""
+    build_dsp(
+        input_file,
+        output_file,
+        {},
+        lh5_tables=tables,
+        chan_config={table: chan_config[table] for table in tables},
+        write_mode="r",
+        **kwargs,
+    )
+
+
+def _run_build_dsp(input_file, output_file, chan_config, n_workers, **kwargs):
+    """
+    Runs build_dsp on the channels of `chan_config`, with `n_workers` processes
+    each processing a group of channels into a file merged into the output
+    """
+    tables = list(chan_config)
+    if n_workers > 1 and len(tables) > 1:
+        run_groups_to_parts(
+            _build_dsp_tables,
+            split_groups(tables, n_workers),
+            output_file,
+            input_file=input_file,
+            chan_config=chan_config,
+            **kwargs,
+        )
+    else:
+        _build_dsp_tables(tables, output_file, input_file, chan_config, **kwargs)
+
+
 def build_tier_dsp() -> None:
     # CLI config
     argparser = argparse.ArgumentParser()
@@ -43,6 +81,15 @@ def build_tier_dsp() -> None:
 
     argparser.add_argument("--output", help="output file")
     argparser.add_argument("--db-file", help="database file")
+    argparser.add_argument(
+        "--workers",
+        help="number of processes to run the channels in",
+        type=int,
+        default=1,
+    )
+    argparser.add_argument(
+        "--blind-index", help="blinding index of the raw file", default=None
+    )
     args = argparser.parse_args()
 
     df_configs = TextDB(args.configs, lazy=True)
@@ -76,6 +123,7 @@ def build_tier_dsp() -> None:
         }
 
     # now construct the dictionary of DSP configs for build_dsp()
+    input_inventory = get_lh5_inventory(args.input)
     dsp_cfg_tbl_dict = {}
     for chan, file in chan_cfg_map.items():
         if chan_map[chan].analysis.processable is False:
@@ -86,7 +134,7 @@ def build_tier_dsp() -> None:
         input_tbl_name = f"ch{chan_map[chan].daq.rawid:07}/{tbl}"
 
         # check if the raw tables are all existing
-        if len(lh5.ls(args.input, input_tbl_name)) > 0:
+        if len(input_inventory.ls(input_tbl_name)) > 0:
             dsp_cfg_tbl_dict[input_tbl_name] = Props.read_from(file)
         else:
             msg = f"table {input_tbl_name} not found in {args.input} skipping"
@@ -109,27 +157,65 @@ def build_tier_dsp() -> None:
 
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
 
-    build_dsp(
-        args.input,
-        args.output,
-        {},
-        database=database_dict,
-        chan_config=dsp_cfg_tbl_dict,
-        write_mode="r",
-        buffer_len=settings_dict.get("buffer_len", 1000),
-        block_width=settings_dict.get("block_width", 16),
-    )
+    dsp_kwargs = {
+        "database": database_dict,
+        "buffer_len": settings_dict.get("buffer_len", 1000),
+        "block_width": settings_dict.get("block_width", 16),
+    }
+    if args.workers > 1 and len(dsp_cfg_tbl_dict) > 1:
+        msg = f"running build_dsp on {args.workers} workers"
+        log.info(msg)
+
+    if args.blind_index is None:
+        _run_build_dsp(
+            args.input, args.output, dsp_cfg_tbl_dict, args.workers, **dsp_kwargs
+        )
+    else:
+        # the rows hidden by the blinding are skipped for the blinded channels
+        blind_index = BlindingIndex.read_from(args.blind_index)
+        parts = {
+            f"{args.output}.blinded": (
+                {
+                    tbl: cfg
+                    for tbl, cfg in dsp_cfg_tbl_dict.items()
+                    if blind_index.hides(tbl)
+                },
+                {"entry_list": [blind_index.entry_list()]},
+            ),
+            f"{args.output}.unblinded": (
+                {
+                    tbl: cfg
+                    for tbl, cfg in dsp_cfg_tbl_dict.items()
+                    if not blind_index.hides(tbl)
+                },
+                {},
+            ),
+        }
+        parts = {part: val for part, val in parts.items() if len(val[0]) > 0}
+        try:
+            for part, (chan_config, kwargs) in parts.items():
+                _run_build_dsp(
+                    args.input,
+                    part,
+                    chan_config,
+                    args.workers,
+                    **dsp_kwargs,
+                    **kwargs,
+                )
+            merge_lh5_files(list(parts), args.output)
+        finally:
+            for part in parts:
+                Path(part).unlink(missing_ok=True)
 
     key = Path(args.output).name.replace(f"-tier_{args.tier}.lh5", "")
 
     if args.tier in ["dsp", "psp"]:
         raw_channels = [
-            channel for channel in lh5.ls(args.input) if re.match("(ch\\d{7})", channel)
-        ]
-        raw_fields = [
-            field.split("/")[-1]
-            for field in lh5.ls(args.input, f"{raw_channels[0]}/raw/")
+            channel
+            for channel in input_inventory.ls()
+            if re.match("(ch\\d{7})", channel)
         ]
+        raw_fields = input_inventory.fields(f"{raw_channels[0]}/raw")
 
         outputs = {}
         channels = []
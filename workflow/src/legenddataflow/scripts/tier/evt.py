@@ -6,14 +6,141 @@ import lgdo.lh5 as lh5
 import numpy as np
 from dbetto import AttrsDict, Props, TextDB
 from legendmeta import LegendMetadata
-from lgdo.types import Array
+from lgdo.types import Array, Table
 from pygama.evt import build_evt
+from pygama.evt import utils as evt_utils
 
+from ...coincidence import coincidence_mask
+from ...column_cache import ColumnCache
+from ...lh5_utils import get_lh5_inventory
 from ...log import build_log
 
 sto = lh5.LH5Store()
 
 
+def _get_muon_flag(trigger_timestamp, muon_table, field_config):
+    if muon_table is None:
+        return np.zeros(len(trigger_timestamp), dtype=bool)
+    muon_timestamp = muon_table[field_config["muon_timestamp"]["field"]].nda
+    muon_tbl_flag = muon_table[field_config["muon_flag"]["field"]].nda
+    # same range of delays as previously scanned in steps of the jitter
+    jitter = field_config["jitter"]
+    return coincidence_mask(
+        trigger_timestamp,
+        muon_timestamp[muon_tbl_flag],
+        max_delay=(int(1e9 * jitter) - 1) * jitter,
+    )
+
+
+def write_evt(
+    file_table: dict,
+    evt_config: dict,
+    output: str,
+    muon_config: dict | None = None,
+    field_config: dict | None = None,
+    buffer_len: int | None = None,
+) -> None:
+    """
+    Builds the evt table and writes it to `output`.
+
+    If `buffer_len` is None the whole table is built in memory, sharing the
+    hit and dsp columns with the muon config, and written once. Otherwise the
+    TCM is walked in blocks of `buffer_len` events and each block is appended
+    to `output` as soon as it is built, so the memory used is set by
+    `buffer_len` rather than by the size of the file.
+
+    Parameters
+    ----------
+    file_table
+        Input files for `pygama.evt.build_evt`
+    evt_config
+        Evt config with the channel lists filled in
+    output
+        Output file
+    muon_config
+        Evt config evaluated on the muon TCM, used to flag events in
+        coincidence with a muon
+    field_config
+        Fields used and written by the muon flag
+    buffer_len
+        Number of events built at once, not supported if an operation of
+        `evt_config` uses a ``first_at`` or ``last_at`` aggregation as these
+        give different results when evaluated blockwise by
+        `pygama.evt.build_evt`
+    """
+    if buffer_len is not None:
+        sorted_ops = [
+            name
+            for name, op in evt_config["operations"].items()
+            if op.get("aggregation_mode", "").startswith(("first_at:", "last_at:"))
+        ]
+        if len(sorted_ops) > 0:
+            msg = (
+                f"buffer_len is not supported with first_at/last_at aggregations, "
+                f"used by {sorted_ops}"
+            )
+            raise ValueError(msg)
+
+    muon_file_table = None
+    tcm_file = file_table["tcm"][0]
+    if muon_config is not None and "hardware_tcm_2" in get_lh5_inventory(tcm_file).ls():
+        muon_file_table = {
+            "tcm": (tcm_file, "hardware_tcm_2", "ch{}"),
+            "dsp": file_table["dsp"],
+            "hit": file_table["hit"],
+            "evt": (None, "evt"),
+        }
+
+    if buffer_len is None:
+        # hit and dsp columns are read once and shared by the evt and muon configs
+        muon_table = None
+        with ColumnCache(evt_utils.lh5).patch():
+            table = build_evt(file_table, evt_config)
+            if muon_file_table is not None:
+                muon_table = build_evt(muon_file_table, muon_config)
+
+        if muon_config is not None:
+            trigger_timestamp = table[field_config["ged_timestamp"]["table"]][
+                field_config["ged_timestamp"]["field"]
+            ].nda
+            table[field_config["output_field"]["table"]].add_column(
+                field_config["output_field"]["field"],
+                Array(_get_muon_flag(trigger_timestamp, muon_table, field_config)),
+            )
+
+        sto.write(obj=table, name="evt", lh5_file=output, wo_mode="a")
+        return
+
+    # the muon events are a small subset of the file and are kept in memory
+    muon_table = None
+    if muon_file_table is not None:
+        muon_table = build_evt(muon_file_table, muon_config)
+
+    build_evt(
+        {**file_table, "evt": (output, "evt")},
+        evt_config,
+        wo_mode="a",
+        buffer_len=buffer_len,
+    )
+
+    if muon_config is not None:
+        trigger_timestamp = lh5.read_as(
+            f"evt/{field_config['ged_timestamp']['table']}/"
+            f"{field_config['ged_timestamp']['field']}",
+            output,
+            "np",
+        )
+        muon_flag = _get_muon_flag(trigger_timestamp, muon_table, field_config)
+        sto.write(
+            obj=Table(
+                col_dict={field_config["output_field"]["field"]: Array(muon_flag)}
+            ),
+            name=f"evt/{field_config['output_field']['table']}",
+            lh5_file=output,
+            wo_mode="append_column",
+        )
+
+
 def build_tier_evt() -> None:
     argparser = argparse.ArgumentParser()
     argparser.add_argument("--hit-file")
@@ -32,6 +159,7 @@ def build_tier_evt() -> None:
     argparser.add_argument("--log")
 
     argparser.add_argument("--output")
+    argparser.add_argument("--buffer-len", type=int, default=None)
     args = argparser.parse_args()
 
     if args.tier not in ("evt", "pet"):
@@ -106,11 +234,8 @@ def build_tier_evt() -> None:
     if len(args.ann_file) > 0:
         file_table["ann"] = (args.ann_file, "dsp", "ch{}")
 
-    table = build_evt(
-        file_table,
-        evt_config,
-    )
-
+    muon_config = None
+    field_config = None
     if (
         "muon_config" in df_config.inputs
         and df_config.inputs["muon_config"] is not None
@@ -133,51 +258,11 @@ def build_tier_evt() -> None:
                     chans = []
                 muon_config["channels"][field] = chans
 
-        trigger_timestamp = table[field_config["ged_timestamp"]["table"]][
-            field_config["ged_timestamp"]["field"]
-        ].nda
-        if "hardware_tcm_2" in lh5.ls(args.tcm_file):
-            muon_table = build_evt(
-                {
-                    "tcm": (args.tcm_file, "hardware_tcm_2", "ch{}"),
-                    "dsp": (args.dsp_file, "dsp", "ch{}"),
-                    "hit": (args.hit_file, "hit", "ch{}"),
-                    "evt": (None, "evt"),
-                },
-                muon_config,
-            )
-
-            muon_timestamp = muon_table[field_config["muon_timestamp"]["field"]].nda
-            muon_tbl_flag = muon_table[field_config["muon_flag"]["field"]].nda
-            if len(muon_timestamp[muon_tbl_flag]) > 0:
-                is_muon_veto_triggered = _find_matching_values_with_delay(
-                    trigger_timestamp,
-                    muon_timestamp[muon_tbl_flag],
-                    field_config["jitter"],
-                )
-                muon_flag = np.isin(trigger_timestamp, is_muon_veto_triggered)
-            else:
-                muon_flag = np.zeros(len(trigger_timestamp), dtype=bool)
-        else:
-            muon_flag = np.zeros(len(trigger_timestamp), dtype=bool)
-        table[field_config["output_field"]["table"]].add_column(
-            field_config["output_field"]["field"], Array(muon_flag)
-        )
-
-    sto.write(obj=table, name="evt", lh5_file=args.output, wo_mode="a")
-
-
-def _find_matching_values_with_delay(arr1, arr2, jit_delay):
-    matching_values = []
-
-    # Create an array with all possible delay values
-    delays = np.arange(0, int(1e9 * jit_delay)) * jit_delay
-
-    for delay in delays:
-        arr2_delayed = arr2 + delay
-
-        # Find matching values and indices
-        mask = np.isin(arr1, arr2_delayed, assume_unique=True)
-        matching_values.extend(arr1[mask])
-
-    return np.unique(matching_values)
+    write_evt(
+        file_table,
+        evt_config,
+        args.output,
+        muon_config=muon_config,
+        field_config=field_config,
+        buffer_len=args.buffer_len,
+    )
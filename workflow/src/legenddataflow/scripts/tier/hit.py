@@ -3,9 +3,9 @@ from pathlib import Path
 
 from dbetto.catalog import Props
 from legendmeta import LegendMetadata, TextDB
-from lgdo import lh5
 from pygama.hit.build_hit import build_hit
 
+from ...lh5_utils import get_lh5_inventory
 from ...log import build_log
 
 
@@ -61,6 +61,7 @@ def build_tier_hit() -> None:
 
     # now construct the dictionary of hit configs for build_hit()
     channel_dict = {}
+    input_inventory = get_lh5_inventory(args.input)
     pars_dict = {ch: chd["pars"] for ch, chd in Props.read_from(args.pars_file).items()}
     for chan, file in chan_cfg_map.items():
         if chan_map[chan].analysis.processable is False:
@@ -75,7 +76,7 @@ def build_tier_hit() -> None:
         input_tbl_name = f"ch{chan_map[chan].daq.rawid}/dsp"
 
         # check if the raw tables are all existing
-        if len(lh5.ls(args.input, input_tbl_name)) > 0:
+        if len(input_inventory.ls(input_tbl_name)) > 0:
             channel_dict[input_tbl_name] = hit_cfg
         else:
             msg = f"table {input_tbl_name} not found in {args.input} skipping"
@@ -5,6 +5,10 @@ channels in a raw file, removing those events that fall within the ROI for Ge de
 that have a daqenergy calibration curve and are not anti-coincidence only (AC). It removes
 the whole event from all of the Ge and SiPM channels.
 
+With ``--mode index`` no copy is written, the output only holds the indices of the
+events to remove (see `legenddataflow.blinding.BlindingIndex`) and the tcm and dsp
+tiers skip these events when reading the raw file.
+
 In the Snakemake dataflow, this script only runs if the checkfile is found on disk,
 but this is controlled by the Snakemake flow (presumably an error is thrown if the file
 is not found). This script itself does not check for the existence of such a file.
@@ -13,15 +17,41 @@ is not found). This script itself does not check for the existence of such a fil
 import argparse
 from pathlib import Path
 
-import numexpr as ne
 import numpy as np
+from dbetto import TextDB
 from dbetto.catalog import Props
-from legendmeta import LegendMetadata, TextDB
+from legendmeta import LegendMetadata
 from lgdo import lh5
 
+from ...blinding import BlindingIndex, get_blinding_mask, load_blind_curves
+from ...lh5_utils import (
+    copy_lh5_objects,
+    get_lh5_inventory,
+    run_groups_to_parts,
+    split_groups,
+)
 from ...log import build_log
 
 
+def _blind_channels(channels, output_file, input_file, tokeep, hdf_settings):
+    """Writes the rows `tokeep` of the raw tables of `channels` to `output_file`"""
+    for channel in channels:
+        # read in all of the data but only for the unblinded events
+        blinded_chobj = lh5.read(
+            channel + "/raw", input_file, idx=tokeep, decompress=False
+        )
+
+        # now write the blinded data for this channel
+        lh5.write(
+            blinded_chobj,
+            "raw",
+            output_file,
+            group=channel,
+            wo_mode="w",
+            **hdf_settings,
+        )
+
+
 def build_tier_raw_blind() -> None:
     argparser = argparse.ArgumentParser()
     argparser.add_argument("--input", help="input file", type=str)
@@ -35,6 +65,15 @@ def build_tier_raw_blind() -> None:
     argparser.add_argument("--chan-maps", help="chan map", type=str)
     argparser.add_argument("--metadata", help="metadata", type=str)
     argparser.add_argument("--log", help="log file", type=str)
+    argparser.add_argument(
+        "--workers", help="number of processes blinding channels", type=int, default=1
+    )
+    argparser.add_argument(
+        "--mode",
+        help="write a blinded copy of the raw file or only the index of the rows to hide",
+        choices=["copy", "index"],
+        default="copy",
+    )
     args = argparser.parse_args()
 
     configs = TextDB(args.configs, lazy=True)
@@ -51,7 +90,7 @@ def build_tier_raw_blind() -> None:
     width = blinding_settings["width_in_keV"]  # keV
 
     # list of all channels and objects in the raw file
-    all_channels = lh5.ls(args.input)
+    all_channels = get_lh5_inventory(args.input).ls()
 
     # list of Ge channels and SiPM channels with associated metadata
     legendmetadata = LegendMetadata(args.metadata, lazy=True)
@@ -69,47 +108,30 @@ def build_tier_raw_blind() -> None:
         + list(chans["puls"])
     )
 
-    store = lh5.LH5Store()
-
-    # rows that need blinding
-    toblind = np.array([])
-
-    # first, loop through the Ge detector channels, calibrate them and look for events that should be blinded
-    for chnum in chans["geds"]:
-        # skip Ge detectors that are anti-coincidence only or not able to be blinded for some other reason
-        if chans["geds"][chnum]["analysis"]["is_blinded"] is False:
-            continue
-
-        # load in just the daqenergy for now
-        daqenergy, _ = store.read(f"ch{chnum}/raw/daqenergy", args.input)
-
-        # read in calibration curve for this channel
-        blind_curve = Props.read_from(args.blind_curve)[chmap.map("daq.rawid").name][
-            "pars"
-        ]["operations"]
-
-        # calibrate daq energy using pre existing curve
-        daqenergy_cal = ne.evaluate(
-            blind_curve["daqenergy_cal"]["expression"],
-            local_dict=dict(
-                daqenergy=daqenergy, **blind_curve["daqenergy_cal"]["parameters"]
-            ),
-        )
-
-        # figure out which event indices should be blinded
-        toblind = np.append(
-            toblind,
-            np.nonzero(np.abs(np.asarray(daqenergy_cal) - centroid) <= width)[0],
-        )
+    # Ge detectors which are not anti-coincidence only or not able to be blinded for some other reason
+    blinded_geds = {
+        chnum: chans["geds"][chnum]["name"]
+        for chnum in chans["geds"]
+        if chans["geds"][chnum]["analysis"]["is_blinded"] is not False
+    }
 
-    # remove duplicates
-    toblind = np.unique(toblind)
+    # calibrate the daqenergy of the Ge detectors and flag the events to blind
+    toblind = get_blinding_mask(
+        args.input,
+        blinded_geds,
+        load_blind_curves(args.blind_curve),
+        centroid,
+        width,
+    )
 
-    # total number of events (from last Ge channel loaded, should be same for all Ge channels)
-    allind = np.arange(len(daqenergy))
+    if args.mode == "index":
+        # only the rows to hide are written, the raw file is then read through the index
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        BlindingIndex.from_mask(toblind, main_channels).write_to(args.output)
+        return
 
     # gets events that should not be blinded
-    tokeep = allind[np.logical_not(np.isin(allind, toblind))]
+    tokeep = np.flatnonzero(~toblind)
 
     # make some temp file to write the output to before renaming it
     rng = np.random.default_rng()
@@ -117,50 +139,39 @@ def build_tier_raw_blind() -> None:
     temp_output = f"{args.output}.{rand_num}"
     Path(temp_output).parent.mkdir(parents=True, exist_ok=True)
 
+    # objects with nothing to blind are copied without being decoded
+    to_copy = []
+    to_blind = []
     for channel in all_channels:
         try:
             chnum = int(channel[2::])
         except ValueError:
             # if this isn't an interesting channel, just copy it to the output file
-            chobj, _ = store.read(channel, args.input, decompress=False)
-            store.write_object(
-                chobj,
-                channel,
-                lh5_file=temp_output,
-                wo_mode="w",
-                **hdf_settings,
-            )
+            to_copy.append(channel)
             continue
 
-        if chnum not in main_channels:
+        if chnum not in main_channels or not toblind.any():
             # if this is a PMT or not included for some reason, just copy it to the output file
-            chobj, _ = store.read(channel + "/raw", args.input, decompress=False)
-            store.write_object(
-                chobj,
-                group=channel,
-                name="raw",
-                lh5_file=temp_output,
-                wo_mode="w",
-                **hdf_settings,
-            )
-            continue
-
-        # the rest should be the Ge and SiPM channels that need to be blinded
-
-        # read in all of the data but only for the unblinded events
-        blinded_chobj, _ = store.read(
-            channel + "/raw", args.input, idx=tokeep, decompress=False
-        )
-
-        # now write the blinded data for this channel
-        store.write_object(
-            blinded_chobj,
-            group=channel,
-            name="raw",
-            lh5_file=temp_output,
-            wo_mode="w",
-            **hdf_settings,
+            to_copy.append(channel + "/raw")
+        else:
+            # the rest should be the Ge and SiPM channels that need to be blinded
+            to_blind.append(channel)
+
+    copy_lh5_objects(args.input, temp_output, to_copy, mode="w")
+
+    if args.workers > 1 and len(to_blind) > 1:
+        # each process blinds a group of channels, appended to the copied ones
+        run_groups_to_parts(
+            _blind_channels,
+            split_groups(to_blind, args.workers),
+            temp_output,
+            mode="a",
+            input_file=args.input,
+            tokeep=tokeep,
+            hdf_settings=hdf_settings,
         )
+    else:
+        _blind_channels(to_blind, temp_output, args.input, tokeep, hdf_settings)
 
     # rename the temp file
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
@@ -1,4 +1,5 @@
 import argparse
+import re
 
 import awkward as ak
 from dbetto import TextDB
@@ -6,6 +7,7 @@ from dbetto.catalog import Props
 from lgdo import lh5
 from lgdo.types import Array, Struct, Table, VectorOfVectors
 
+from ...lh5_utils import get_lh5_inventory
 from ...log import build_log
 
 
@@ -21,31 +23,50 @@ def get_all_out_fields(input_table, out_fields, current_field=""):
     return out_fields
 
 
-def build_tier_skm() -> None:
-    argparser = argparse.ArgumentParser()
-    argparser.add_argument("--evt-file", help="evt file", required=True)
-    argparser.add_argument("--configs", help="configs", required=True)
-    argparser.add_argument("--datatype", help="datatype", required=True)
-    argparser.add_argument("--timestamp", help="timestamp", required=True)
-    argparser.add_argument("--log", help="log file", default=None)
-    argparser.add_argument("--output", help="output file", required=True)
-    args = argparser.parse_args()
-
-    # load in config
-    config_dict = TextDB(args.configs, lazy=True).on(
-        args.timestamp, system=args.datatype
-    )["snakemake_rules"]["tier_skm"]
-
-    build_log(config_dict, args.log)
-
-    skm_config_file = config_dict["inputs"]["skm_config"]
-    evt_filter = Props.read_from(skm_config_file)["evt_filter"]
-    out_fields = Props.read_from(skm_config_file)["keep_fields"]
-
-    store = lh5.LH5Store()
-
-    evt = lh5.read_as("evt", args.evt_file, "ak")  # noqa: F841
-
+def get_filter_fields(evt_filter, lh5_file):
+    """
+    Returns the fields of the evt table referenced in `evt_filter`, as
+    ``.`` separated paths, or None if the filter uses the whole table
+    """
+    inventory = get_lh5_inventory(lh5_file)
+    fields = []
+    for match in re.finditer(
+        r"\bevt((?:\.[A-Za-z_]\w*|\[\s*[\"'][^\"']+[\"']\s*\])*)", evt_filter
+    ):
+        parts = [
+            attr or key
+            for attr, key in re.findall(
+                r"\.([A-Za-z_]\w*)|\[\s*[\"']([^\"']+)[\"']\s*\]", match.group(1)
+            )
+        ]
+        # drop trailing attributes which are not fields e.g. methods
+        while len(parts) > 0 and len(inventory.ls(f"evt/{'/'.join(parts)}")) == 0:
+            parts = parts[:-1]
+        if len(parts) == 0:
+            return None
+        fields.append(".".join(parts))
+    return fields
+
+
+def get_field_mask(fields):
+    """
+    Returns the field mask reading `fields`, fields contained in another one
+    are dropped
+    """
+    paths = sorted({field.replace(".", "/") for field in fields})
+    return [
+        path
+        for path in paths
+        if not any(path.startswith(f"{other}/") for other in paths if other != path)
+    ]
+
+
+def build_skm_table(evt, evt_filter, out_fields):  # noqa: ARG001
+    """
+    Applies `evt_filter` to the evt table `evt` (an awkward array) and keeps
+    only `out_fields`, fields which are tables in `out_fields` are replaced in
+    place by their columns
+    """
     # remove unwanted events
     skm = eval(f"evt[{evt_filter}]")
     # make it rectangular and make an LGDO Table
@@ -92,5 +113,63 @@ def build_tier_skm() -> None:
             if attr != "datatype":
                 ptr2.attrs[attr] = val
 
-    # write-append to disk
-    store.write(out_table_skm, "skm", args.output, wo_mode="w")
+    return out_table_skm
+
+
+def write_skm(evt_file, output, evt_filter, out_fields, buffer_len=100000):
+    """
+    Builds the skm table from `evt_file` and writes it to `output`. Only the
+    fields in `out_fields` and the ones referenced in `evt_filter` are read,
+    and the file is processed in chunks of `buffer_len` events, each chunk
+    being appended to the output once filtered.
+    """
+    filter_fields = get_filter_fields(evt_filter, evt_file)
+    field_mask = (
+        None if filter_fields is None else get_field_mask(out_fields + filter_fields)
+    )
+    out_fields = list(out_fields)
+
+    store = lh5.LH5Store()
+    n_rows = lh5.read_n_rows("evt", evt_file)
+    # an empty file still gives an (empty) output table
+    for start_row in range(0, max(n_rows, 1), buffer_len):
+        evt = lh5.read(
+            "evt",
+            evt_file,
+            start_row=start_row,
+            n_rows=buffer_len,
+            field_mask=field_mask,
+        ).view_as("ak")
+        out_table_skm = build_skm_table(evt, evt_filter, out_fields)
+
+        # write-append to disk
+        store.write(
+            out_table_skm, "skm", output, wo_mode="w" if start_row == 0 else "a"
+        )
+
+
+def build_tier_skm() -> None:
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--evt-file", help="evt file", required=True)
+    argparser.add_argument("--configs", help="configs", required=True)
+    argparser.add_argument("--datatype", help="datatype", required=True)
+    argparser.add_argument("--timestamp", help="timestamp", required=True)
+    argparser.add_argument("--log", help="log file", default=None)
+    argparser.add_argument("--output", help="output file", required=True)
+    argparser.add_argument(
+        "--buffer-len", help="number of events read at once", type=int, default=100000
+    )
+    args = argparser.parse_args()
+
+    # load in config
+    config_dict = TextDB(args.configs, lazy=True).on(
+        args.timestamp, system=args.datatype
+    )["snakemake_rules"]["tier_skm"]
+
+    build_log(config_dict, args.log)
+
+    skm_config_file = config_dict["inputs"]["skm_config"]
+    evt_filter = Props.read_from(skm_config_file)["evt_filter"]
+    out_fields = Props.read_from(skm_config_file)["keep_fields"]
+
+    write_skm(args.evt_file, args.output, evt_filter, out_fields, args.buffer_len)
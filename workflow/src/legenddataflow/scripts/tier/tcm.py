@@ -1,14 +1,16 @@
 import argparse
 from pathlib import Path
 
-import lgdo.lh5 as lh5
 import numpy as np
 from daq2lh5.orca import orca_flashcam
 from dbetto import TextDB
 from dbetto.catalog import Props
 from pygama.evt.build_tcm import build_tcm
 
+from ...blinding import BlindingIndex
+from ...lh5_utils import get_lh5_inventory
 from ...log import build_log
+from ...tcm_utils import build_hardware_tcms
 
 
 def build_tier_tcm() -> None:
@@ -19,6 +21,19 @@ def build_tier_tcm() -> None:
     argparser.add_argument("--timestamp", help="Timestamp", type=str, required=True)
     argparser.add_argument("--configs", help="config file", type=str)
     argparser.add_argument("--log", help="log file", type=str)
+    argparser.add_argument(
+        "--blind-index", help="blinding index of the raw file", type=str, default=None
+    )
+    argparser.add_argument(
+        "--mode",
+        help="build the tcm of each fcid in turn with pygama or all of them in memory "
+        "from a single read of the timestamps",
+        choices=["sequential", "parallel"],
+        default="sequential",
+    )
+    argparser.add_argument(
+        "--workers", help="number of threads in parallel mode", type=int, default=1
+    )
     args = argparser.parse_args()
 
     configs = TextDB(args.configs, lazy=True).on(args.timestamp, system=args.datatype)
@@ -33,7 +48,7 @@ def build_tier_tcm() -> None:
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
 
     # get the list of channels by fcid
-    ch_list = lh5.ls(args.input, "/ch*")
+    ch_list = get_lh5_inventory(args.input).ls("/ch*")
     fcid_channels = {}
     for ch in ch_list:
         key = int(ch[2:])
@@ -42,14 +57,48 @@ def build_tier_tcm() -> None:
             fcid_channels[fcid] = []
         fcid_channels[fcid].append(f"/{ch}/raw")
 
-    # make a hardware_tcm_[fcid] for each fcid
-    for fcid, fcid_dict in fcid_channels.items():
-        build_tcm(
-            [(args.input, fcid_dict)],
-            out_file=temp_output,
-            out_name=f"hardware_tcm_{fcid}",
-            wo_mode="o",
+    if args.mode == "parallel":
+        # the tcms are built in memory, the buffer length of pygama does not apply
+        settings.pop("buffer_len", None)
+        build_hardware_tcms(
+            args.input,
+            fcid_channels,
+            temp_output,
+            n_workers=args.workers,
+            blind_index=(
+                BlindingIndex.read_from(args.blind_index)
+                if args.blind_index is not None
+                else None
+            ),
             **settings,
         )
+        Path(temp_output).rename(args.output)
+        return
+
+    input_file = args.input
+    if args.blind_index is not None:
+        # the tcm is built from the coincidence fields of the rows not hidden by the blinding
+        input_file = f"{temp_output}.unblinded"
+        coin_cols = settings["coin_cols"]
+        BlindingIndex.read_from(args.blind_index).write_unblinded(
+            args.input,
+            input_file,
+            [table for tables in fcid_channels.values() for table in tables],
+            field_mask=[coin_cols] if isinstance(coin_cols, str) else list(coin_cols),
+        )
+
+    try:
+        # make a hardware_tcm_[fcid] for each fcid
+        for fcid, fcid_dict in fcid_channels.items():
+            build_tcm(
+                [(input_file, fcid_dict)],
+                out_file=temp_output,
+                out_name=f"hardware_tcm_{fcid}",
+                wo_mode="o",
+                **settings,
+            )
+    finally:
+        if input_file != args.input:
+            Path(input_file).unlink(missing_ok=True)
 
     Path(temp_output).rename(args.output)
@@ -0,0 +1,209 @@
+"""
+This module builds the hardware TCMs of a raw file in memory. The coincidence
+columns of all the channels are read in a single pass over the file, the TCM
+of each FlashCam id is then built from these arrays concurrently and all the
+TCMs are written to the output file in one go. The TCMs are the same as the
+ones of `pygama.evt.build_tcm` run for each FlashCam id.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import h5py
+import numpy as np
+from lgdo import Table, VectorOfVectors, lh5
+
+from .lh5_utils import get_lh5_inventory
+
+
+def _resolve_tables(raw_file: str, tables: list) -> list:
+    # tables are looked up like pygama.evt.build_tcm does, so the groups
+    # without the table are skipped
+    inventory = get_lh5_inventory(raw_file)
+    return list(dict.fromkeys(table for name in tables for table in inventory.ls(name)))
+
+
+def read_coin_data(raw_file: str, tables: list, fields: list, blind_index=None):
+    """
+    Reads the `fields` of each table in `tables` of `raw_file`, opening the
+    file once. The tables not in the file are skipped.
+
+    Parameters
+    ----------
+    raw_file
+        Raw file
+    tables
+        Tables to read e.g. ``ch1104000/raw``, wildcards are supported
+    fields
+        Columns to read from each table
+    blind_index
+        `BlindingIndex` of the raw file, the hidden rows of the blinded
+        channels are dropped
+
+    Returns
+    -------
+    dict
+        Mapping of each table to a dictionary of its columns
+    """
+    coin_data = {}
+    with h5py.File(raw_file, "r") as f:
+        for table in _resolve_tables(raw_file, tables):
+            idx = None
+            if blind_index is not None and blind_index.hides(table):
+                idx = blind_index.entry_list()
+            coin_data[table] = {
+                field: lh5.read_as(f"{table}/{field}", f, "np", idx=idx)
+                for field in fields
+            }
+    return coin_data
+
+
+def build_tcm_table(
+    coin_data: dict,
+    coin_cols: str | list,
+    hash_func: str | None = r"\d+",
+    coin_windows: float | list = 0,
+    window_refs: str | list = "last",
+    out_fields: str | list | None = None,
+) -> Table:
+    """
+    Builds the TCM of the tables in `coin_data`, see `read_coin_data`. The
+    arguments are the ones of `pygama.evt.build_tcm`.
+
+    Returns
+    -------
+    Table
+        TCM with the ``table_key`` and ``row_in_table`` of the rows of each
+        event and the `out_fields`
+    """
+    if not isinstance(coin_cols, list):
+        coin_cols = [coin_cols]
+    if not isinstance(coin_windows, list):
+        coin_windows = [coin_windows] * len(coin_cols)
+    if not isinstance(window_refs, list):
+        window_refs = [window_refs] * len(coin_cols)
+    if out_fields is not None and not isinstance(out_fields, list):
+        out_fields = [out_fields]
+    if len(coin_windows) != len(coin_cols) or len(window_refs) != len(coin_cols):
+        msg = "coin_cols, coin_windows and window_refs must have the same length"
+        raise ValueError(msg)
+    for window_ref in window_refs:
+        if window_ref != "last":
+            msg = f"window_ref {window_ref}"
+            raise NotImplementedError(msg)
+
+    tables = list(coin_data)
+    table_keys = []
+    for table_idx, table in enumerate(tables):
+        if hash_func is None:
+            table_keys.append(table_idx)
+        else:
+            table_keys.append(int(re.search(hash_func, table).group()))
+    n_rows = [len(coin_data[table][coin_cols[0]]) for table in tables]
+
+    table_key = np.repeat(np.array(table_keys, dtype=int), n_rows)
+    row_in_table = np.concatenate(
+        [np.arange(n, dtype=int) for n in n_rows] + [np.array([], dtype=int)]
+    )
+    columns = {
+        field: np.concatenate([coin_data[table][field] for table in tables])
+        for field in set(coin_cols + (out_fields or []))
+    }
+
+    # sort by coincidence columns with the table key as tie-breaker, the sort
+    # is stable so the rows of each table stay in order
+    order = np.lexsort([table_key, *[columns[col] for col in reversed(coin_cols)]])
+    table_key = table_key[order]
+    row_in_table = row_in_table[order]
+
+    # a new event starts when any coincidence column jumps by more than its window
+    new_evt = np.zeros(max(len(order) - 1, 0), dtype=bool)
+    for col, window in zip(coin_cols, coin_windows, strict=True):
+        new_evt |= np.diff(columns[col][order]) > window
+    cumulative_length = np.append(np.flatnonzero(new_evt) + 1, len(order))
+    if len(order) == 0:
+        cumulative_length = np.array([], dtype=int)
+
+    tcm = Table(size=len(cumulative_length))
+    tcm.add_field(
+        "table_key",
+        VectorOfVectors(cumulative_length=cumulative_length, flattened_data=table_key),
+    )
+    tcm.add_field(
+        "row_in_table",
+        VectorOfVectors(
+            cumulative_length=cumulative_length, flattened_data=row_in_table
+        ),
+    )
+    for field in out_fields or []:
+        tcm.add_field(
+            field,
+            VectorOfVectors(
+                cumulative_length=cumulative_length,
+                flattened_data=columns[field][order],
+            ),
+        )
+    tcm.attrs.update({"tables": str(tables), "hash_func": str(hash_func)})
+    return tcm
+
+
+def build_hardware_tcms(
+    raw_file: str,
+    fcid_channels: dict,
+    out_file: str,
+    coin_cols: str | list,
+    out_fields: str | list | None = None,
+    n_workers: int = 1,
+    blind_index=None,
+    **kwargs,
+) -> None:
+    """
+    Builds the ``hardware_tcm_{fcid}`` table of each FlashCam id and writes
+    them to `out_file`.
+
+    Parameters
+    ----------
+    raw_file
+        Raw file
+    fcid_channels
+        Mapping of each FlashCam id to the list of its tables in `raw_file`
+    out_file
+        Output file, overwritten if it exists
+    coin_cols, out_fields
+        See `build_tcm_table`
+    n_workers
+        Number of threads building the TCMs
+    blind_index
+        `BlindingIndex` of the raw file, see `read_coin_data`
+    **kwargs
+        Other arguments of `build_tcm_table`
+    """
+    fields = [coin_cols] if isinstance(coin_cols, str) else list(coin_cols)
+    if out_fields is not None:
+        fields += [out_fields] if isinstance(out_fields, str) else list(out_fields)
+    tables = [table for fcid_tables in fcid_channels.values() for table in fcid_tables]
+    coin_data = read_coin_data(
+        raw_file, tables, list(dict.fromkeys(fields)), blind_index
+    )
+
+    def _build(fcid_tables):
+        return build_tcm_table(
+            {
+                table: coin_data[table]
+                for table in _resolve_tables(raw_file, fcid_tables)
+            },
+            coin_cols,
+            out_fields=out_fields,
+            **kwargs,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(n_workers, 1)) as executor:
+        tcms = dict(
+            zip(
+                fcid_channels, executor.map(_build, fcid_channels.values()), strict=True
+            )
+        )
+
+    with h5py.File(out_file, "w") as f:
+        for fcid, tcm in tcms.items():
+            lh5.write(tcm, f"hardware_tcm_{fcid}", f, wo_mode="o")
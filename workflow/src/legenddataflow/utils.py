@@ -115,6 +115,13 @@ def filelist_path(setup):
     return setup["paths"]["tmp_filelists"]
 
 
+def catalog_cache_path(setup):
+    if "catalog_cache" in setup["paths"]:
+        return setup["paths"]["catalog_cache"]
+    else:
+        return str(Path(tmp_par_path(setup)).parent / "catalogs")
+
+
 def subst_vars_impl(x, var_values, ignore_missing=False):
     if isinstance(x, str):
         if "$" in x:
@@ -176,27 +183,6 @@ def subst_vars_in_snakemake_config(workflow, config):
         config["execenv"] = config["execenv"]["bare"]
 
 
-def run_splitter(files):
-    """
-    Returns list containing lists of each run
-    """
-
-    runs = []
-    run_files = []
-    for file in files:
-        base = Path(file).name
-        file_name = Path(base).name
-        parts = file_name.split("-")
-        run_no = parts[3]
-        if run_no not in runs:
-            runs.append(run_no)
-            run_files.append([])
-        for i, run in enumerate(runs):
-            if run == run_no:
-                run_files[i].append(file)
-    return run_files
-
-
 def set_last_rule_name(workflow, new_name):
     """Sets the name of the most recently created rule to be `new_name`.
     Useful when creating rules dynamically (i.e. unnamed).